@@ -0,0 +1,269 @@
+"""Eval benchmark — evaluation throughput over time, in bulk and per search node.
+
+Bulk (the default): packs a FEN dataset into boards with `boards_from_fens`,
+scores them with `evaluate_many` repeatedly, records the best and median
+wall-clock times, derives positions/sec, and appends one JSONL record per
+invocation to `results.jsonl`. For comparison the record's `params` also
+holds the FEN packing rate and the rate of the scalar path it replaces
+(`parse_fen` plus the scalar evaluator, timed on a sample). The dataset is a
+handful of distinct positions repeated: table evaluators do the same work
+whatever the pieces, so only the count matters.
+
+Per node (`--per-node`): calls one scalar evaluator on every position two
+plies from the same handful of positions, as a search's leaves would meet
+them, and records evaluations/sec. `params` holds the material-only
+evaluator's rate on the same positions and the evaluator's cost relative to
+it, so a new evaluation term shows up as a multiple of the cheapest one.
+
+The record follows the shared benchmark schema described in
+`benchmarks/README.md` so `benchmarks/analyze.py` can read this file alongside
+any other benchmark's output.
+
+Run:
+    uv run python benchmarks/eval/run.py                    # defaults: material, 200,000 positions, 5 runs
+    uv run python benchmarks/eval/run.py --evaluator pst    # the tapered piece-square tables
+    uv run python benchmarks/eval/run.py --no-record        # ad-hoc; don't pollute results.jsonl
+    uv run python benchmarks/eval/run.py --label custom     # override label (default: "many-{evaluator}")
+    uv run python benchmarks/eval/run.py --per-node --evaluator activity   # cost per call vs material-only
+"""
+
+import argparse
+import copy
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.core.position import Position
+from drewbert.eval.batch import TableBatchEval, batch_material_eval, batch_pst_eval, boards_from_fens, evaluate_many
+from drewbert.eval.lazy import lazy_activity_eval
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.eval.mobility import activity_eval
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.types import PositionEvalFn
+
+FENS = [
+    STARTING_FEN,
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+    "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1",
+]
+EVALUATORS: dict[str, TableBatchEval] = {"material": batch_material_eval, "pst": batch_pst_eval}
+# Scalar evaluators for --per-node; "material" is the baseline the others are measured against.
+NODE_EVALUATORS: dict[str, PositionEvalFn] = {
+    "material": materialistic_position_eval,
+    "pst": tapered_pst_eval,
+    "pst-pawns": PawnStructureEval(),
+    "activity": activity_eval,
+    "pst-activity": lazy_activity_eval(),
+}
+DEFAULT_POSITIONS = 200_000
+DEFAULT_RUNS = 5
+SCALAR_SAMPLE = 2_000
+
+BENCHMARK_NAME = "eval"
+RESULTS_DIR = Path(__file__).parent
+RESULTS_FILE = RESULTS_DIR / "results.jsonl"
+
+
+def _git_sha() -> str:
+    """Return the short git SHA, or 'unknown' if not in a repo / git missing."""
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True)
+        return out.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown"
+
+
+def _median(values: list[float]) -> float:
+    """Median of a list. For even N, returns the average of the two middle values."""
+    s = sorted(values)
+    n = len(s)
+    mid = n // 2
+    if n % 2 == 1:
+        return s[mid]
+    return (s[mid - 1] + s[mid]) / 2
+
+
+def _scalar_rate(evaluator: TableBatchEval, fens: list[str]) -> float:
+    """Positions/sec of parsing each FEN and calling the scalar evaluator."""
+    start = time.perf_counter()
+    for fen in fens:
+        evaluator.evaluator(parse_fen(fen))
+    return len(fens) / (time.perf_counter() - start)
+
+
+def benchmark(evaluator_name: str, positions: int, runs: int, label: str) -> dict:
+    """Time `runs` bulk evaluations; return a record following the shared schema."""
+    evaluator = EVALUATORS[evaluator_name]
+    fens = [f"{FENS[i % len(FENS)]}\n" for i in range(positions)]
+    start = time.perf_counter()
+    boards = boards_from_fens(fens)
+    packing = time.perf_counter() - start
+    print(f"packed {positions:,} FENs in {packing:.3f}s")
+
+    evaluate_many(boards, evaluator)  # warm-up
+    print(f"timing {runs} runs of evaluate_many ...")
+    times: list[float] = []
+    for i in range(runs):
+        start = time.perf_counter()
+        evaluate_many(boards, evaluator)
+        times.append(time.perf_counter() - start)
+        print(f"  run {i + 1}/{runs}: {times[-1]:.3f}s")
+
+    best = min(times)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_sha(),
+        "benchmark": BENCHMARK_NAME,
+        "label": label,
+        "runs": runs,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(_median(times), 6),
+        "metric": {
+            "name": "positions_per_sec",
+            "value": round(positions / best),
+            "unit": "positions/sec",
+        },
+        "environment": {
+            "python_version": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "params": {
+            "evaluator": evaluator_name,
+            "positions": positions,
+            "fens_per_sec": round(positions / packing),
+            "scalar_per_sec": round(_scalar_rate(evaluator, fens[:SCALAR_SAMPLE])),
+        },
+    }
+
+
+def _leaves() -> list[Position]:
+    """Every position two plies from each of FENS."""
+    leaves = []
+    for fen in FENS:
+        position = parse_fen(fen)
+        for move in generate_legal_moves(position):
+            with move_applied(position, move):
+                for reply in generate_legal_moves(position):
+                    with move_applied(position, reply):
+                        leaves.append(copy.deepcopy(position))
+    return leaves
+
+
+def _node_rate(evaluator: PositionEvalFn, leaves: list[Position]) -> tuple[float, float]:
+    """(evaluations/sec, seconds) for one call per leaf."""
+    start = time.perf_counter()
+    for position in leaves:
+        evaluator(position)
+    elapsed = time.perf_counter() - start
+    return len(leaves) / elapsed, elapsed
+
+
+def benchmark_per_node(evaluator_name: str, runs: int, label: str) -> dict:
+    """Time `runs` passes of one evaluator over the leaves; return a record following the shared schema."""
+    evaluator = NODE_EVALUATORS[evaluator_name]
+    leaves = _leaves()
+    _node_rate(evaluator, leaves)  # warm-up, which also fills any cache the evaluator keeps
+    print(f"timing {runs} passes over {len(leaves):,} positions ...")
+    times: list[float] = []
+    for i in range(runs):
+        times.append(_node_rate(evaluator, leaves)[1])
+        print(f"  run {i + 1}/{runs}: {times[-1]:.3f}s")
+    baseline = max(_node_rate(NODE_EVALUATORS["material"], leaves)[0] for _ in range(runs))
+
+    best = min(times)
+    rate = len(leaves) / best
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_sha(),
+        "benchmark": BENCHMARK_NAME,
+        "label": label,
+        "runs": runs,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(_median(times), 6),
+        "metric": {
+            "name": "evals_per_sec",
+            "value": round(rate),
+            "unit": "evals/sec",
+        },
+        "environment": {
+            "python_version": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "params": {
+            "evaluator": evaluator_name,
+            "positions": len(leaves),
+            "microseconds_per_eval": round(1e6 / rate, 2),
+            "material_evals_per_sec": round(baseline),
+            "cost_vs_material": round(baseline / rate, 2),
+        },
+    }
+
+
+def append_record(record: dict) -> None:
+    """Append one JSON record as a single line to `results.jsonl`."""
+    with RESULTS_FILE.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time bulk evaluation of a FEN dataset and record its throughput.")
+    parser.add_argument(
+        "--evaluator",
+        choices=sorted(EVALUATORS.keys() | NODE_EVALUATORS.keys()),
+        default="material",
+        help="(default: material; --per-node takes the scalar evaluators, bulk only material and pst)",
+    )
+    parser.add_argument("--per-node", action="store_true", help="time scalar calls on search leaves instead")
+    parser.add_argument(
+        "--positions", type=int, default=DEFAULT_POSITIONS, help=f"dataset size (default: {DEFAULT_POSITIONS:,})"
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"timed repetitions (default: {DEFAULT_RUNS})")
+    parser.add_argument("--label", default=None, help="series label (default: many-{evaluator} or node-{evaluator})")
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="skip appending to results.jsonl (use for ad-hoc runs you don't want to persist)",
+    )
+    args = parser.parse_args()
+
+    if args.per_node:
+        if args.evaluator not in NODE_EVALUATORS:
+            parser.error(f"--per-node evaluator must be one of {', '.join(sorted(NODE_EVALUATORS))}")
+        record = benchmark_per_node(args.evaluator, args.runs, args.label or f"node-{args.evaluator}")
+        params = record["params"]
+        print()
+        print(f"{args.evaluator}: {record['metric']['value']:,} evals/sec ({params['microseconds_per_eval']} us each)")
+        print(f"material:   {params['material_evals_per_sec']:,} evals/sec")
+        print(f"cost:       {params['cost_vs_material']}x material-only")
+    else:
+        if args.evaluator not in EVALUATORS:
+            parser.error(f"bulk evaluator must be one of {', '.join(sorted(EVALUATORS))}")
+        record = benchmark(args.evaluator, args.positions, args.runs, args.label or f"many-{args.evaluator}")
+        params = record["params"]
+        print()
+        print(f"evaluate_many: {record['metric']['value']:,} positions/sec (best {record['best_seconds']:.3f}s)")
+        print(f"FEN packing:   {params['fens_per_sec']:,} FENs/sec")
+        print(f"scalar path:   {params['scalar_per_sec']:,} positions/sec (parse_fen + evaluator)")
+
+    if args.no_record:
+        print("\n(--no-record passed; not appending to results.jsonl)")
+    else:
+        append_record(record)
+        print(f"\nappended 1 record to {RESULTS_FILE}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""Mate-solver benchmark — proof-number search over a bundled set of mate puzzles.
+
+Reads `puzzles.epd` (EPD with `bm`, `dm` and `id` opcodes), asks `solve_mate`
+for a mate in at most `dm` moves in each, and checks that it proves a mate of
+exactly that length starting with the `bm` move. Each run times the whole set;
+one JSONL record per invocation is appended to `results.jsonl`, labelled
+`dm{max_dm}`. `params.puzzles` lists each puzzle's expansions and whether it
+was solved.
+
+With `--compare`, every puzzle is also searched full-width: alpha-beta with
+`SearchLimits(mate=dm)`, which stops at the first iteration that finds the
+mate, from a cold transposition table. `params.fullwidth_nodes` counts its
+nodes (quiescence included) and `params.node_ratio` is the solver's total
+expansions over that. It is slow — minutes per mate-in-3 in pure Python — so
+it is off by default.
+
+Run:
+    uv run python benchmarks/mate/run.py                  # defaults: mate-in-3 puzzles, 1 run
+    uv run python benchmarks/mate/run.py --max-dm 4       # include the mate-in-4s (minutes)
+    uv run python benchmarks/mate/run.py --compare        # also count full-width nodes
+    uv run python benchmarks/mate/run.py --no-record      # ad-hoc; don't pollute results.jsonl
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import chess
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.alphabeta import DEFAULT_TT_MB, limited_search
+from drewbert.search.limits import SearchLimits
+from drewbert.search.mate import solve_mate
+from drewbert.search.stats import SearchStats
+from drewbert.search.tt import TranspositionTable
+
+DEFAULT_MAX_DM = 3
+DEFAULT_RUNS = 1
+
+BENCHMARK_NAME = "mate"
+RESULTS_DIR = Path(__file__).parent
+RESULTS_FILE = RESULTS_DIR / "results.jsonl"
+PUZZLES_FILE = RESULTS_DIR / "puzzles.epd"
+
+
+def _git_sha() -> str:
+    """Return the short git SHA, or 'unknown' if not in a repo / git missing."""
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True)
+        return out.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown"
+
+
+def _median(values: list[float]) -> float:
+    """Median of a list. For even N, returns the average of the two middle values."""
+    s = sorted(values)
+    n = len(s)
+    mid = n // 2
+    if n % 2 == 1:
+        return s[mid]
+    return (s[mid - 1] + s[mid]) / 2
+
+
+def load_puzzles(max_dm: int) -> list[tuple[str, str, int, set[str]]]:
+    """(id, fen, dm, best moves in UCI) for each puzzle with dm <= max_dm."""
+    puzzles = []
+    for line in PUZZLES_FILE.read_text().splitlines():
+        if not line.strip():
+            continue
+        board, ops = chess.Board.from_epd(line)
+        dm = ops["dm"]
+        assert isinstance(dm, int) and isinstance(ops["bm"], list)
+        if dm <= max_dm:
+            puzzles.append((str(ops["id"]), board.fen(), dm, {move.uci() for move in ops["bm"]}))
+    return puzzles
+
+
+def _solve_all(puzzles: list[tuple[str, str, int, set[str]]]) -> tuple[list[dict], float]:
+    """Solve every puzzle once. Returns per-puzzle results and total elapsed seconds."""
+    results = []
+    start = time.perf_counter()
+    for puzzle_id, fen, dm, best in puzzles:
+        mate = solve_mate(parse_fen(fen), dm)
+        solved = mate is not None and mate.moves == dm and str(mate.pv[0]) in best
+        results.append({"id": puzzle_id, "dm": dm, "solved": solved, "nodes": mate.nodes if mate else None})
+    return results, time.perf_counter() - start
+
+
+def _fullwidth_nodes(fen: str, dm: int) -> int:
+    """Nodes alpha-beta searches before its first iteration that finds the mate."""
+    stats = SearchStats()
+    tt = TranspositionTable.allocate(DEFAULT_TT_MB)
+    list(limited_search(parse_fen(fen), materialistic_position_eval, SearchLimits(mate=dm), stats=stats, tt=tt))
+    return stats.nodes + stats.qnodes
+
+
+def benchmark(max_dm: int, runs: int, compare: bool) -> dict:
+    """Time `runs` passes over the puzzle set; return a record following the shared schema."""
+    puzzles = load_puzzles(max_dm)
+    print(f"timing {runs} pass(es) over {len(puzzles)} puzzles with dm <= {max_dm} ...")
+    times: list[float] = []
+    results: list[dict] = []
+    for i in range(runs):
+        results, elapsed = _solve_all(puzzles)
+        times.append(elapsed)
+        print(f"  run {i + 1}/{runs}: {elapsed:.3f}s")
+
+    solved = sum(r["solved"] for r in results)
+    pn_nodes = sum(r["nodes"] or 0 for r in results)
+    best = min(times)
+    params: dict = {
+        "max_dm": max_dm,
+        "puzzles": results,
+        "solved": solved,
+        "total": len(puzzles),
+        "pn_nodes": pn_nodes,
+    }
+    if compare:
+        print("counting full-width alpha-beta nodes ...")
+        fullwidth = 0
+        for puzzle_id, fen, dm, _ in puzzles:
+            nodes = _fullwidth_nodes(fen, dm)
+            print(f"  {puzzle_id}: {nodes:,} nodes")
+            fullwidth += nodes
+        params["fullwidth_nodes"] = fullwidth
+        params["node_ratio"] = round(pn_nodes / fullwidth, 4) if fullwidth else None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_sha(),
+        "benchmark": BENCHMARK_NAME,
+        "label": f"dm{max_dm}",
+        "runs": runs,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(_median(times), 6),
+        "metric": {
+            "name": "solve_time",
+            "value": round(best, 3),
+            "unit": "seconds",
+        },
+        "environment": {
+            "python_version": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "params": params,
+    }
+
+
+def append_record(record: dict) -> None:
+    """Append one JSON record as a single line to `results.jsonl`."""
+    with RESULTS_FILE.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time the proof-number mate solver on the bundled puzzles.")
+    parser.add_argument(
+        "--max-dm", type=int, default=DEFAULT_MAX_DM, help=f"longest mates to include (default: {DEFAULT_MAX_DM})"
+    )
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"timed passes (default: {DEFAULT_RUNS})")
+    parser.add_argument("--compare", action="store_true", help="also count full-width alpha-beta nodes (slow)")
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="skip appending to results.jsonl (use for ad-hoc runs you don't want to persist)",
+    )
+    args = parser.parse_args()
+
+    record = benchmark(args.max_dm, args.runs, args.compare)
+    params = record["params"]
+
+    print()
+    print(f"solved:     {params['solved']}/{params['total']}")
+    print(f"best:       {record['best_seconds']:.3f}s")
+    print(f"median:     {record['median_seconds']:.3f}s")
+    print(f"pn nodes:   {params['pn_nodes']:,}")
+    if "node_ratio" in params:
+        print(f"full-width: {params['fullwidth_nodes']:,} nodes (ratio {params['node_ratio']})")
+
+    if args.no_record:
+        print("\n(--no-record passed; not appending to results.jsonl)")
+    else:
+        append_record(record)
+        print(f"\nappended to {RESULTS_FILE}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
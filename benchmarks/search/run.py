@@ -0,0 +1,155 @@
+"""Search benchmark — alpha-beta speed and search-shape statistics over time.
+
+Runs a fixed-depth alpha-beta search (fresh transposition table each run)
+repeatedly, records the best and median wall-clock times, derives nodes/sec,
+and appends one JSONL record per invocation to `results.jsonl`.
+
+The search is deterministic, so every run visits the same tree; the record's
+`params.stats` is that run's full `SearchStats` (TT hit and cutoff counts,
+first-move cutoff rate, effective branching factor, per-depth nodes and
+times). Comparing those across commits shows *why* a change sped the search
+up or slowed it down, not just that it did.
+
+The record follows the shared benchmark schema described in
+`benchmarks/README.md` so `benchmarks/analyze.py` can read this file alongside
+any other benchmark's output.
+
+Run:
+    uv run python benchmarks/search/run.py                  # defaults: Italian game, depth 4, 3 runs
+    uv run python benchmarks/search/run.py --depth 3        # faster cycle
+    uv run python benchmarks/search/run.py --no-record      # ad-hoc; don't pollute results.jsonl
+    uv run python benchmarks/search/run.py --label custom   # override label (default: "d{depth}")
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.alphabeta import DEFAULT_TT_MB, best_move
+from drewbert.search.stats import SearchStats
+from drewbert.search.tt import TranspositionTable
+
+# Italian-game middlegame: a realistic branching factor, small enough for pure Python.
+DEFAULT_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+DEFAULT_DEPTH = 4
+DEFAULT_RUNS = 3
+
+BENCHMARK_NAME = "search"
+RESULTS_DIR = Path(__file__).parent
+RESULTS_FILE = RESULTS_DIR / "results.jsonl"
+
+
+def _git_sha() -> str:
+    """Return the short git SHA, or 'unknown' if not in a repo / git missing."""
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True)
+        return out.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown"
+
+
+def _median(values: list[float]) -> float:
+    """Median of a list. For even N, returns the average of the two middle values."""
+    s = sorted(values)
+    n = len(s)
+    mid = n // 2
+    if n % 2 == 1:
+        return s[mid]
+    return (s[mid - 1] + s[mid]) / 2
+
+
+def _run_once(fen: str, depth: int) -> tuple[SearchStats, float]:
+    """One timed search from a cold table. Returns (stats, elapsed_seconds)."""
+    position = parse_fen(fen)
+    stats = SearchStats()
+    tt = TranspositionTable.allocate(DEFAULT_TT_MB)
+    start = time.perf_counter()
+    best_move(position, materialistic_position_eval, depth, stats=stats, tt=tt)
+    return stats, time.perf_counter() - start
+
+
+def benchmark(fen: str, depth: int, runs: int, label: str) -> dict:
+    """Time `runs` searches; return a record following the shared schema."""
+    print(f"timing {runs} searches at depth {depth} ...")
+    times: list[float] = []
+    stats = SearchStats()
+    for i in range(runs):
+        stats, elapsed = _run_once(fen, depth)
+        times.append(elapsed)
+        print(f"  run {i + 1}/{runs}: {elapsed:.3f}s")
+
+    best = min(times)
+    nodes = stats.nodes + stats.qnodes
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_sha(),
+        "benchmark": BENCHMARK_NAME,
+        "label": label,
+        "runs": runs,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(_median(times), 6),
+        "metric": {
+            "name": "nodes_per_sec",
+            "value": round(nodes / best),
+            "unit": "nodes/sec",
+        },
+        "environment": {
+            "python_version": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "params": {
+            "fen": fen,
+            "depth": depth,
+            "nodes": nodes,
+            "stats": stats.to_dict(),
+        },
+    }
+
+
+def append_record(record: dict) -> None:
+    """Append one JSON record as a single line to `results.jsonl`."""
+    with RESULTS_FILE.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time a fixed-depth alpha-beta search and record its statistics.")
+    parser.add_argument("--fen", default=DEFAULT_FEN, help="position to search (default: Italian-game middlegame)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help=f"search depth (default: {DEFAULT_DEPTH})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"timed repetitions (default: {DEFAULT_RUNS})")
+    parser.add_argument("--label", default=None, help="series label (default: d{depth})")
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="skip appending to results.jsonl (use for ad-hoc runs you don't want to persist)",
+    )
+    args = parser.parse_args()
+
+    record = benchmark(args.fen, args.depth, args.runs, args.label or f"d{args.depth}")
+    stats = record["params"]["stats"]
+    ebf = stats["effective_branching_factor"]
+    print()
+    print(f"nodes:      {record['params']['nodes']:,} ({stats['qnodes']:,} in quiescence)")
+    print(f"best:       {record['best_seconds']:.3f}s ({record['metric']['value']:,} nodes/sec)")
+    print(f"TT:         {stats['tt_hits']:,} hits / {stats['tt_probes']:,} probes, {stats['tt_cutoffs']:,} cutoffs")
+    print(f"cutoffs:    {stats['beta_cutoffs']:,} ({stats['first_move_cutoff_rate']:.1%} on the first move)")
+    print(f"EBF:        {f'{ebf:.2f}' if ebf is not None else '-'}")
+
+    if args.no_record:
+        print("\n(--no-record passed; not appending to results.jsonl)")
+    else:
+        append_record(record)
+        print(f"\nappended 1 record to {RESULTS_FILE}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Parallel search benchmark — time-to-depth scaling across worker counts.
+
+For each worker count, runs the chosen parallel search (`--mode lazysmp`, the
+default, or `--mode rootsplit`) repeatedly and records the best and median
+wall-clock time to complete the target depth. One JSONL record per worker
+count is appended to `results.jsonl`, labelled `{mode}-w{N}-d{depth}`, so
+`benchmarks/analyze.py` tracks each mode and worker count as its own series.
+The record's `params.speedup` is the 1-worker best time divided by this worker
+count's best time.
+
+Numbers are only meaningful on a machine with at least as many free cores as
+the largest worker count; the `environment.cpu_count` field records what the
+run had available.
+
+Run:
+    uv run python benchmarks/smp/run.py                        # defaults: 1,2,4,8 workers, depth 4, 3 runs
+    uv run python benchmarks/smp/run.py --workers 1 2 --depth 3
+    uv run python benchmarks/smp/run.py --mode rootsplit --depth 3
+    uv run python benchmarks/smp/run.py --no-record            # ad-hoc; don't pollute results.jsonl
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.rootsplit import root_split_search
+from drewbert.search.smp import lazy_smp_search
+
+# Italian-game middlegame: enough branching for helpers to matter, small enough for pure Python.
+DEFAULT_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+DEFAULT_DEPTH = 4
+DEFAULT_RUNS = 3
+DEFAULT_WORKERS = [1, 2, 4, 8]
+MODES = {
+    "lazysmp": lazy_smp_search,
+    "rootsplit": root_split_search,
+}
+
+BENCHMARK_NAME = "smp"
+RESULTS_DIR = Path(__file__).parent
+RESULTS_FILE = RESULTS_DIR / "results.jsonl"
+
+
+def _git_sha() -> str:
+    """Return the short git SHA, or 'unknown' if not in a repo / git missing."""
+    try:
+        out = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True)
+        return out.strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown"
+
+
+def _median(values: list[float]) -> float:
+    """Median of a list. For even N, returns the average of the two middle values."""
+    s = sorted(values)
+    n = len(s)
+    mid = n // 2
+    if n % 2 == 1:
+        return s[mid]
+    return (s[mid - 1] + s[mid]) / 2
+
+
+def _run_once(mode: str, fen: str, depth: int, workers: int) -> float:
+    """One timed search (including worker start-up). Returns elapsed seconds."""
+    position = parse_fen(fen)
+    start = time.perf_counter()
+    MODES[mode](position, materialistic_position_eval, depth, workers)
+    return time.perf_counter() - start
+
+
+def benchmark(mode: str, fen: str, depth: int, runs: int, workers: int) -> dict:
+    """Time `runs` searches with `workers` processes; return a record following the shared schema."""
+    print(f"timing {runs} {mode} runs with {workers} worker(s) at depth {depth} ...")
+    times: list[float] = []
+    for i in range(runs):
+        elapsed = _run_once(mode, fen, depth, workers)
+        times.append(elapsed)
+        print(f"  run {i + 1}/{runs}: {elapsed:.3f}s")
+
+    best = min(times)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_sha(),
+        "benchmark": BENCHMARK_NAME,
+        "label": f"{mode}-w{workers}-d{depth}",
+        "runs": runs,
+        "best_seconds": round(best, 6),
+        "median_seconds": round(_median(times), 6),
+        "metric": {
+            "name": "time_to_depth",
+            "value": round(best, 3),
+            "unit": "seconds",
+        },
+        "environment": {
+            "python_version": sys.version.split()[0],
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {
+            "mode": mode,
+            "fen": fen,
+            "depth": depth,
+            "workers": workers,
+        },
+    }
+
+
+def append_record(record: dict) -> None:
+    """Append one JSON record as a single line to `results.jsonl`."""
+    with RESULTS_FILE.open("a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time parallel search to a fixed depth across worker counts.")
+    parser.add_argument("--mode", choices=sorted(MODES), default="lazysmp", help="parallel search (default: lazysmp)")
+    parser.add_argument("--fen", default=DEFAULT_FEN, help="position to search (default: Italian-game middlegame)")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH, help=f"search depth (default: {DEFAULT_DEPTH})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"timed repetitions (default: {DEFAULT_RUNS})")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=DEFAULT_WORKERS, help="worker counts to time (default: 1 2 4 8)"
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="skip appending to results.jsonl (use for ad-hoc runs you don't want to persist)",
+    )
+    args = parser.parse_args()
+
+    records = [benchmark(args.mode, args.fen, args.depth, args.runs, workers) for workers in args.workers]
+    baseline = next((r["best_seconds"] for r in records if r["params"]["workers"] == 1), None)
+
+    print()
+    print(f"{'workers':>8} {'best':>9} {'median':>9} {'speedup':>8}")
+    for record in records:
+        if baseline is not None:
+            record["params"]["speedup"] = round(baseline / record["best_seconds"], 3)
+        speedup = record["params"].get("speedup")
+        print(
+            f"{record['params']['workers']:>8} {record['best_seconds']:>8.3f}s {record['median_seconds']:>8.3f}s "
+            f"{f'{speedup:.2f}x' if speedup is not None else '-':>8}"
+        )
+
+    if args.no_record:
+        print("\n(--no-record passed; not appending to results.jsonl)")
+    else:
+        for record in records:
+            append_record(record)
+        print(f"\nappended {len(records)} records to {RESULTS_FILE}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
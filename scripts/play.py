@@ -8,14 +8,24 @@ Usage:
     uv run python scripts/play.py --side black --depth 4
     uv run python scripts/play.py --side none --depth 4     # engine vs engine (self-play)
     uv run python scripts/play.py --fen "<fen>"             # custom start
+    uv run python scripts/play.py --search alphabeta --ponder  # engine thinks on your time too
 
 Move input is UCI: `e2e4`, `g1f3`, promotion `e7e8q`. Type `quit` or `resign`
 at the prompt to end the game.
+
+With `--ponder` (alpha-beta only) the engine keeps searching while you think.
+It has no single guess at your reply to commit to, so it searches your position
+itself; its next search then starts from a transposition table already holding
+deep results for whichever reply you choose.
 """
 
 import argparse
+import contextlib
+import copy
 import sys
+import threading
 from collections.abc import Callable
+from functools import partial
 
 from drewbert.adapters.ascii import render
 from drewbert.adapters.fen import alg_sq_to_int, parse_fen
@@ -23,8 +33,17 @@ from drewbert.core.move import Move
 from drewbert.core.movegen import generate_legal_moves, is_in_check
 from drewbert.core.position import Color, Position
 from drewbert.core.types import PieceType
-from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.eval.cache import EvalCache
+from drewbert.eval.endgame import MaterialTableEval
+from drewbert.eval.lazy import lazy_activity_eval, lazy_pawn_eval
+from drewbert.eval.materialistic import incremental_material_eval, materialistic_position_eval
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import DEFAULT_TT_MB, iterative_deepening
+from drewbert.search.alphabeta import best_move as alphabeta_best_move
+from drewbert.search.limits import MAX_DEPTH
 from drewbert.search.minimax import best_move
+from drewbert.search.tt import TranspositionTable
 from drewbert.search.types import PositionEvalFn
 
 STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
@@ -34,10 +53,25 @@ STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
 # terminal positions).
 EVALS: dict[str, PositionEvalFn] = {
     "material": materialistic_position_eval,
+    "material-cached": EvalCache(materialistic_position_eval),
+    "material-incremental": incremental_material_eval,
+    "pst": tapered_pst_eval,
+    "pst-pawns": PawnStructureEval(),
+    "pst-material": MaterialTableEval(PawnStructureEval()),
+    "pst-lazy": MaterialTableEval(lazy_pawn_eval()),
+    "pst-activity": MaterialTableEval(lazy_activity_eval()),
 }
+with contextlib.suppress(ImportError):  # numpy is optional: the `numpy` extra.
+    from drewbert.eval.batch import batch_material_eval, batch_pst_eval
+    from drewbert.eval.nnue import NnueEval
+
+    EVALS["material-batch"] = batch_material_eval
+    EVALS["pst-batch"] = batch_pst_eval
+    EVALS["nnue"] = NnueEval()
 SearchFn = Callable[[Position, PositionEvalFn, int], Move | None]
 SEARCHES: dict[str, SearchFn] = {
     "minimax": best_move,
+    "alphabeta": alphabeta_best_move,
 }
 
 PROMOTION_LETTERS = {
@@ -82,6 +116,24 @@ def prompt_human_move(legal_moves: list[Move]) -> Move | None:
         print("  invalid — try again (UCI like e2e4, or `resign`)")
 
 
+def start_pondering(position: Position, eval_fn: PositionEvalFn, tt: TranspositionTable) -> Callable[[], None]:
+    """Search `position` on a background thread, filling `tt`, until the returned function is called."""
+    stop = threading.Event()
+    position = copy.deepcopy(position)  # the game loop moves on while this searches
+    thread = threading.Thread(
+        target=lambda: list(iterative_deepening(position, eval_fn, MAX_DEPTH, tt=tt, should_stop=stop.is_set)),
+        name="ponder",
+        daemon=True,
+    )
+    thread.start()
+
+    def stop_pondering() -> None:
+        stop.set()
+        thread.join()
+
+    return stop_pondering
+
+
 def announce_terminal(position: Position) -> None:
     if is_in_check(position, position.side_to_move):
         winner = "Black" if position.side_to_move == Color.WHITE else "White"
@@ -106,13 +158,22 @@ def parse_args() -> argparse.Namespace:
         help="which side the human plays; 'none' is engine-vs-engine (default: white)",
     )
     parser.add_argument("--fen", default=STARTING_FEN, help="starting FEN (default: standard)")
-    return parser.parse_args()
+    parser.add_argument("--ponder", action="store_true", help="let the engine search while you think (alphabeta only)")
+    args = parser.parse_args()
+    if args.ponder and args.search != "alphabeta":
+        parser.error("--ponder requires --search alphabeta")
+    return args
 
 
 def main() -> int:
     args = parse_args()
     eval_fn = EVALS[args.eval]
     search_fn = SEARCHES[args.search]
+    tt: TranspositionTable | None = None
+    if args.ponder:
+        # One table for the whole game, shared by pondering and the engine's own searches.
+        tt = TranspositionTable.allocate(DEFAULT_TT_MB)
+        search_fn = partial(alphabeta_best_move, tt=tt)
     human_side: Color | None = {"white": Color.WHITE, "black": Color.BLACK, "none": None}[args.side]
 
     position = parse_fen(args.fen)
@@ -130,7 +191,10 @@ def main() -> int:
         print(f"\n{side_label} to move.")
 
         if position.side_to_move == human_side:
+            stop_pondering = start_pondering(position, eval_fn, tt) if tt is not None else None
             move = prompt_human_move(legal_moves)
+            if stop_pondering is not None:
+                stop_pondering()
             if move is None:
                 winner = "White" if position.side_to_move == Color.BLACK else "Black"
                 print(f"\nResigned. {winner} wins.")
@@ -0,0 +1,88 @@
+"""Tune the piece-square tables against a labelled position dataset (Texel tuning).
+
+The dataset is a text file with one position per line: a FEN, then the result
+of the game it came from (`1-0`, `0-1`, `1/2-1/2`, or White's score as a
+number, optionally quoted or bracketed). Features are extracted once into a
+directory of memory-mappable arrays; tuning reads them from there, so later
+runs skip extraction. Needs numpy (the `numpy` extra).
+
+Usage:
+    uv run python scripts/tune.py extract positions.epd features/      # one-off
+    uv run python scripts/tune.py tune features/ --epochs 500 --output tuned.json
+    uv run python scripts/tune.py tune features/ --fit-scale --workers 4 --output tuned.json
+
+The output is in the format `drewbert.core.psqt` loads: point the engine at it
+with DREWBERT_PST_FILE=tuned.json.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from drewbert.core.psqt import TABLES, load_tables, save_tables
+from drewbert.eval.texel import (
+    DEFAULT_LEARNING_RATE,
+    DEFAULT_SCALE,
+    extract_features,
+    fit_scale,
+    initial_weights,
+    load_dataset,
+    loss_and_gradient,
+    tune,
+    weights_to_tables,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Texel-tune the piece-square tables.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    extract = commands.add_parser("extract", help="extract features from a labelled FEN file")
+    extract.add_argument("positions", type=Path, help="file of FEN + result lines")
+    extract.add_argument("dataset", type=Path, help="directory to write the features to")
+
+    tuner = commands.add_parser("tune", help="tune tables against extracted features")
+    tuner.add_argument("dataset", type=Path, help="directory written by 'extract'")
+    tuner.add_argument("--output", type=Path, required=True, help="table file to write")
+    tuner.add_argument("--start", type=Path, default=None, help="table file to start from (default: current tables)")
+    tuner.add_argument("--epochs", type=int, default=200, help="full-dataset gradient steps (default: 200)")
+    tuner.add_argument(
+        "--learning-rate", type=float, default=DEFAULT_LEARNING_RATE, help="centipawns per step (default: 1.0)"
+    )
+    tuner.add_argument("--scale", type=float, default=DEFAULT_SCALE, help="sigmoid scale (default: 1.0)")
+    tuner.add_argument("--fit-scale", action="store_true", help="fit the sigmoid scale to the starting tables first")
+    tuner.add_argument("--workers", type=int, default=1, help="processes to share each gradient (default: 1)")
+    tuner.add_argument("--report", type=int, default=10, help="print the loss every N epochs (default: 10)")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "extract":
+        with args.positions.open() as lines:
+            dataset = extract_features(lines, args.dataset)
+        print(f"extracted {len(dataset):,} positions to {args.dataset}")
+        return 0
+
+    dataset = load_dataset(args.dataset)
+    tables = load_tables(args.start) if args.start else TABLES
+    weights = initial_weights(tables)
+    scale = args.scale
+    if args.fit_scale:
+        scale = fit_scale(dataset, weights)
+        print(f"fitted scale: {scale:.4f}")
+
+    def report(epoch: int, loss: float) -> None:
+        if args.report and (epoch == 1 or epoch % args.report == 0):
+            print(f"epoch {epoch}: loss {loss:.6f}")
+
+    start_loss = loss_and_gradient(dataset, weights, scale)[0]
+    weights = tune(dataset, weights, args.epochs, args.learning_rate, scale, args.workers, report)
+    end_loss = loss_and_gradient(dataset, weights, scale)[0]
+    save_tables(weights_to_tables(weights, tables), args.output)
+    print(f"loss {start_loss:.6f} -> {end_loss:.6f}; wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
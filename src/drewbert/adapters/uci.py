@@ -1,15 +1,41 @@
 import argparse
+import contextlib
+import copy
 import sys
+import threading
+import time
 from collections.abc import Callable, Iterator
-from dataclasses import dataclass
-from functools import partial
+from dataclasses import dataclass, field
 from typing import assert_never
 
 from drewbert.adapters.fen import FEN_TO_POS, STARTING_FEN, alg_sq_to_int, parse_fen
 from drewbert.core.move import Move
 from drewbert.core.position import Position
-from drewbert.eval.materialistic import materialistic_position_eval
-from drewbert.search.minimax import best_move
+from drewbert.eval.cache import EvalCache
+from drewbert.eval.endgame import MaterialTableEval
+from drewbert.eval.lazy import LazyEval, lazy_activity_eval, lazy_pawn_eval
+from drewbert.eval.materialistic import incremental_material_eval, materialistic_position_eval
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import (
+    DEFAULT_TT_MB,
+    MATE_BOUND,
+    IterationResult,
+    PVLine,
+    expected_reply,
+    fallback_move,
+    limited_search,
+    with_principal_variations,
+)
+from drewbert.search.alphabeta import best_move as alphabeta_best_move
+from drewbert.search.limits import MAX_DEPTH, LimitTracker, SearchLimits
+from drewbert.search.mate import DEFAULT_MAX_NODES, solve_mate
+from drewbert.search.minimax import CHECKMATE_SCORE, best_move
+from drewbert.search.rootsplit import root_split_best_move
+from drewbert.search.smp import lazy_smp_best_move, lazy_smp_search
+from drewbert.search.stats import SearchStats
+from drewbert.search.tt import TranspositionTable
+from drewbert.search.types import PositionEvalFn
 
 
 @dataclass(frozen=True)
@@ -28,6 +54,11 @@ class UciNewGame: ...
 class UciIsReady: ...
 
 
+@dataclass(frozen=True)
+class UciDebug:
+    on: bool
+
+
 @dataclass(frozen=True)
 class UciSetOption:
     name: str
@@ -76,6 +107,7 @@ UciCommand = (
     | UciUci
     | UciNewGame
     | UciIsReady
+    | UciDebug
     | UciSetOption
     | UciPosition
     | UciGo
@@ -83,14 +115,94 @@ UciCommand = (
     | UciPonderHit
     | UciUnrecognized
 )
-ConfiguredSearch = Callable[[Position], Move | None]
+
+MAX_THREADS = 64
+MAX_MULTIPV = 64
+INFO_INTERVAL = 0.1  # seconds between `info` reports while searching
+
+
+@dataclass
+class EngineOptions:
+    """Engine settings adjustable through UCI `setoption`."""
+
+    threads: int = 1
+    multipv: int = 1
+    debug: bool = False  # set by the UCI `debug` command; reports search stats after each search
+
+
+@dataclass
+class SearchSignals:
+    """`stop` and `ponderhit` as they arrive from the stdin loop for one running search.
+
+    Flags are only ever raised, and always under `changed`, so the search thread
+    can block until the one it is waiting for goes up.
+    """
+
+    stopped: bool = False
+    ponderhit: bool = False
+    changed: threading.Condition = field(default_factory=threading.Condition)
+
+    def raise_stop(self) -> None:
+        with self.changed:
+            self.stopped = True
+            self.changed.notify_all()
+
+    def raise_ponderhit(self) -> None:
+        with self.changed:
+            self.ponderhit = True
+            self.changed.notify_all()
+
+    def pondering(self, go: UciGo) -> bool:
+        """Whether the search is still on the opponent's time: `go ponder` with no `ponderhit` yet."""
+        return go.ponder and not self.ponderhit
+
+    def wait_for_release(self, go: UciGo) -> None:
+        """Block while UCI forbids `bestmove`: until `stop` under `go infinite`, or while pondering."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.stopped or not (go.infinite or self.pondering(go)))
+
+
+# Called on the search thread with (position, options, go command, signals); returns the
+# best move and, if known, the expected reply to ponder on.
+ConfiguredSearch = Callable[[Position, EngineOptions, UciGo, SearchSignals], tuple[Move | None, Move | None]]
+
+
+@dataclass
+class BackgroundSearch:
+    """A `go` running on a worker thread, so the stdin loop can still answer `isready` and `stop`."""
+
+    thread: threading.Thread
+    signals: SearchSignals
+
 
 SEARCHES = {
     "minimax": best_move,
+    "alphabeta": alphabeta_best_move,
+    "rootsplit": root_split_best_move,
+}
+# Searches that can spread over worker processes, keyed like SEARCHES. They take the UCI
+# `Threads` option as a fourth argument: Lazy SMP for alphabeta, root splitting for rootsplit.
+PARALLEL_SEARCHES = {
+    "alphabeta": lazy_smp_best_move,
+    "rootsplit": root_split_best_move,
 }
-EVALS = {
+EVALS: dict[str, PositionEvalFn] = {
     "materialistic": materialistic_position_eval,
+    "materialistic-cached": EvalCache(materialistic_position_eval),
+    "materialistic-incremental": incremental_material_eval,
+    "pst": tapered_pst_eval,
+    "pst-pawns": PawnStructureEval(),
+    "pst-material": MaterialTableEval(PawnStructureEval()),
+    "pst-lazy": MaterialTableEval(lazy_pawn_eval()),
+    "pst-activity": MaterialTableEval(lazy_activity_eval()),
 }
+with contextlib.suppress(ImportError):  # numpy is optional: the `numpy` extra.
+    from drewbert.eval.batch import batch_material_eval, batch_pst_eval
+    from drewbert.eval.nnue import NnueEval
+
+    EVALS["materialistic-batch"] = batch_material_eval
+    EVALS["pst-batch"] = batch_pst_eval
+    EVALS["nnue"] = NnueEval()
 
 
 def uci_to_move(move: str) -> Move:
@@ -163,6 +275,10 @@ def parse(line: str) -> UciCommand:
             return UciNewGame()
         case "isready":
             return UciIsReady()
+        case "debug":
+            if tokens[1:] not in (["on"], ["off"]):
+                return UciUnrecognized(tokens)
+            return UciDebug(tokens[1] == "on")
         case "setoption":
             groups = list(split_by_starting_words(tokens, ["name", "value"]))
             name = get_list(groups, "name")  # works for single and multi-token names
@@ -221,66 +337,376 @@ def parse(line: str) -> UciCommand:
             return UciUnrecognized(tokens)
 
 
+_emit_lock = threading.Lock()
+
+
 def emit(line: str) -> None:
-    """Print given line to stdout"""
-    print(line, flush=True)
+    """Print given line to stdout. Safe to call from the search thread and the stdin loop at once."""
+    with _emit_lock:
+        print(line, flush=True)
+
+
+def uci_score(score: int) -> str:
+    """A search score (relative to the side to move) as UCI `cp N` or `mate N`, with N in moves."""
+    if abs(score) > MATE_BOUND:
+        moves = (CHECKMATE_SCORE - abs(score) + 1) // 2
+        return f"mate {moves if score > 0 else -moves}"
+    return f"cp {score}"
+
+
+def format_info(result: IterationResult) -> list[str]:
+    """UCI `info` lines for a completed iteration: one per MultiPV line, or one for the best move."""
+    nps = int(result.nodes / result.elapsed) if result.elapsed > 0 else 0
+    stats = f"nodes {result.nodes} nps {nps} time {int(result.elapsed * 1000)} hashfull {result.hashfull}"
+    lines = result.lines or (PVLine(result.move, result.score, result.pv),)
+    multipv = len(lines) > 1
+    return [
+        f"info depth {result.depth} seldepth {max(result.seldepth, result.depth)}"
+        + (f" multipv {rank}" if multipv else "")
+        + f" score {uci_score(line.score)} {stats} pv {' '.join(str(move) for move in line.pv)}"
+        for rank, line in enumerate(lines, start=1)
+    ]
+
+
+@dataclass
+class InfoThrottle:
+    """Rate-limits per-depth `info` output to one report per INFO_INTERVAL seconds.
+
+    Shallow iterations finish in milliseconds; printing each of them would cost
+    more than the search. A result that arrives too soon is held back and
+    replaced by any later one. `poll`, called from the search's stop check,
+    prints it once the interval has passed, so a slow next iteration doesn't
+    keep it from the GUI; `flush` prints whatever is still held, so the
+    deepest completed iteration is always reported before `bestmove`.
+    `expand`, if set, is applied to a result only when it's printed: the
+    search fills in its principal variations there.
+    """
+
+    expand: Callable[[IterationResult], IterationResult] | None = None
+    last_emit: float = float("-inf")
+    pending: IterationResult | None = None
+
+    def _emit(self, result: IterationResult) -> None:
+        for line in format_info(self.expand(result) if self.expand is not None else result):
+            emit(line)
+
+    def offer(self, result: IterationResult) -> None:
+        self.pending = result
+        self.poll()
+
+    def poll(self) -> None:
+        """Print the held result if INFO_INTERVAL has passed since the last report."""
+        if self.pending is None:
+            return
+        now = time.monotonic()
+        if now - self.last_emit < INFO_INTERVAL:
+            return
+        result, self.pending = self.pending, None
+        self.last_emit = now
+        self._emit(result)
+
+    def flush(self) -> None:
+        if self.pending is not None:
+            self._emit(self.pending)
+            self.pending = None
+
+
+def limits_from_go(go: UciGo, default_depth: int) -> SearchLimits:
+    """Search limits for a go command. The CLI `--depth` applies only when `go` sets none of
+    depth, nodes, movetime, mate or infinite; clock-based commands (`wtime`, `btime`) aren't
+    honored yet, so they get the default depth too.
+    """
+    if go.depth is None and go.nodes is None and go.movetime is None and go.mate is None and not go.infinite:
+        return SearchLimits(depth=default_depth)
+    return SearchLimits(depth=go.depth, nodes=go.nodes, movetime=go.movetime, mate=go.mate, infinite=go.infinite)
+
 
+def _proven_mate(position: Position, limits: SearchLimits, signals: SearchSignals) -> tuple[Move, Move | None] | None:
+    """Try the proof-number mate solver for `go mate N`; report and return its line's first two moves.
 
-def apply_uci_go_cmd(go: UciGo, position: Position, search_fn: ConfiguredSearch) -> None:
-    """Run engine given UCI go command parameters and print bestmove to stdout given
-    input parameters. Currently limited functionality - returns fixed-depth best move
-    search ignoring parameters of UCI Go command.
+    Returns None when it proves no mate in time (or within `go nodes` expansions),
+    leaving the regular search to pick a move.
     """
-    move = search_fn(position)
-    if not move:
-        move = "0000"  # accepted terminal position output per UCI spec.
-    emit(f"bestmove {str(move)}")
+    assert limits.mate is not None
+    tracker = LimitTracker(limits)
+    start = time.monotonic()
+    mate = solve_mate(
+        position,
+        limits.mate,
+        max_nodes=limits.nodes or DEFAULT_MAX_NODES,
+        should_stop=lambda: signals.stopped or tracker.reached(),
+    )
+    if mate is None:
+        return None
+    plies = 2 * mate.moves - 1
+    score = CHECKMATE_SCORE - plies
+    result = IterationResult(
+        plies,
+        score,
+        mate.pv[0],
+        lines=(PVLine(mate.pv[0], score, mate.pv),),
+        seldepth=len(mate.pv),
+        nodes=mate.nodes,
+        elapsed=time.monotonic() - start,
+    )
+    for line in format_info(result):
+        emit(line)
+    return mate.pv[0], (mate.pv[1] if len(mate.pv) > 1 else None)
+
+
+def configure_search(search: str, position_evaluator: PositionEvalFn, depth: int) -> ConfiguredSearch:
+    """Bind the CLI-selected search, evaluator and default depth. Engine options are applied per
+    call: with Threads > 1 a search in PARALLEL_SEARCHES runs its multi-process variant. Others ignore it.
+
+    The alpha-beta search honors the go command's limits (see `limits_from_go`) and supports
+    pondering: under `go ponder` it deepens without limit, and once `ponderhit` arrives the same
+    search carries on until its limits are met. Single-threaded, it keeps one transposition table
+    for the engine's lifetime, so a ponder miss still warms the next search, and it suggests the
+    table's predicted reply as the ponder move. `go nodes` always searches single-threaded, so the
+    same command sequence gives the same moves on any machine. With MultiPV > 1 or `go searchmoves`
+    it also searches single-threaded; searchmoves restricts the root moves, reusing the table.
+    Completed depths are reported as `info` lines, throttled by `InfoThrottle`, and in debug mode
+    the main search's `SearchStats` follow as an `info string` of JSON.
+    `go mate N` first runs the proof-number solver (`solve_mate`), falling back to the regular
+    search when it proves nothing. The fixed-depth searches only honor `go depth` and never
+    suggest a ponder move.
+    """
+    tt = TranspositionTable.allocate(DEFAULT_TT_MB) if search == "alphabeta" else None
+
+    def run(
+        position: Position, options: EngineOptions, go: UciGo, signals: SearchSignals
+    ) -> tuple[Move | None, Move | None]:
+        if tt is None:
+            fixed_depth = go.depth or depth
+            if search in PARALLEL_SEARCHES and options.threads > 1:
+                return PARALLEL_SEARCHES[search](position, position_evaluator, fixed_depth, options.threads), None
+            return SEARCHES[search](position, position_evaluator, fixed_depth), None
+
+        limits = limits_from_go(go, depth)
+        searchmoves = [uci_to_move(move) for move in go.searchmoves.split()] if go.searchmoves else None
+        if limits.mate is not None and not limits.infinite and not go.ponder and searchmoves is None:
+            proven = _proven_mate(position, limits, signals)
+            if proven is not None:
+                return proven
+        held = (lambda: signals.pondering(go)) if go.ponder else None
+        result: IterationResult | None = None
+        ponder = None
+        info = InfoThrottle()
+        stats = SearchStats() if options.debug else None  # only debug mode reports them
+
+        def stopped() -> bool:
+            info.poll()  # piggybacks on the search's regular stop check
+            return signals.stopped
+
+        if options.threads > 1 and limits.nodes is None and options.multipv == 1 and searchmoves is None:
+            tracker = LimitTracker(limits)
+
+            def on_iteration(iteration: IterationResult) -> None:
+                tracker.record(iteration.depth, iteration.score)
+                info.offer(iteration)
+
+            result = lazy_smp_search(
+                position,
+                position_evaluator,
+                MAX_DEPTH if held is not None else limits.max_depth,
+                options.threads,
+                should_stop=lambda: stopped() or (not signals.pondering(go) and tracker.reached()),
+                on_iteration=on_iteration,
+                stats=stats,
+            )
+        else:
+            # PVs are walked from a copy of the root: `stopped` can report while `position` is mid-search.
+            root = copy.deepcopy(position)
+            info.expand = lambda iteration: with_principal_variations(iteration, root, tt)
+            for result in limited_search(
+                position,
+                position_evaluator,
+                limits,
+                stats=stats,
+                tt=tt,
+                should_stop=stopped,
+                held=held,
+                multipv=options.multipv,
+                searchmoves=searchmoves,
+            ):
+                info.offer(result)
+            if result is not None:
+                ponder = expected_reply(position, result.move, tt)
+        info.flush()
+        if stats is not None:
+            emit(f"info string stats {stats.to_json()}")
+            for component in _components(position_evaluator):
+                if isinstance(component, EvalCache):
+                    emit(
+                        f"info string evalcache probes {component.probes} hits {component.hits} "
+                        f"hitrate {component.hit_rate:.3f}"
+                    )
+                elif isinstance(component, PawnStructureEval):
+                    table = component.table
+                    emit(f"info string pawnhash probes {table.probes} hits {table.hits} hitrate {table.hit_rate:.3f}")
+        if result is not None:
+            return result.move, ponder
+        return fallback_move(position, searchmoves), None
+
+    return run
+
+
+def apply_uci_go_cmd(
+    go: UciGo, position: Position, search_fn: ConfiguredSearch, options: EngineOptions
+) -> BackgroundSearch:
+    """Start a search for the UCI go command on a worker thread and return immediately.
+    The thread prints `bestmove` when the search ends — but, as the spec requires, not
+    before `stop` under `go infinite`, nor before `stop` or `ponderhit` under `go ponder`.
+    Clock-based time controls are not yet honored.
+    """
+    signals = SearchSignals()
+    # The search owns a copy, so a `position` command arriving mid-search can't mutate its board.
+    position = copy.deepcopy(position)
+
+    def run() -> None:
+        move, ponder = search_fn(position, options, go, signals)
+        signals.wait_for_release(go)
+        if move is None:
+            emit("bestmove 0000")  # accepted terminal-position output per UCI spec.
+        elif ponder is None:
+            emit(f"bestmove {move}")
+        else:
+            emit(f"bestmove {move} ponder {ponder}")
+
+    thread = threading.Thread(target=run, name="search", daemon=True)
+    thread.start()
+    return BackgroundSearch(thread, signals)
+
+
+def apply_uci_stop_cmd(search: BackgroundSearch | None) -> None:
+    """Stop a running search, if any, and block until it has printed its bestmove."""
+    if search is None:
+        return
+    search.signals.raise_stop()
+    search.thread.join()
+
+
+def apply_uci_ponderhit_cmd(search: BackgroundSearch | None) -> None:
+    """The opponent played the ponder move: the running search becomes a normal one, keeping its work."""
+    if search is not None:
+        search.signals.raise_ponderhit()
+
+
+def _added_moves(uci_position: UciPosition, previous: UciPosition | None) -> list[str] | None:
+    """The moves `uci_position` plays after repeating `previous` (same start, same moves), or None
+    if it doesn't continue `previous`.
+    """
+    if previous is None or not (uci_position.fen or uci_position.startpos):
+        return None
+    if (uci_position.fen, uci_position.startpos) != (previous.fen, previous.startpos):
+        return None
+    moves = (uci_position.moves or "").split()
+    played = (previous.moves or "").split()
+    if moves[: len(played)] != played:
+        return None
+    return moves[len(played) :]
+
 
+def apply_uci_position_cmd(
+    uci_position: UciPosition, position: Position, previous: UciPosition | None = None
+) -> Position:
+    """Set engine position given UCI position command. No stdout output.
 
-def apply_uci_position_cmd(uci_position: UciPosition, position: Position) -> Position:
-    """Set engine position given UCI position command. No stdout output"""
+    GUIs resend the whole game before every `go`. If `previous` is the command
+    that set up `position` and this one continues it, only the new moves are
+    played on `position`, keeping its hash history, rather than replaying the
+    game from the start: a move or two per update instead of the whole game.
+    """
+    added = _added_moves(uci_position, previous)
+    if added is not None:
+        for move in added:
+            position.make_move(uci_to_move(move))
+        return position
     if uci_position.fen:
         position = parse_fen(uci_position.fen)
     elif uci_position.startpos:
         position = parse_fen(STARTING_FEN)
     if uci_position.moves:
-        for move in uci_position.moves.split(" "):
+        for move in uci_position.moves.split():
             position.make_move(uci_to_move(move))
     return position
 
 
-def apply_uci_set_option_cmd(setoption: UciSetOption) -> None:
-    """Function to set engine internal option based on UCI GUI inputs. Currently unimplemented."""
-    pass
+def _components(evaluator: object) -> Iterator[object]:
+    """`evaluator` and, recursively, every evaluator it wraps, so caches inside composites are found too."""
+    yield evaluator
+    if isinstance(evaluator, EvalCache | MaterialTableEval):
+        yield from _components(evaluator.evaluator)
+    elif isinstance(evaluator, LazyEval):
+        for part in (evaluator.base, *evaluator.terms):
+            yield from _components(getattr(part, "__self__", part))  # a term may be an evaluator's bound method
+
+
+def apply_uci_new_game_cmd() -> None:
+    """Clear the registered evaluators' caches, wrapped ones too: scores from the last game shouldn't outlive it."""
+    for evaluator in EVALS.values():
+        for component in _components(evaluator):
+            if isinstance(component, EvalCache):
+                component.clear()
+            elif isinstance(component, PawnStructureEval):
+                component.table.clear()
+
+
+def apply_uci_set_option_cmd(setoption: UciSetOption, options: EngineOptions) -> None:
+    """Update engine options from a UCI setoption command. Unknown options and malformed
+    values are ignored, per UCI guidance. Option names are matched case-insensitively.
+    """
+    match setoption.name.lower():
+        case "threads":
+            with contextlib.suppress(ValueError):  # malformed values are ignored, per UCI guidance.
+                options.threads = min(max(int(setoption.value or ""), 1), MAX_THREADS)
+        case "multipv":
+            with contextlib.suppress(ValueError):
+                options.multipv = min(max(int(setoption.value or ""), 1), MAX_MULTIPV)
+        case _:
+            pass
 
 
 def main(search_fn: ConfiguredSearch) -> None:
     position = parse_fen(STARTING_FEN)
+    # The command that set up `position`, so the next one can replay just the moves it adds.
+    position_cmd: UciPosition | None = None
+    options = EngineOptions()
+    search: BackgroundSearch | None = None
     while True:
         line = sys.stdin.readline()
         cmd = parse(line.strip())
 
         match cmd:
             case UciQuit():
+                apply_uci_stop_cmd(search)
                 sys.exit()
             case UciUci():
                 emit("id name drewbert")
                 emit("id author drew")
+                emit(f"option name Threads type spin default 1 min 1 max {MAX_THREADS}")
+                emit(f"option name MultiPV type spin default 1 min 1 max {MAX_MULTIPV}")
+                emit("option name Ponder type check default false")
                 emit("uciok")
             case UciNewGame():
-                pass
+                apply_uci_new_game_cmd()
             case UciIsReady():
                 emit("readyok")
+            case UciDebug():
+                options.debug = cmd.on
             case UciSetOption():
-                apply_uci_set_option_cmd(cmd)
+                apply_uci_set_option_cmd(cmd, options)
             case UciPosition():
-                position = apply_uci_position_cmd(cmd, position)
+                position = apply_uci_position_cmd(cmd, position, position_cmd)
+                position_cmd = cmd
             case UciGo():
-                apply_uci_go_cmd(cmd, position, search_fn)
+                apply_uci_stop_cmd(search)  # defensive: GUIs shouldn't send go mid-search
+                search = apply_uci_go_cmd(cmd, position, search_fn, options)
             case UciPonderHit():
-                pass
+                apply_uci_ponderhit_cmd(search)
             case UciStop():
-                pass
+                apply_uci_stop_cmd(search)
+                search = None
             case UciUnrecognized():
                 pass
             case _:  # defensive check against future parse additions not mirrored on implementation
@@ -296,7 +722,4 @@ if __name__ == "__main__":
     )
 
     args = parser.parse_args()  # - --search minimax --eval material --depth 3
-    eval = EVALS[args.eval]
-
-    search: ConfiguredSearch = partial(SEARCHES[args.search], depth=args.depth, position_evaluator=eval)
-    main(search)
+    main(configure_search(args.search, EVALS[args.eval], args.depth))
@@ -0,0 +1,41 @@
+"""Material keys.
+
+A material key packs the piece counts of a position into one int: four bits
+per (color, piece type), so it identifies the material configuration (say,
+king and rook against king) regardless of where the pieces stand. Adding a
+piece adds its MATERIAL_KEYS entry and removing one subtracts it, so
+`Position.make_move` keeps the key incrementally, and a lookup on it replaces
+counting pieces on the board. Four bits hold up to 15 of a kind, more than
+promotions can produce.
+"""
+
+from drewbert.core.types import Color, Piece, PieceType
+
+_BITS = 4
+_PIECE_LETTERS = {
+    "P": PieceType.PAWN,
+    "N": PieceType.KNIGHT,
+    "B": PieceType.BISHOP,
+    "R": PieceType.ROOK,
+    "Q": PieceType.QUEEN,
+    "K": PieceType.KING,
+}
+
+# MATERIAL_KEYS[color][piece_type]: what one such piece adds to the key.
+MATERIAL_KEYS: list[list[int]] = [[1 << (_BITS * (color * 6 + t)) for t in PieceType] for color in Color]
+
+
+def compute_material_key(squares: list[Piece | None]) -> int:
+    """Material key summed from scratch over the board."""
+    return sum(MATERIAL_KEYS[piece.color][piece.type] for piece in squares if piece is not None)
+
+
+def piece_count(material_key: int, color: Color, piece_type: PieceType) -> int:
+    """How many `color` pieces of `piece_type` the material key counts."""
+    return material_key >> (_BITS * (color * 6 + piece_type)) & ((1 << _BITS) - 1)
+
+
+def signature_key(white: str, black: str) -> int:
+    """The material key for two sides written as piece letters, kings included: `signature_key("KR", "K")`."""
+    sides = ((Color.WHITE, white), (Color.BLACK, black))
+    return sum(MATERIAL_KEYS[color][_PIECE_LETTERS[letter]] for color, side in sides for letter in side)
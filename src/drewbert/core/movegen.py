@@ -1,5 +1,5 @@
 from itertools import chain
-from typing import NamedTuple
+from typing import NamedTuple, cast
 
 from drewbert.core.helpers import move_applied
 from drewbert.core.move import Move
@@ -369,28 +369,45 @@ def is_in_check(position: Position, color: Color) -> bool:
     return is_square_attacked(position, position.king_square(color), color.opposite)
 
 
+def _is_safe(position: Position, piece: Piece, move: Move) -> bool:
+    """Whether pseudo-legal `move` by `piece` neither leaves its king in check nor castles through check."""
+    with move_applied(position, move):
+        # check if we castled through check
+        if piece.type == PT_KING and abs(move.from_square - move.to_square) == 2:
+            if move.to_square > move.from_square:  # kingside castling
+                if any(is_square_attacked(position, move.from_square + i, position.side_to_move) for i in range(3)):
+                    return False
+            else:  # queenside castling
+                if any(is_square_attacked(position, move.from_square - i, position.side_to_move) for i in range(3)):
+                    return False
+
+        return not is_in_check(position, position.side_to_move.opposite)
+
+
+def is_legal_move(position: Position, move: Move) -> bool:
+    """True iff `move` is legal for the side to move.
+
+    Generates only the moving piece's moves, so it is much cheaper than a
+    membership test against `generate_legal_moves` for a move from elsewhere,
+    such as a hash move that may belong to another position.
+    """
+    piece = position.piece_at(move.from_square)
+    if piece is None or piece.color != position.side_to_move:
+        return False
+    if move not in generate_piece_pseudo_legal_moves(position, piece, sq_to_file_rank(move.from_square)):
+        return False
+    return _is_safe(position, piece, move)
+
+
 def generate_legal_moves(position: Position) -> list[Move]:
     """All legal moves for the side to move.
 
     A move is legal iff it is pseudo-legal AND does not leave the moving
     side's king in check.
     """
-    candidate_moves = generate_pseudo_legal_moves(position)
-    moves = []
-
-    for move in candidate_moves:
-        piece = position.piece_at(move.from_square)
-        with move_applied(position, move):
-            # check if we castled through check, skip move if so.
-            if piece and piece.type == PT_KING and abs(move.from_square - move.to_square) == 2:
-                if move.to_square > move.from_square:  # kingside castling
-                    if any(is_square_attacked(position, move.from_square + i, position.side_to_move) for i in range(3)):
-                        continue
-                else:  # queenside castling
-                    if any(is_square_attacked(position, move.from_square - i, position.side_to_move) for i in range(3)):
-                        continue
-
-            if not is_in_check(position, position.side_to_move.opposite):
-                moves.append(move)
-
-    return moves
+    squares = position.squares
+    return [
+        move
+        for move in generate_pseudo_legal_moves(position)
+        if _is_safe(position, cast(Piece, squares[move.from_square]), move)
+    ]
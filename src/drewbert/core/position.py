@@ -1,7 +1,11 @@
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, field, replace
+from typing import Protocol
 
+from drewbert.core.material import MATERIAL_KEYS, compute_material_key
 from drewbert.core.move import Move
+from drewbert.core.psqt import SQUARE_SCORES, compute_scores
 from drewbert.core.types import CastlingRights, Color, Piece, PieceType, Square
+from drewbert.core.zobrist import compute_hash, compute_pawn_hash, piece_key, state_key
 
 
 @dataclass
@@ -19,7 +23,28 @@ class Undo:
     prev_castling_rights: CastlingRights
     prev_en_passant_target: Square | None
     prev_halfmove_clock: int
-    # Phase 3 will add: prev_zobrist_hash: int
+    prev_zobrist_hash: int
+    prev_pawn_hash: int
+    prev_material_key: int
+    prev_scores: tuple[int, int, int, int]
+    prev_king_squares: tuple[Square | None, Square | None]
+
+
+class PieceObserver(Protocol):
+    """State kept incrementally outside `Position`, told of every piece make/unmake moves.
+
+    `push` starts each `make_move`, which then reports every piece it takes off
+    a square (`lift`) and puts on one (`place`); `unmake_move` calls `pop` to
+    drop that move's changes again.
+    """
+
+    def push(self) -> None: ...
+
+    def lift(self, piece: Piece, square: Square) -> None: ...
+
+    def place(self, piece: Piece, square: Square) -> None: ...
+
+    def pop(self) -> None: ...
 
 
 @dataclass
@@ -32,6 +57,23 @@ class Position:
 
     `squares` is a list of 64 entries indexed by `Square` (0..63), rank-major.
     Each entry is a `Piece` or `None`.
+
+    `zobrist_hash` is derived state: computed from the other fields on
+    construction and kept in sync incrementally by make/unmake. So are
+    `pawn_hash`, the Zobrist hash of the pawns alone, `material_key`, the
+    piece counts packed by `drewbert.core.material`, and the piece-square
+    totals from `drewbert.core.psqt`: `material`, `mg_score`, `eg_score`
+    (White-positive) and `phase`, which let evaluators read the board's
+    material and piece placement in O(1), and `king_squares`, each color's
+    king square (None without one), behind `king_square`.
+
+    `observer`, if set, is told of each piece make/unmake moves (see
+    `PieceObserver`); an evaluator attaches one to keep its own state in step.
+
+    `hash_history` holds the hash of every position before the current one,
+    oldest first: make_move pushes, unmake_move pops. It spans the moves
+    replayed into the game as well as those made by a running search, which is
+    what repetition detection needs.
     """
 
     squares: list[Piece | None]
@@ -40,6 +82,65 @@ class Position:
     en_passant_target: Square | None
     halfmove_clock: int
     fullmove_number: int
+    zobrist_hash: int = field(init=False, default=0)
+    pawn_hash: int = field(init=False, default=0)
+    material_key: int = field(init=False, default=0)
+    material: int = field(init=False, default=0)
+    mg_score: int = field(init=False, default=0)
+    eg_score: int = field(init=False, default=0)
+    phase: int = field(init=False, default=0)
+    king_squares: tuple[Square | None, Square | None] = field(init=False, default=(None, None))
+    hash_history: list[int] = field(init=False, default_factory=list, repr=False, compare=False)
+    observer: PieceObserver | None = field(init=False, default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.zobrist_hash = compute_hash(self.squares, self.side_to_move, self.castling_rights, self.en_passant_target)
+        self.pawn_hash = compute_pawn_hash(self.squares)
+        self.material_key = compute_material_key(self.squares)
+        self.material, self.mg_score, self.eg_score, self.phase = compute_scores(self.squares)
+        self.king_squares = (self._find_king(Color.WHITE), self._find_king(Color.BLACK))
+
+    def _find_king(self, color: Color) -> Square | None:
+        kings = [i for i, x in enumerate(self.squares) if x and x.type == PieceType.KING and x.color == color]
+        return min(kings, default=None)
+
+    def _lift_scores(self, piece: Piece, square: Square) -> None:
+        """Take `piece` on `square` out of the piece-square totals and the material key, and out of the pawn
+        hash or king squares if it's a pawn or king.
+        """
+        material, mg, eg, phase = SQUARE_SCORES[piece.color][piece.type][square]
+        if piece.type == PieceType.PAWN:
+            self.pawn_hash ^= piece_key(piece, square)
+        elif piece.type == PieceType.KING:
+            self._set_king_square(piece.color, None)
+        self.material_key -= MATERIAL_KEYS[piece.color][piece.type]
+        if self.observer is not None:
+            self.observer.lift(piece, square)
+        self.material -= material
+        self.mg_score -= mg
+        self.eg_score -= eg
+        self.phase -= phase
+
+    def _place_scores(self, piece: Piece, square: Square) -> None:
+        """Add `piece` on `square` to the piece-square totals and the material key, and to the pawn hash or
+        king squares if it's a pawn or king.
+        """
+        material, mg, eg, phase = SQUARE_SCORES[piece.color][piece.type][square]
+        if piece.type == PieceType.PAWN:
+            self.pawn_hash ^= piece_key(piece, square)
+        elif piece.type == PieceType.KING:
+            self._set_king_square(piece.color, square)
+        self.material_key += MATERIAL_KEYS[piece.color][piece.type]
+        if self.observer is not None:
+            self.observer.place(piece, square)
+        self.material += material
+        self.mg_score += mg
+        self.eg_score += eg
+        self.phase += phase
+
+    def _set_king_square(self, color: Color, square: Square | None) -> None:
+        white, black = self.king_squares
+        self.king_squares = (square, black) if color == Color.WHITE else (white, square)
 
     def piece_at(self, square: Square) -> Piece | None:
         return self.squares[square]
@@ -49,10 +150,31 @@ class Position:
 
         Raises ValueError if no king of that color is on the board.
         """
-        try:
-            return min(i for i, x in enumerate(self.squares) if x and x.type == PieceType.KING and x.color == color)
-        except ValueError:
-            raise ValueError(f"No {color} king found on the board!") from None
+        square = self.king_squares[color]
+        if square is None:
+            raise ValueError(f"No {color} king found on the board!")
+        return square
+
+    def is_repetition(self, search_root: int | None = None) -> bool:
+        """Whether this position is drawn by repetition.
+
+        Only positions since the last irreversible move (per `halfmove_clock`)
+        can repeat, so the scan stops there. Two earlier occurrences make a
+        threefold repetition. During a search, pass `search_root`, the length of
+        `hash_history` at the root: one earlier occurrence after the root is then
+        enough, since the side that could have deviated chose not to.
+        """
+        history = self.hash_history
+        oldest = max(len(history) - self.halfmove_clock, 0)
+        occurrences = 0
+        for index in range(len(history) - 4, oldest - 1, -2):
+            if history[index] == self.zobrist_hash:
+                if search_root is not None and index > search_root:
+                    return True
+                occurrences += 1
+                if occurrences == 2:
+                    return True
+        return False
 
     def make_move(self, move: Move) -> Undo:
         """Apply `move` to this position in place; return an Undo token.
@@ -70,16 +192,35 @@ class Position:
           - Reset `halfmove_clock` on pawn move or capture, else increment.
           - Increment `fullmove_number` after Black moves.
           - Toggle `side_to_move`.
-          - (Phase 3) Update Zobrist hash incrementally.
+          - Update `zobrist_hash` incrementally and push the old one onto `hash_history`.
+          - Update the pawn hash, material key, piece-square totals and king squares the same
+            way, piece by piece, and report each piece to the observer, if any.
         """
         prev_castling_rights = self.castling_rights
         prev_en_passant_target = self.en_passant_target
         prev_halfmove_clock = self.halfmove_clock
+        prev_zobrist_hash = self.zobrist_hash
+        prev_pawn_hash = self.pawn_hash
+        prev_material_key = self.material_key
+        prev_scores = (self.material, self.mg_score, self.eg_score, self.phase)
+        prev_king_squares = self.king_squares
+        self.hash_history.append(prev_zobrist_hash)
+        if self.observer is not None:
+            self.observer.push()
 
         # basic updates
         captured = self.piece_at(move.to_square)
         from_piece = self.piece_at(move.from_square)
 
+        # hash: side/castling/ep are XORed back in at the end; pieces as they move
+        zobrist_hash = prev_zobrist_hash ^ state_key(self.side_to_move, prev_castling_rights, prev_en_passant_target)
+        if from_piece is not None:
+            zobrist_hash ^= piece_key(from_piece, move.from_square)
+            self._lift_scores(from_piece, move.from_square)
+        if captured is not None:
+            zobrist_hash ^= piece_key(captured, move.to_square)
+            self._lift_scores(captured, move.to_square)
+
         self.squares[move.to_square] = self.piece_at(move.from_square)
         self.squares[move.from_square] = None
 
@@ -87,6 +228,11 @@ class Position:
         if from_piece is not None and from_piece.type == PieceType.KING and abs(move.from_square - move.to_square) == 2:
             # move the rook and handle castling rights
             if move.to_square % 8 == 6:  # kingside castling:
+                rook = self.squares[move.to_square + 1]
+                if rook is not None:
+                    zobrist_hash ^= piece_key(rook, move.to_square + 1) ^ piece_key(rook, move.to_square - 1)
+                    self._lift_scores(rook, move.to_square + 1)
+                    self._place_scores(rook, move.to_square - 1)
                 self.squares[move.to_square - 1] = self.squares[move.to_square + 1]
                 self.squares[move.to_square + 1] = None
                 if self.side_to_move == Color.WHITE:
@@ -94,6 +240,11 @@ class Position:
                 else:
                     self.castling_rights = replace(self.castling_rights, black_kingside=False, black_queenside=False)
             elif move.to_square % 8 == 2:  # queenside castling:
+                rook = self.squares[move.to_square - 2]
+                if rook is not None:
+                    zobrist_hash ^= piece_key(rook, move.to_square - 2) ^ piece_key(rook, move.to_square + 1)
+                    self._lift_scores(rook, move.to_square - 2)
+                    self._place_scores(rook, move.to_square + 1)
                 self.squares[move.to_square + 1] = self.squares[move.to_square - 2]
                 self.squares[move.to_square - 2] = None
                 if self.side_to_move == Color.WHITE:
@@ -145,6 +296,9 @@ class Position:
             and from_piece.type == PieceType.PAWN
         ):
             captured = self.piece_at(self.en_passant_target - (8 * dir))
+            if captured is not None:
+                zobrist_hash ^= piece_key(captured, self.en_passant_target - (8 * dir))
+                self._lift_scores(captured, self.en_passant_target - (8 * dir))
             self.squares[self.en_passant_target - (8 * dir)] = None
 
         # set en_passant_target
@@ -171,7 +325,25 @@ class Position:
         # side_to_move update
         self.side_to_move = self.side_to_move.opposite
 
-        return Undo(move, captured, prev_castling_rights, prev_en_passant_target, prev_halfmove_clock)
+        # hash: the piece that landed on to_square (the promoted piece, if any), then the new state
+        landed = self.squares[move.to_square]
+        if landed is not None:
+            zobrist_hash ^= piece_key(landed, move.to_square)
+            self._place_scores(landed, move.to_square)
+        self.zobrist_hash = zobrist_hash ^ state_key(self.side_to_move, self.castling_rights, self.en_passant_target)
+
+        return Undo(
+            move,
+            captured,
+            prev_castling_rights,
+            prev_en_passant_target,
+            prev_halfmove_clock,
+            prev_zobrist_hash,
+            prev_pawn_hash,
+            prev_material_key,
+            prev_scores,
+            prev_king_squares,
+        )
 
     def unmake_move(self, undo: Undo) -> None:
         """Reverse the move described by `undo`, restoring all prior state."""
@@ -212,6 +384,14 @@ class Position:
         self.castling_rights = undo.prev_castling_rights
         self.en_passant_target = undo.prev_en_passant_target
         self.halfmove_clock = undo.prev_halfmove_clock
+        self.zobrist_hash = undo.prev_zobrist_hash
+        self.pawn_hash = undo.prev_pawn_hash
+        self.material_key = undo.prev_material_key
+        self.material, self.mg_score, self.eg_score, self.phase = undo.prev_scores
+        self.king_squares = undo.prev_king_squares
+        self.hash_history.pop()
+        if self.observer is not None:
+            self.observer.pop()
         if self.side_to_move == Color.WHITE:
             self.fullmove_number -= 1
 
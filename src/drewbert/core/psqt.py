@@ -0,0 +1,169 @@
+"""Piece-square scores kept incrementally by `Position`.
+
+Every (piece, square) pair contributes a fixed amount to four running totals:
+material (the classic piece values), a middlegame and an endgame score
+(a per-phase piece value plus a piece-square bonus), and a game-phase weight
+(non-pawn material, PHASE_MAX in the opening). All four are White-positive
+sums over the board, so `Position.make_move` keeps them the way it keeps the
+Zobrist hash: subtract what leaves a square, add what arrives. Evaluators
+then read them in O(1).
+
+The middlegame and endgame tables are data, not code: they load once, at
+import, from `pst.json` beside this module, or from the file named by the
+DREWBERT_PST_FILE environment variable, so a tuning run can swap them without
+a code change (search worker processes inherit the variable). Black's entries
+are White's, mirrored through the precomputed MIRROR index table and negated,
+so the per-move update is a plain table lookup.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from drewbert.core.types import Color, Piece, PieceType
+
+PIECE_VALUES = {
+    PieceType.PAWN: 100,
+    PieceType.ROOK: 500,
+    PieceType.KNIGHT: 300,
+    PieceType.BISHOP: 320,
+    PieceType.QUEEN: 900,
+    PieceType.KING: 100000,  # sentinel value - king is never captured, just needs to dominate
+}
+
+# Game-phase weight per piece type; a full set of minor and major pieces sums to PHASE_MAX.
+PHASE_WEIGHTS = {
+    PieceType.PAWN: 0,
+    PieceType.KNIGHT: 1,
+    PieceType.BISHOP: 1,
+    PieceType.ROOK: 2,
+    PieceType.QUEEN: 4,
+    PieceType.KING: 0,
+}
+PHASE_MAX = 24
+
+PST_FILE = Path(__file__).with_name("pst.json")
+PST_FILE_ENV = "DREWBERT_PST_FILE"
+
+# MIRROR[square] is `square` reflected across the board's horizontal midline (a1 <-> a8). It maps
+# White's squares to Black's, and a Square to its index in a table drawn rank 8 first.
+MIRROR = [square ^ 56 for square in range(64)]
+
+PIECE_NAMES = {
+    PieceType.PAWN: "pawn",
+    PieceType.KNIGHT: "knight",
+    PieceType.BISHOP: "bishop",
+    PieceType.ROOK: "rook",
+    PieceType.QUEEN: "queen",
+    PieceType.KING: "king",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PieceSquareTables:
+    """Middlegame and endgame piece values and square bonuses, from White's side.
+
+    Values are indexed by PieceType; bonuses by PieceType, then Square (a1 = 0).
+    """
+
+    mg_values: list[int]
+    eg_values: list[int]
+    mg_bonus: list[list[int]]
+    eg_bonus: list[list[int]]
+
+
+def _read_phase(data: object, phase: str) -> tuple[list[int], list[list[int]]]:
+    if not isinstance(data, dict):
+        raise ValueError(f"missing '{phase}' tables")
+    values, bonuses = [], []
+    for piece_type in PieceType:
+        name = PIECE_NAMES[piece_type]
+        entry = data.get(name)
+        if not isinstance(entry, dict) or not isinstance(entry.get("value"), int):
+            raise ValueError(f"{phase} {name}: expected an integer 'value'")
+        drawn = entry.get("squares")
+        if not isinstance(drawn, list) or len(drawn) != 64 or not all(isinstance(b, int) for b in drawn):
+            raise ValueError(f"{phase} {name}: expected 64 integer 'squares'")
+        values.append(entry["value"])
+        bonuses.append([drawn[MIRROR[square]] for square in range(64)])
+    return values, bonuses
+
+
+def load_tables(path: Path | str) -> PieceSquareTables:
+    """Read a table file written by `save_tables`. Raises ValueError if it's malformed.
+
+    The file holds `{"mg": {...}, "eg": {...}}`, each mapping a piece name to its
+    `value` and 64 `squares` bonuses drawn as a board is printed: rank 8 first,
+    a-file left.
+    """
+    data = json.loads(Path(path).read_text())
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    mg_values, mg_bonus = _read_phase(data.get("mg"), "mg")
+    eg_values, eg_bonus = _read_phase(data.get("eg"), "eg")
+    return PieceSquareTables(mg_values, eg_values, mg_bonus, eg_bonus)
+
+
+def save_tables(tables: PieceSquareTables, path: Path | str) -> None:
+    """Write `tables` in the format `load_tables` reads, each table drawn eight squares to a row."""
+
+    def phase(values: list[int], bonuses: list[list[int]]) -> str:
+        entries = []
+        for piece_type in PieceType:
+            drawn = [bonuses[piece_type][MIRROR[index]] for index in range(64)]
+            rows = ",\n".join(", ".join(f"{b:4d}" for b in drawn[i : i + 8]) for i in range(0, 64, 8))
+            rows = rows.replace("\n", "\n      ")
+            entries.append(
+                f'    "{PIECE_NAMES[piece_type]}": {{\n      "value": {values[piece_type]},\n'
+                f'      "squares": [\n      {rows}\n      ]\n    }}'
+            )
+        return "{\n" + ",\n".join(entries) + "\n  }"
+
+    mg = phase(tables.mg_values, tables.mg_bonus)
+    eg = phase(tables.eg_values, tables.eg_bonus)
+    Path(path).write_text(f'{{\n  "mg": {mg},\n  "eg": {eg}\n}}\n')
+
+
+def _square_table(bonus: list[int], value: int, color: Color) -> list[int]:
+    """Value plus bonus for each Square (a1=0), signed for `color`; Black's is White's mirrored and negated."""
+    if color == Color.WHITE:
+        return [value + bonus[square] for square in range(64)]
+    return [-(value + bonus[MIRROR[square]]) for square in range(64)]
+
+
+TABLES = load_tables(os.environ.get(PST_FILE_ENV) or PST_FILE)
+
+# MATERIAL[color][piece_type], MG[color][piece_type][square], EG[...][...][...], PHASE[color][piece_type]
+MATERIAL: list[list[int]] = [
+    [PIECE_VALUES[t] if color == Color.WHITE else -PIECE_VALUES[t] for t in PieceType] for color in Color
+]
+MG: list[list[list[int]]] = [
+    [_square_table(TABLES.mg_bonus[t], TABLES.mg_values[t], color) for t in PieceType] for color in Color
+]
+EG: list[list[list[int]]] = [
+    [_square_table(TABLES.eg_bonus[t], TABLES.eg_values[t], color) for t in PieceType] for color in Color
+]
+PHASE: list[list[int]] = [[PHASE_WEIGHTS[t] for t in PieceType] for _ in Color]
+
+
+# SQUARE_SCORES[color][piece_type][square]: (material, middlegame, endgame, phase) for one piece.
+SQUARE_SCORES: list[list[list[tuple[int, int, int, int]]]] = [
+    [
+        [(MATERIAL[color][t], MG[color][t][square], EG[color][t][square], PHASE[color][t]) for square in range(64)]
+        for t in PieceType
+    ]
+    for color in Color
+]
+
+
+def compute_scores(squares: list[Piece | None]) -> tuple[int, int, int, int]:
+    """(material, middlegame, endgame, phase) summed from scratch over the board."""
+    material = mg = eg = phase = 0
+    for square, piece in enumerate(squares):
+        if piece is not None:
+            material += MATERIAL[piece.color][piece.type]
+            mg += MG[piece.color][piece.type][square]
+            eg += EG[piece.color][piece.type][square]
+            phase += PHASE[piece.color][piece.type]
+    return material, mg, eg, phase
@@ -0,0 +1,79 @@
+"""Zobrist hashing.
+
+A position's hash is the XOR of one random 64-bit key per (piece, square)
+pair on the board, plus keys for side to move, castling rights and the en
+passant file. XOR is its own inverse, so `Position.make_move` can update the
+hash incrementally by XORing out what left a square and XORing in what
+arrived, instead of rehashing the whole board.
+
+Keys come from a fixed seed so every process (and every run) agrees on them —
+hashes are shared between processes through the transposition table.
+
+The pawn hash is the same XOR restricted to pawns: it changes only when a
+pawn moves, is captured or promotes, so it keys tables of pawn-structure
+results that stay valid across the many positions sharing one structure.
+"""
+
+import random
+
+from drewbert.core.types import CastlingRights, Color, Piece, PieceType, Square
+
+_rng = random.Random(0x5EED_D3E3)
+
+
+def _key() -> int:
+    return _rng.getrandbits(64)
+
+
+# PIECE_SQUARE_KEYS[color][piece_type][square]
+PIECE_SQUARE_KEYS: list[list[list[int]]] = [[[_key() for _ in range(64)] for _ in range(6)] for _ in range(2)]
+# XORed in when Black is to move.
+SIDE_KEY: int = _key()
+# Indexed by the 4-bit castling mask from `castling_index`.
+CASTLING_KEYS: list[int] = [_key() for _ in range(16)]
+# Indexed by the file of the en passant target square.
+EN_PASSANT_KEYS: list[int] = [_key() for _ in range(8)]
+
+
+def castling_index(rights: CastlingRights) -> int:
+    """Pack castling rights into a 4-bit mask: K=1, Q=2, k=4, q=8."""
+    return (
+        rights.white_kingside | rights.white_queenside << 1 | rights.black_kingside << 2 | rights.black_queenside << 3
+    )
+
+
+def piece_key(piece: Piece, square: Square) -> int:
+    return PIECE_SQUARE_KEYS[piece.color][piece.type][square]
+
+
+def state_key(side_to_move: Color, castling_rights: CastlingRights, en_passant_target: Square | None) -> int:
+    """Hash contribution of everything except piece placement."""
+    key = CASTLING_KEYS[castling_index(castling_rights)]
+    if side_to_move == Color.BLACK:
+        key ^= SIDE_KEY
+    if en_passant_target is not None:
+        key ^= EN_PASSANT_KEYS[en_passant_target % 8]
+    return key
+
+
+def compute_hash(
+    squares: list[Piece | None],
+    side_to_move: Color,
+    castling_rights: CastlingRights,
+    en_passant_target: Square | None,
+) -> int:
+    """Hash a position from scratch. Used on construction and to verify incremental updates."""
+    key = state_key(side_to_move, castling_rights, en_passant_target)
+    for square, piece in enumerate(squares):
+        if piece is not None:
+            key ^= PIECE_SQUARE_KEYS[piece.color][piece.type][square]
+    return key
+
+
+def compute_pawn_hash(squares: list[Piece | None]) -> int:
+    """Hash the pawns alone from scratch: the XOR of their piece-square keys."""
+    key = 0
+    for square, piece in enumerate(squares):
+        if piece is not None and piece.type == PieceType.PAWN:
+            key ^= PIECE_SQUARE_KEYS[piece.color][PieceType.PAWN][square]
+    return key
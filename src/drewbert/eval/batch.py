@@ -0,0 +1,165 @@
+"""Batched evaluation: many boards scored in one numpy call.
+
+A board is encoded as 64 int8 piece codes, a1 first: 0 for an empty square,
+else 1 + 6 * color + piece type. A table evaluator then scores a whole
+(N, 64) array of boards at once by gathering each square's entry from a
+(code, square) table and summing rows, so the interpreter's per-position
+overhead is paid once per batch rather than once per position.
+
+`TableBatchEval` pairs such a vectorized evaluator with the scalar one it
+reproduces exactly; the minimax search hands it the children of each
+frontier node as one `EvalBatch`. It pays off for evaluators that scan the
+board: `batch_material_eval` replaces `materialistic_position_eval`'s
+64-square Python loop. The incremental evaluators already cost O(1) a
+call, so `batch_pst_eval` mostly serves offline use.
+
+Offline, `boards_from_fens` packs a stream of FENs straight into boards
+without building a `Position` for each, and `evaluate_many` scores them.
+"""
+
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("drewbert.eval.batch needs numpy: install the `numpy` extra") from error
+
+from drewbert.core.position import Position
+from drewbert.core.psqt import EG, MATERIAL, MG, PHASE, PHASE_MAX
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.types import PositionEvalFn
+
+EMPTY = 0
+PIECE_CODES = 1 + 2 * len(PieceType)
+# Boards `evaluate_many` scores at a time, bounding its temporary arrays.
+CHUNK_SIZE = 1 << 16
+# Where each square's entries start in a flattened (square, code) table.
+_SQUARE_OFFSETS = np.arange(64) * PIECE_CODES
+
+
+def encode_board(position: Position) -> bytes:
+    """The position's 64 piece codes."""
+    return bytes([EMPTY if piece is None else 1 + 6 * piece.color + piece.type for piece in position.squares])
+
+
+# FEN placement digits expanded to that many blank squares, and each placement character's piece code.
+_EXPAND_DIGITS = str.maketrans({str(n): " " * n for n in range(1, 9)})
+_INVALID = 0xFF
+_FEN_CODES = bytearray([_INVALID]) * 256
+_FEN_CODES[ord(" ")] = EMPTY
+for _color, _letters in ((Color.WHITE, "PNBRQK"), (Color.BLACK, "pnbrqk")):
+    for _piece_type, _letter in zip(PieceType, _letters, strict=True):
+        _FEN_CODES[ord(_letter)] = 1 + 6 * _color + _piece_type
+
+
+def _fen_rows(fen: str) -> bytes:
+    """The piece codes of a FEN's placement in FEN order, a8 first. Raises ValueError if malformed."""
+    expanded = fen.partition(" ")[0].translate(_EXPAND_DIGITS)
+    # Eight ranks of eight squares, a slash after each but the last.
+    if len(expanded) != 71 or expanded[8::9] != "/" * 7:
+        raise ValueError(f"malformed FEN board: {fen}")
+    codes = expanded.encode("ascii", "replace").translate(_FEN_CODES, b"/")
+    if _INVALID in codes:
+        raise ValueError(f"invalid piece identifier in FEN: {fen}")
+    return codes
+
+
+def _flip_ranks(boards: np.ndarray) -> np.ndarray:
+    """Boards in FEN order as Square order, a1 first (and back)."""
+    return np.ascontiguousarray(boards.reshape(-1, 8, 8)[:, ::-1]).reshape(-1, 64)
+
+
+def fen_to_board(fen: str) -> bytes:
+    """The 64 piece codes of a FEN's piece placement; the other fields are ignored. Raises ValueError if malformed."""
+    rows = _fen_rows(fen)
+    return b"".join(rows[rank * 8 : rank * 8 + 8] for rank in reversed(range(8)))
+
+
+def boards_from_fens(fens: Iterable[str]) -> np.ndarray:
+    """An (N, 64) int8 array of boards from FENs, one per item; blank items (as in a file's lines) are skipped."""
+    rows = [_fen_rows(fen.strip()) for fen in fens if fen and not fen.isspace()]
+    return _flip_ranks(np.frombuffer(b"".join(rows), dtype=np.int8))
+
+
+def stack_boards(boards: list[bytes]) -> np.ndarray:
+    """Encoded boards as an (N, 64) int8 array."""
+    return np.frombuffer(b"".join(boards), dtype=np.int8).reshape(len(boards), 64)
+
+
+def _code_table(table: list[list[list[int]]]) -> np.ndarray:
+    """A [color][piece_type][square] table flattened by square then piece code, zero for an empty square."""
+    entries = np.zeros((64, PIECE_CODES), dtype=np.int64)
+    for color in Color:
+        for piece_type in PieceType:
+            entries[:, 1 + 6 * color + piece_type] = table[color][piece_type]
+    return entries.ravel()
+
+
+class TableBatchEval:
+    """A `BatchEvalFn`: `evaluator` for one position, `evaluate_boards` for a batch.
+
+    `evaluate_boards` sums the (color, piece type, square) tables `mg` and
+    `eg` over each board and tapers them by game phase, as `tapered_pst_eval`
+    does; with `mg` equal to `eg` the taper leaves the sum unchanged. Its
+    scores must equal `evaluator`'s, so the search gets the same result
+    either way.
+    """
+
+    accepts_batch = True
+
+    def __init__(self, evaluator: PositionEvalFn, mg: list[list[list[int]]], eg: list[list[list[int]]]) -> None:
+        self.evaluator = evaluator
+        self._mg = _code_table(mg)
+        self._eg = _code_table(eg)
+        self._phase = np.array([0] + [PHASE[color][t] for color in Color for t in PieceType], dtype=np.int64)
+
+    def __call__(self, position: Position) -> int:
+        return self.evaluator(position)
+
+    def batch(self) -> "BoardBatch":
+        return BoardBatch(self)
+
+    def evaluate_boards(self, boards: np.ndarray) -> np.ndarray:
+        """Scores of an (N, 64) array of piece codes, positive for white, as int32."""
+        entries = boards + _SQUARE_OFFSETS
+        mg = self._mg.take(entries).sum(axis=1)
+        eg = self._eg.take(entries).sum(axis=1)
+        phase = np.minimum(self._phase.take(boards).sum(axis=1), PHASE_MAX)
+        blended = mg * phase + eg * (PHASE_MAX - phase)
+        # Round toward zero, as `taper` does.
+        magnitude = np.abs(blended) // PHASE_MAX
+        return np.where(blended < 0, -magnitude, magnitude).astype(np.int32)
+
+
+class BoardBatch:
+    """An `EvalBatch` for a `TableBatchEval`: boards are encoded as they're added."""
+
+    def __init__(self, evaluator: TableBatchEval) -> None:
+        self.evaluator = evaluator
+        self._boards: list[bytes] = []
+
+    def add(self, position: Position) -> None:
+        self._boards.append(encode_board(position))
+
+    def scores(self) -> list[int]:
+        if not self._boards:
+            return []
+        return self.evaluator.evaluate_boards(stack_boards(self._boards)).tolist()
+
+
+def evaluate_many(boards: np.ndarray, evaluator: TableBatchEval | None = None) -> np.ndarray:
+    """Scores of an (N, 64) array of piece codes under `evaluator` (default: material), as int32."""
+    evaluator = evaluator or batch_material_eval
+    scores = np.empty(len(boards), dtype=np.int32)
+    for start in range(0, len(boards), CHUNK_SIZE):
+        scores[start : start + CHUNK_SIZE] = evaluator.evaluate_boards(boards[start : start + CHUNK_SIZE])
+    return scores
+
+
+# MATERIAL as a [color][piece_type][square] table: a piece's value wherever it stands.
+_MATERIAL_SQUARES = [[[value] * 64 for value in values] for values in MATERIAL]
+
+batch_material_eval = TableBatchEval(materialistic_position_eval, _MATERIAL_SQUARES, _MATERIAL_SQUARES)
+batch_pst_eval = TableBatchEval(tapered_pst_eval, MG, EG)
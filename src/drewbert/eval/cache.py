@@ -0,0 +1,71 @@
+"""Evaluation cache.
+
+A fixed-size, direct-mapped table of static evaluations keyed by Zobrist
+hash, held in two flat arrays: the full 64-bit key and the score. A lookup
+compares the stored key, so a slot shared by two positions reads as a miss,
+never as the wrong score; a new result always replaces the old one.
+
+`EvalCache` wraps a `PositionEvalFn` and is one itself, so it drops in
+wherever an evaluator goes (the `EVALS` registries, `configure_search`, any
+search) with no change to the caller. Caching is only sound for evaluators
+that depend on nothing beyond what the hash covers: the board, side to move,
+castling rights and en passant square.
+"""
+
+from array import array
+
+from drewbert.core.position import Position
+from drewbert.search.types import PositionEvalFn
+
+DEFAULT_ENTRIES = 1 << 16
+
+
+class EvalCache:
+    """A `PositionEvalFn` that remembers `evaluator`'s scores in a table of `entries` slots.
+
+    `entries` must be a power of two. `probes` and `hits` count lookups since
+    the last `clear`. A pickled cache (as sent to a search's worker processes)
+    arrives empty, with the same evaluator and size.
+    """
+
+    def __init__(self, evaluator: PositionEvalFn, entries: int = DEFAULT_ENTRIES) -> None:
+        if entries <= 0 or entries & (entries - 1):
+            raise ValueError(f"eval cache needs a power-of-two entry count, got {entries}")
+        self.evaluator = evaluator
+        self._mask = entries - 1
+        self._keys = array("Q", bytes(8 * entries))
+        self._scores = array("q", bytes(8 * entries))
+        self.probes = 0
+        self.hits = 0
+
+    def __reduce__(self) -> tuple[type["EvalCache"], tuple[PositionEvalFn, int]]:
+        return EvalCache, (self.evaluator, self.entries)
+
+    @property
+    def entries(self) -> int:
+        return self._mask + 1
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def __call__(self, position: Position) -> int:
+        key = position.zobrist_hash
+        index = key & self._mask
+        self.probes += 1
+        # An empty slot holds key 0, so a position hashing to 0 is never cached.
+        if key and self._keys[index] == key:
+            self.hits += 1
+            return self._scores[index]
+        score = self.evaluator(position)
+        self._keys[index] = key
+        self._scores[index] = score
+        return score
+
+    def clear(self) -> None:
+        """Forget every cached score and reset the counters, as on UCI `ucinewgame`."""
+        entries = self.entries
+        self._keys = array("Q", bytes(8 * entries))
+        self._scores = array("q", bytes(8 * entries))
+        self.probes = 0
+        self.hits = 0
@@ -0,0 +1,223 @@
+"""Material table: imbalance terms, material draws and specialized endgame evaluators.
+
+Everything here depends only on which pieces are on the board, not where, so
+it is looked up by `Position.material_key` instead of recomputed. A
+`MaterialTable` fills in one `MaterialEntry` per material configuration the
+first time a search meets it; a game only ever visits a few hundred.
+
+An entry holds:
+  - the imbalance: a bishop-pair bonus, and knights gaining and rooks losing
+    value as their own side's pawns come off (after Kaufman);
+  - the game phase, as `Position.phase` counts it but capped at PHASE_MAX;
+  - whether the material can't win by force (bare kings, a lone minor piece,
+    two knights, or one minor piece each with no pawns);
+  - the specialized evaluator for endgames the general one misjudges, with
+    the side it scores for: KPK, and a lone king against mating material
+    (KRK, KQK and the like), where the winning plan is to drive the king to
+    the edge.
+
+`MaterialTableEval` puts the table in front of another evaluator.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import cast
+
+from drewbert.core.material import piece_count, signature_key
+from drewbert.core.position import Position
+from drewbert.core.psqt import PHASE_MAX, PHASE_WEIGHTS, PIECE_VALUES
+from drewbert.core.types import Color, PieceType, Square
+from drewbert.search.types import UNBOUNDED, PositionEvalFn, WindowedEvalFn, accepts_window
+
+# A won endgame scores this plus progress terms: clear of any material score, well short of mate.
+KNOWN_WIN = 10000
+DRAW_SCORE = 0
+
+BISHOP_PAIR = 30
+# Per piece, per own pawn above (or below) five.
+KNIGHT_PAWN_ADJUSTMENT = 6
+ROOK_PAWN_ADJUSTMENT = -12
+
+# Scores an endgame for `strong`, from `strong`'s side.
+type EndgameFn = Callable[[Position, Color], int]
+
+_MINORS = (PieceType.KNIGHT, PieceType.BISHOP)
+_NON_KING = (PieceType.PAWN, PieceType.KNIGHT, PieceType.BISHOP, PieceType.ROOK, PieceType.QUEEN)
+
+
+def _distance(a: Square, b: Square) -> int:
+    """King moves between two squares."""
+    return max(abs(a % 8 - b % 8), abs(a // 8 - b // 8))
+
+
+# CENTRE_DISTANCE[square]: 0 on the four centre squares, 6 in the corners.
+CENTRE_DISTANCE = [max(3 - sq % 8, sq % 8 - 4) + max(3 - sq // 8, sq // 8 - 4) for sq in range(64)]
+
+
+def _relative(square: Square, color: Color) -> Square:
+    """`square` as `color` sees it, so that its pawns always advance up the board."""
+    return square if color == Color.WHITE else square ^ 56
+
+
+def _find_pawn(position: Position, color: Color) -> Square:
+    return next(
+        sq
+        for sq, piece in enumerate(position.squares)
+        if piece and piece.type == PieceType.PAWN and piece.color == color
+    )
+
+
+def kpk(position: Position, strong: Color) -> int:
+    """King and pawn against king, by the rule of the square, key squares and the rook-pawn draw."""
+    pawn = _relative(_find_pawn(position, strong), strong)
+    strong_king = _relative(position.king_square(strong), strong)
+    weak_king = _relative(position.king_square(strong.opposite), strong)
+    file, rank = pawn % 8, pawn // 8
+    promotion = 56 + file
+    strong_to_move = position.side_to_move == strong
+    win = KNOWN_WIN + 20 * rank
+
+    # Rule of the square: the defending king can't catch the pawn.
+    pawn_moves = 7 - rank - (rank == 1)
+    if _distance(weak_king, promotion) - (0 if strong_to_move else 1) > pawn_moves:
+        return win
+    # The defender takes the undefended pawn.
+    if not strong_to_move and _distance(weak_king, pawn) == 1 and _distance(strong_king, pawn) > 1:
+        return DRAW_SCORE
+    if file in (0, 7):
+        # A rook pawn is drawn once the defending king reaches the corner in front of it.
+        return DRAW_SCORE if abs(weak_king % 8 - file) <= 1 and weak_king // 8 > rank else PIECE_VALUES[PieceType.PAWN]
+    # Key squares: two ranks ahead of the pawn on its own or an adjacent file; one rank ahead too from the fifth.
+    key_ranks = range(rank + 2, rank + 3) if rank < 4 else range(rank + 1, rank + 3)
+    if abs(strong_king % 8 - file) <= 1 and strong_king // 8 in key_ranks:
+        return win
+    # Otherwise a defending king in front of the pawn holds against a king behind it; anything else is unclear.
+    if weak_king % 8 == file and weak_king // 8 > rank and strong_king // 8 <= rank:
+        return DRAW_SCORE
+    return PIECE_VALUES[PieceType.PAWN] + 10 * rank
+
+
+def kxk(position: Position, strong: Color) -> int:
+    """A lone king against mating material: push it to the edge and bring the other king close."""
+    strong_king = position.king_square(strong)
+    weak_king = position.king_square(strong.opposite)
+    material = sum(
+        PIECE_VALUES[t] * piece_count(position.material_key, strong, t) for t in _NON_KING if t != PieceType.PAWN
+    )
+    return KNOWN_WIN + material + 20 * CENTRE_DISTANCE[weak_king] + 10 * (7 - _distance(strong_king, weak_king))
+
+
+def _counts(material_key: int, color: Color) -> dict[PieceType, int]:
+    return {t: piece_count(material_key, color, t) for t in _NON_KING}
+
+
+def _imbalance(counts: dict[PieceType, int]) -> int:
+    """One side's imbalance bonus, from its own side."""
+    score = BISHOP_PAIR if counts[PieceType.BISHOP] >= 2 else 0
+    extra_pawns = counts[PieceType.PAWN] - 5
+    score += counts[PieceType.KNIGHT] * KNIGHT_PAWN_ADJUSTMENT * extra_pawns
+    score += counts[PieceType.ROOK] * ROOK_PAWN_ADJUSTMENT * extra_pawns
+    return score
+
+
+def _cannot_win(counts: dict[PieceType, int]) -> bool:
+    """Whether one side's pieces can't force mate, given the other side has no pawns."""
+    minors = counts[PieceType.KNIGHT] + counts[PieceType.BISHOP]
+    heavy = counts[PieceType.ROOK] + counts[PieceType.QUEEN] + counts[PieceType.PAWN]
+    return heavy == 0 and (minors <= 1 or (minors == 2 and counts[PieceType.KNIGHT] == 2))
+
+
+def _has_mating_material(counts: dict[PieceType, int]) -> bool:
+    if counts[PieceType.ROOK] or counts[PieceType.QUEEN]:
+        return True
+    return counts[PieceType.BISHOP] >= 1 and counts[PieceType.KNIGHT] + counts[PieceType.BISHOP] >= 2
+
+
+# Endgames with their own evaluator, by material key: the function and the side it scores for.
+ENDGAMES: dict[int, tuple[EndgameFn, Color]] = {
+    signature_key("KP", "K"): (kpk, Color.WHITE),
+    signature_key("K", "KP"): (kpk, Color.BLACK),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class MaterialEntry:
+    """What a material configuration implies, independent of where the pieces stand.
+
+    `imbalance` is positive for white. `endgame`, when set, replaces the
+    general evaluation and scores for `strong`.
+    """
+
+    imbalance: int
+    phase: int
+    draw: bool
+    endgame: EndgameFn | None = None
+    strong: Color = Color.WHITE
+
+
+def analyse_material(material_key: int) -> MaterialEntry:
+    """Build the `MaterialEntry` for a material key."""
+    white, black = _counts(material_key, Color.WHITE), _counts(material_key, Color.BLACK)
+    imbalance = _imbalance(white) - _imbalance(black)
+    phase = min(sum(PHASE_WEIGHTS[t] * (white[t] + black[t]) for t in _NON_KING), PHASE_MAX)
+    draw = (
+        white[PieceType.PAWN] == black[PieceType.PAWN] == 0
+        and _cannot_win(white)
+        and _cannot_win(black)
+        and sum(white[t] for t in _MINORS) + sum(black[t] for t in _MINORS) <= 2
+    )
+    if material_key in ENDGAMES:
+        endgame, strong = ENDGAMES[material_key]
+        return MaterialEntry(imbalance, phase, draw, endgame, strong)
+    for strong, weak_counts, strong_counts in ((Color.WHITE, black, white), (Color.BLACK, white, black)):
+        if not any(weak_counts.values()) and not strong_counts[PieceType.PAWN] and _has_mating_material(strong_counts):
+            return MaterialEntry(imbalance, phase, draw, kxk, strong)
+    return MaterialEntry(imbalance, phase, draw)
+
+
+class MaterialTable:
+    """`MaterialEntry`s by material key, each built on first use."""
+
+    def __init__(self) -> None:
+        self._entries: dict[int, MaterialEntry] = {}
+        self.probes = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def probe(self, material_key: int) -> MaterialEntry:
+        self.probes += 1
+        entry = self._entries.get(material_key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        entry = self._entries[material_key] = analyse_material(material_key)
+        return entry
+
+
+class MaterialTableEval:
+    """A `PositionEvalFn` that consults a `MaterialTable` before `evaluator`.
+
+    Positive for white. Material draws score DRAW_SCORE and specialized endgames
+    use their own evaluator; every other position gets `evaluator`'s score plus
+    the imbalance term. A windowed `evaluator` gets the search window, shifted
+    by the imbalance, so this is windowed too.
+    """
+
+    def __init__(self, evaluator: PositionEvalFn) -> None:
+        self.evaluator = evaluator
+        self.accepts_window = accepts_window(evaluator)
+        self.table = MaterialTable()
+
+    def __call__(self, position: Position, alpha: int = -UNBOUNDED, beta: int = UNBOUNDED) -> int:
+        entry = self.table.probe(position.material_key)
+        if entry.draw:
+            return DRAW_SCORE
+        if entry.endgame is not None:
+            score = entry.endgame(position, entry.strong)
+            return score if entry.strong == Color.WHITE else -score
+        if self.accepts_window:
+            windowed = cast(WindowedEvalFn, self.evaluator)
+            return windowed(position, alpha - entry.imbalance, beta - entry.imbalance) + entry.imbalance
+        return self.evaluator(position) + entry.imbalance
@@ -0,0 +1,58 @@
+"""Lazy evaluation.
+
+Most leaves a search evaluates are decided by material: the score is so far
+outside the search window that the positional terms can't bring it back. A
+`LazyEval` adds its terms cheapest first and stops as soon as the partial
+score sits outside the window by more than everything still to come could
+change it. Each term carries that bound, its margin; a term that exceeds its
+margin can make a lazy result wrong by the excess, so margins are set wide.
+"""
+
+from collections.abc import Sequence
+from itertools import accumulate
+
+from drewbert.core.position import Position
+from drewbert.eval.mobility import ACTIVITY_MARGIN, activity_eval
+from drewbert.eval.pawns import STRUCTURE_MARGIN, PawnStructureEval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.types import UNBOUNDED, PositionEvalFn
+
+
+class LazyEval:
+    """A `WindowedEvalFn` summing `base` and then `terms`, each a (term, margin) pair, in order.
+
+    Positive for white. `calls` and `early_exits` count evaluations and those
+    that stopped before the last term.
+    """
+
+    accepts_window = True
+
+    def __init__(self, base: PositionEvalFn, terms: Sequence[tuple[PositionEvalFn, int]]) -> None:
+        self.base = base
+        self.terms = tuple(term for term, _ in terms)
+        # _remaining[i]: how far terms[i:] can move the score, together.
+        self._remaining = tuple(reversed(list(accumulate(margin for _, margin in reversed(terms)))))
+        self.calls = 0
+        self.early_exits = 0
+
+    def __call__(self, position: Position, alpha: int = -UNBOUNDED, beta: int = UNBOUNDED) -> int:
+        self.calls += 1
+        score = self.base(position)
+        for term, remaining in zip(self.terms, self._remaining, strict=True):
+            if score + remaining <= alpha or score - remaining >= beta:
+                self.early_exits += 1
+                return score
+            score += term(position)
+        return score
+
+
+def lazy_pawn_eval() -> LazyEval:
+    """`PawnStructureEval`'s score, computed lazily: piece-square tables first, then pawn structure."""
+    pawns = PawnStructureEval()
+    return LazyEval(tapered_pst_eval, [(pawns.structure, STRUCTURE_MARGIN)])
+
+
+def lazy_activity_eval() -> LazyEval:
+    """Piece-square tables, then pawn structure, then mobility and king safety, computed lazily."""
+    pawns = PawnStructureEval()
+    return LazyEval(tapered_pst_eval, [(pawns.structure, STRUCTURE_MARGIN), (activity_eval, ACTIVITY_MARGIN)])
@@ -1,14 +1,5 @@
 from drewbert.core.position import Color, Piece, Position
-from drewbert.core.types import PieceType
-
-PIECE_VALUES = {
-    PieceType.PAWN: 100,
-    PieceType.ROOK: 500,
-    PieceType.KNIGHT: 300,
-    PieceType.BISHOP: 320,
-    PieceType.QUEEN: 900,
-    PieceType.KING: 100000,  # sentinel value - king is never captured, just needs to dominate
-}
+from drewbert.core.psqt import PIECE_VALUES
 
 
 def materialistic_position_eval(position: Position) -> int:
@@ -22,3 +13,8 @@ def materialistic_position_eval(position: Position) -> int:
             return unit_dir * PIECE_VALUES[piece.type]
 
     return sum(val(square) for square in position.squares)
+
+
+def incremental_material_eval(position: Position) -> int:
+    """Same score as `materialistic_position_eval`, read in O(1) from the position's running material total."""
+    return position.material
@@ -0,0 +1,170 @@
+"""Mobility and king safety from precomputed attack sets.
+
+Each piece's attacks are a bitset, bit `square` set per attacked square, read
+from tables built here rather than generated as moves: knight and king
+attacks are one lookup, pawn attacks two shifts over all of a side's pawns,
+and a slider's attacks along each direction are that direction's ray cut
+off behind the first blocker. One pass over the board collects the
+occupancy; a second over the non-pawn pieces computes each piece's attack
+set once and scores both terms from it:
+
+  - mobility: per piece type, a bonus for each attacked square not held by
+    its own pieces or attacked by enemy pawns, counted from a typical number;
+  - king safety: each enemy knight, bishop, rook or queen attacking the king
+    zone (the king's square and its neighbours) adds its weight per zone
+    square attacked. With two or more attackers the total, squared, is a
+    middlegame penalty: one piece alone seldom mates.
+"""
+
+from drewbert.core.position import Position
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.pst import taper
+
+# (middlegame, endgame) per safe square attacked, from the piece owner's side, above MOBILITY_BASE.
+MOBILITY = {
+    PieceType.KNIGHT: (4, 4),
+    PieceType.BISHOP: (5, 5),
+    PieceType.ROOK: (2, 4),
+    PieceType.QUEEN: (1, 2),
+}
+MOBILITY_BASE = {PieceType.KNIGHT: 4, PieceType.BISHOP: 6, PieceType.ROOK: 6, PieceType.QUEEN: 12}
+# Attack units per king-zone square a piece attacks; the middlegame penalty is units squared over KING_DANGER_DIVISOR.
+ATTACK_WEIGHTS = {PieceType.KNIGHT: 2, PieceType.BISHOP: 2, PieceType.ROOK: 3, PieceType.QUEEN: 5}
+KING_DANGER_DIVISOR = 4
+KING_DANGER_MAX = 300
+# What mobility and king safety are assumed never to outweigh, for lazy evaluation: the king-danger cap plus
+# more mobility difference than a real position shows.
+ACTIVITY_MARGIN = KING_DANGER_MAX + 150
+
+# _PIECE_TERMS[piece_type]: (mobility middlegame, mobility endgame, mobility base, attack weight)
+_PIECE_TERMS = {t: (*MOBILITY[t], MOBILITY_BASE[t], ATTACK_WEIGHTS[t]) for t in MOBILITY}
+
+_FULL = (1 << 64) - 1
+_NOT_A_FILE = _FULL ^ sum(1 << (rank * 8) for rank in range(8))
+_NOT_H_FILE = _FULL ^ sum(1 << (rank * 8 + 7) for rank in range(8))
+
+
+def _leaper_attacks(square: int, steps: list[tuple[int, int]]) -> int:
+    file, rank = square % 8, square // 8
+    return sum(1 << ((rank + dr) * 8 + file + df) for df, dr in steps if 0 <= file + df < 8 and 0 <= rank + dr < 8)
+
+
+def _ray(square: int, df: int, dr: int) -> int:
+    """Every square from `square` (excluded) to the board's edge in direction (df, dr)."""
+    ray = 0
+    file, rank = square % 8 + df, square // 8 + dr
+    while 0 <= file < 8 and 0 <= rank < 8:
+        ray |= 1 << (rank * 8 + file)
+        file, rank = file + df, rank + dr
+    return ray
+
+
+_KNIGHT_STEPS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+_KING_STEPS = [(df, dr) for df in (-1, 0, 1) for dr in (-1, 0, 1) if df or dr]
+KNIGHT_ATTACKS = [_leaper_attacks(square, _KNIGHT_STEPS) for square in range(64)]
+KING_ATTACKS = [_leaper_attacks(square, _KING_STEPS) for square in range(64)]
+KING_ZONES = [KING_ATTACKS[square] | 1 << square for square in range(64)]
+
+# Directions are split by whether squares along them increase, which says whether the nearest blocker is
+# the lowest or the highest set bit.
+_BISHOP_DIRECTIONS = [(1, 1), (-1, 1)], [(1, -1), (-1, -1)]
+_ROOK_DIRECTIONS = [(1, 0), (0, 1)], [(-1, 0), (0, -1)]
+# RAYS_UP[piece_type][square], RAYS_DOWN[...][...]: the increasing and decreasing rays a slider moves along.
+RAYS_UP, RAYS_DOWN = (
+    {
+        piece_type: [[_ray(square, df, dr) for df, dr in directions[i]] for square in range(64)]
+        for piece_type, directions in (
+            (PieceType.BISHOP, _BISHOP_DIRECTIONS),
+            (PieceType.ROOK, _ROOK_DIRECTIONS),
+            (
+                PieceType.QUEEN,
+                (_BISHOP_DIRECTIONS[0] + _ROOK_DIRECTIONS[0], _BISHOP_DIRECTIONS[1] + _ROOK_DIRECTIONS[1]),
+            ),
+        )
+    }
+    for i in range(2)
+)
+
+
+def slider_attacks(piece_type: PieceType, square: int, occupied: int) -> int:
+    """Squares a bishop, rook or queen on `square` attacks, given the occupied squares."""
+    attacks = 0
+    for ray in RAYS_UP[piece_type][square]:
+        blockers = ray & occupied
+        # Up to and including the lowest blocker.
+        attacks |= ray & ((blockers & -blockers) * 2 - 1) if blockers else ray
+    for ray in RAYS_DOWN[piece_type][square]:
+        blockers = ray & occupied
+        # Down to and including the highest blocker.
+        attacks |= ray & -(1 << (blockers.bit_length() - 1)) if blockers else ray
+    return attacks
+
+
+def pawn_attacks(color: Color, pawns: int) -> int:
+    """Squares a side's pawns attack, together."""
+    if color == Color.WHITE:
+        return ((pawns & _NOT_A_FILE) << 7 | (pawns & _NOT_H_FILE) << 9) & _FULL
+    return (pawns & _NOT_A_FILE) >> 9 | (pawns & _NOT_H_FILE) >> 7
+
+
+def piece_attacks(piece_type: PieceType, square: int, occupied: int) -> int:
+    """Squares a knight, bishop, rook or queen on `square` attacks."""
+    if piece_type == PieceType.KNIGHT:
+        return KNIGHT_ATTACKS[square]
+    return slider_attacks(piece_type, square, occupied)
+
+
+def activity(position: Position) -> tuple[int, int]:
+    """(middlegame, endgame) mobility and king-safety score, positive for white."""
+    occupied = [0, 0]
+    pawns = [0, 0]
+    kings = [0, 0]
+    pieces: list[tuple[PieceType, int, Color]] = []
+    for square, piece in enumerate(position.squares):
+        if piece is not None:
+            bit = 1 << square
+            occupied[piece.color] |= bit
+            if piece.type == PieceType.PAWN:
+                pawns[piece.color] |= bit
+            elif piece.type == PieceType.KING:
+                kings[piece.color] = square
+            else:
+                pieces.append((piece.type, square, piece.color))
+    everything = occupied[0] | occupied[1]
+    # safe[color]: squares `color`'s pieces are credited for reaching.
+    safe = (
+        ~occupied[Color.WHITE] & ~pawn_attacks(Color.BLACK, pawns[Color.BLACK]),
+        ~occupied[Color.BLACK] & ~pawn_attacks(Color.WHITE, pawns[Color.WHITE]),
+    )
+    # zones[color]: the king zone `color` attacks, the other side's.
+    zones = (KING_ZONES[kings[Color.BLACK]], KING_ZONES[kings[Color.WHITE]])
+    attackers = [0, 0]
+    units = [0, 0]
+    mg = eg = 0
+    for piece_type, square, color in pieces:
+        attacks = (
+            KNIGHT_ATTACKS[square] if piece_type == PieceType.KNIGHT else slider_attacks(piece_type, square, everything)
+        )
+        mobility_mg, mobility_eg, base, weight = _PIECE_TERMS[piece_type]
+        count = (attacks & safe[color]).bit_count() - base
+        if color == Color.WHITE:
+            mg += mobility_mg * count
+            eg += mobility_eg * count
+        else:
+            mg -= mobility_mg * count
+            eg -= mobility_eg * count
+        in_zone = attacks & zones[color]
+        if in_zone:
+            attackers[color] += 1
+            units[color] += weight * in_zone.bit_count()
+    for color in Color:
+        if attackers[color] >= 2:
+            danger = min(units[color] * units[color] // KING_DANGER_DIVISOR, KING_DANGER_MAX)
+            mg += danger if color == Color.WHITE else -danger
+    return mg, eg
+
+
+def activity_eval(position: Position) -> int:
+    """Mobility and king safety alone, tapered by game phase; positive for white."""
+    mg, eg = activity(position)
+    return taper(mg, eg, position.phase)
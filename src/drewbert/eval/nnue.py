@@ -0,0 +1,313 @@
+"""NNUE evaluation: an efficiently updatable neural network.
+
+Features are HalfKP-like: from each side's perspective, one input per
+(own king square, non-king piece, square) triple, with the board mirrored for
+Black so both perspectives share one weight matrix. The feature transformer
+sums the int16 weight rows of the active features into a per-perspective
+accumulator; it also sums a per-feature PSQT score, one per game-phase bucket,
+that passes straight to the output. The side to move's accumulator and the
+other side's, clipped to [0, ACTIVATION_MAX], feed a small dense layer
+(int8 weights, clipped) and a linear output, evaluated with numpy.
+
+Only a few features change per move, so the accumulators are updated rather
+than recomputed: the `Accumulator` attached to a position is told of each
+piece `make_move` lifts or places, keeps one frame of changes per move on a
+stack that `unmake_move` pops, and adds and subtracts weight rows only when a
+frame is evaluated. A king move changes every feature of its own perspective,
+so that side is refreshed from the board instead.
+
+Networks are stored in a flat binary file (`save_network`) that
+`load_network` memory-maps, so loading is fast and the weights are paged in on
+demand. Without a file, `bootstrap_network` builds one whose PSQT part
+scores the non-king piece-square tables, tapered per phase bucket, and whose
+dense layers are zero: a starting point for training rather than a trained
+network.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("drewbert.eval.nnue needs numpy: install the `numpy` extra") from error
+
+from drewbert.core.position import Position
+from drewbert.core.psqt import EG, MG, PHASE_MAX
+from drewbert.core.types import Color, Piece, PieceType, Square
+
+NNUE_FILE_ENV = "DREWBERT_NNUE_FILE"
+
+MAGIC = b"DRWNNUE1"
+# 64 king squares x 10 piece kinds (5 types x own/their) x 64 squares.
+FEATURES = 64 * 10 * 64
+PSQT_BUCKETS = 8
+ACTIVATION_MAX = 127
+# Dense layer outputs are shifted right by this before clipping; the output is divided by OUTPUT_SCALE.
+WEIGHT_SHIFT = 6
+OUTPUT_SCALE = 16
+# PSQT weights are in 1/PSQT_SCALE centipawns.
+PSQT_SCALE = 16
+DEFAULT_HIDDEN = 16
+DEFAULT_DENSE = 32
+_ALIGN = 64
+
+
+@dataclass(frozen=True)
+class Network:
+    """NNUE weights. Arrays may be read-only memory maps.
+
+    ft_bias[hidden] and ft_weights[FEATURES, hidden] (int16) form the
+    accumulator, psqt[FEATURES, PSQT_BUCKETS] (int32) the PSQT score;
+    l1_weights[2 * hidden, dense] (int8) and l1_bias[dense] (int32) the dense
+    layer, out_weights[dense] (int8) and out_bias[1] (int32) the output.
+    """
+
+    ft_bias: np.ndarray
+    ft_weights: np.ndarray
+    psqt: np.ndarray
+    l1_bias: np.ndarray
+    l1_weights: np.ndarray
+    out_bias: np.ndarray
+    out_weights: np.ndarray
+
+    @property
+    def hidden(self) -> int:
+        return self.ft_bias.shape[0]
+
+    @property
+    def dense(self) -> int:
+        return self.l1_bias.shape[0]
+
+
+def _layout(hidden: int, dense: int) -> list[tuple[str, np.dtype, tuple[int, ...]]]:
+    """Each array's name, dtype and shape, in file order."""
+    return [
+        ("ft_bias", np.dtype("<i2"), (hidden,)),
+        ("ft_weights", np.dtype("<i2"), (FEATURES, hidden)),
+        ("psqt", np.dtype("<i4"), (FEATURES, PSQT_BUCKETS)),
+        ("l1_bias", np.dtype("<i4"), (dense,)),
+        ("l1_weights", np.dtype("i1"), (2 * hidden, dense)),
+        ("out_bias", np.dtype("<i4"), (1,)),
+        ("out_weights", np.dtype("i1"), (dense,)),
+    ]
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def save_network(network: Network, path: Path | str) -> None:
+    """Write `network`: MAGIC, hidden and dense sizes as little-endian uint32, then each array, 64-byte aligned."""
+    with Path(path).open("wb") as f:
+        f.write(MAGIC + np.array([network.hidden, network.dense], dtype="<u4").tobytes())
+        for name, dtype, shape in _layout(network.hidden, network.dense):
+            f.write(bytes(_aligned(f.tell()) - f.tell()))
+            f.write(np.ascontiguousarray(getattr(network, name), dtype=dtype).reshape(shape).tobytes())
+
+
+def load_network(path: Path | str) -> Network:
+    """Memory-map a network written by `save_network`. Raises ValueError if it's malformed."""
+    path = Path(path)
+    with path.open("rb") as f:
+        header = f.read(len(MAGIC) + 8)
+    if len(header) < len(MAGIC) + 8 or header[: len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path}: not an NNUE network file")
+    hidden, dense = (int(n) for n in np.frombuffer(header[len(MAGIC) :], dtype="<u4"))
+    file_size = path.stat().st_size
+    arrays = {}
+    offset = len(header)
+    for name, dtype, shape in _layout(hidden, dense):
+        offset = _aligned(offset)
+        size = dtype.itemsize * int(np.prod(shape))
+        if offset + size > file_size:
+            raise ValueError(f"{path}: truncated at {name}")
+        arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        offset += size
+    return Network(**arrays)
+
+
+def bootstrap_network(hidden: int = DEFAULT_HIDDEN, dense: int = DEFAULT_DENSE) -> Network:
+    """A network that scores the non-king piece-square tables: PSQT weights from `drewbert.core.psqt`, all else zero.
+
+    The PSQT part can't taper by phase, so each bucket holds the tables tapered
+    at the highest phase it covers. Kings aren't features, so their table terms
+    are left out: the network matches `tapered_pst_eval` only where those cancel
+    (kings on mirrored squares) and the phase is a bucket's highest.
+    """
+    psqt = np.zeros((64, 10, 64, PSQT_BUCKETS), dtype=np.int32)
+    for bucket in range(PSQT_BUCKETS):
+        phase = (bucket + 1) * PHASE_MAX // PSQT_BUCKETS
+        for piece_type in PieceType:
+            if piece_type == PieceType.KING:
+                continue
+            for relation, color in enumerate(Color):
+                # From White's perspective (the shared orientation): own pieces are White's, positive.
+                mg = np.array(MG[color][piece_type], dtype=np.float64)
+                eg = np.array(EG[color][piece_type], dtype=np.float64)
+                blended = (mg * phase + eg * (PHASE_MAX - phase)) / PHASE_MAX
+                psqt[:, piece_type * 2 + relation, :, bucket] = np.round(blended * PSQT_SCALE)
+    return Network(
+        ft_bias=np.zeros(hidden, dtype=np.int16),
+        ft_weights=np.zeros((FEATURES, hidden), dtype=np.int16),
+        psqt=psqt.reshape(FEATURES, PSQT_BUCKETS),
+        l1_bias=np.zeros(dense, dtype=np.int32),
+        l1_weights=np.zeros((2 * hidden, dense), dtype=np.int8),
+        out_bias=np.zeros(1, dtype=np.int32),
+        out_weights=np.zeros(dense, dtype=np.int8),
+    )
+
+
+def feature_index(perspective: Color, king: Square, piece: Piece, square: Square) -> int:
+    """The input a non-king `piece` on `square` activates from `perspective`, whose king is on `king`."""
+    flip = 0 if perspective == Color.WHITE else 56
+    relation = 0 if piece.color == perspective else 1
+    return (king ^ flip) * 640 + (piece.type * 2 + relation) * 64 + (square ^ flip)
+
+
+def _bucket(position: Position) -> int:
+    return min(position.phase, PHASE_MAX) * PSQT_BUCKETS // (PHASE_MAX + 1)
+
+
+@dataclass(slots=True)
+class _Frame:
+    """One move's piece changes, as (piece, square, +1 placed / -1 lifted), and the sums once computed."""
+
+    changes: list[tuple[Piece, Square, int]]
+    # (accumulators[perspective, hidden], psqt[perspective, bucket]), int32
+    sums: tuple[np.ndarray, np.ndarray] | None = None
+
+
+class Accumulator:
+    """A `PieceObserver` keeping `network`'s feature sums for the position it's attached to.
+
+    A copy or pickle of the position arrives without it; the evaluator attaches
+    a fresh one on first use.
+    """
+
+    def __init__(self, network: Network) -> None:
+        self.network = network
+        self._frames = [_Frame([])]
+
+    def __deepcopy__(self, memo: dict) -> None:
+        return None
+
+    def __reduce__(self) -> tuple[type[None], tuple[()]]:
+        return type(None), ()
+
+    def push(self) -> None:
+        self._frames.append(_Frame([]))
+
+    def lift(self, piece: Piece, square: Square) -> None:
+        self._frames[-1].changes.append((piece, square, -1))
+
+    def place(self, piece: Piece, square: Square) -> None:
+        self._frames[-1].changes.append((piece, square, 1))
+
+    def pop(self) -> None:
+        self._frames.pop()
+        if not self._frames:
+            # Unmade past the move it was attached at: nothing below is known.
+            self._frames.append(_Frame([]))
+
+    def _refresh(self, position: Position, perspective: Color, sums: tuple[np.ndarray, np.ndarray]) -> None:
+        king = position.king_square(perspective)
+        active = [
+            feature_index(perspective, king, piece, square)
+            for square, piece in enumerate(position.squares)
+            if piece is not None and piece.type != PieceType.KING
+        ]
+        accumulators, psqt = sums
+        network = self.network
+        accumulators[perspective] = network.ft_bias + network.ft_weights[active].sum(axis=0, dtype=np.int32)
+        psqt[perspective] = network.psqt[active].sum(axis=0, dtype=np.int32)
+
+    def _update(
+        self,
+        position: Position,
+        perspective: Color,
+        changes: list[tuple[Piece, Square, int]],
+        sums: tuple[np.ndarray, np.ndarray],
+    ) -> None:
+        """Add the weight rows of the features `changes` switch on and subtract those they switch off."""
+        king = position.king_square(perspective)
+        added, removed = [], []
+        for piece, square, sign in changes:
+            if piece.type != PieceType.KING:
+                (added if sign > 0 else removed).append(feature_index(perspective, king, piece, square))
+        accumulators, psqt = sums
+        network = self.network
+        accumulators[perspective] += network.ft_weights[added].sum(axis=0, dtype=np.int32)
+        accumulators[perspective] -= network.ft_weights[removed].sum(axis=0, dtype=np.int32)
+        psqt[perspective] += network.psqt[added].sum(axis=0, dtype=np.int32)
+        psqt[perspective] -= network.psqt[removed].sum(axis=0, dtype=np.int32)
+
+    def sums(self, position: Position) -> tuple[np.ndarray, np.ndarray]:
+        """The accumulators and PSQT sums for `position`, updated from the last frame that has them."""
+        frames = self._frames
+        if frames[-1].sums is not None:
+            return frames[-1].sums
+        base = len(frames) - 2
+        while base >= 0 and frames[base].sums is None:
+            base -= 1
+        base_sums = frames[base].sums if base >= 0 else None
+        if base_sums is None:
+            hidden = self.network.hidden
+            sums = np.zeros((2, hidden), dtype=np.int32), np.zeros((2, PSQT_BUCKETS), dtype=np.int32)
+            for perspective in Color:
+                self._refresh(position, perspective, sums)
+        else:
+            sums = base_sums[0].copy(), base_sums[1].copy()
+            changes = [change for frame in frames[base + 1 :] for change in frame.changes]
+            for perspective in Color:
+                if any(piece.type == PieceType.KING and piece.color == perspective for piece, _, _ in changes):
+                    self._refresh(position, perspective, sums)
+                else:
+                    self._update(position, perspective, changes, sums)
+        frames[-1].sums = sums
+        return sums
+
+
+class NnueEval:
+    """A `PositionEvalFn` running an NNUE network; positive for white.
+
+    The network loads from `path`, else from the file named by the
+    DREWBERT_NNUE_FILE environment variable, else comes from
+    `bootstrap_network`, on first use. A pickled evaluator (as sent to a
+    search's worker processes) carries only the path.
+    """
+
+    def __init__(self, path: Path | str | None = None) -> None:
+        self.path = path
+        self._network: Network | None = None
+        self._l1_weights = np.zeros(0, dtype=np.int32)
+        self._out_weights = np.zeros(0, dtype=np.int32)
+
+    def __reduce__(self) -> tuple[type["NnueEval"], tuple[Path | str | None]]:
+        return NnueEval, (self.path,)
+
+    @property
+    def network(self) -> Network:
+        if self._network is None:
+            path = self.path or os.environ.get(NNUE_FILE_ENV)
+            self._network = load_network(path) if path else bootstrap_network()
+            # The dense layers are small: widen them once so each evaluation multiplies in int32.
+            self._l1_weights = self._network.l1_weights.astype(np.int32)
+            self._out_weights = self._network.out_weights.astype(np.int32)
+        return self._network
+
+    def __call__(self, position: Position) -> int:
+        network = self.network
+        accumulator = position.observer
+        if not isinstance(accumulator, Accumulator) or accumulator.network is not network:
+            accumulator = position.observer = Accumulator(network)
+        accumulators, psqt = accumulator.sums(position)
+        us, them = position.side_to_move, position.side_to_move.opposite
+        inputs = np.clip(np.concatenate((accumulators[us], accumulators[them])), 0, ACTIVATION_MAX)
+        hidden = np.clip((inputs @ self._l1_weights + network.l1_bias) >> WEIGHT_SHIFT, 0, ACTIVATION_MAX)
+        positional = int(hidden @ self._out_weights + network.out_bias[0]) // OUTPUT_SCALE
+        bucket = _bucket(position)
+        material = int(psqt[us, bucket] - psqt[them, bucket]) // (2 * PSQT_SCALE)
+        score = material + positional
+        return score if us == Color.WHITE else -score
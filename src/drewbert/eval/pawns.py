@@ -0,0 +1,215 @@
+"""Pawn-structure evaluation with a pawn hash table.
+
+Pawn structure is scored from two pawn bitsets, one int per color with bit
+`square` set for each pawn, against masks precomputed here: doubled,
+isolated and backward pawns are penalized, passed pawns earn a bonus that
+grows as they advance (of doubled passers, only the front one). Each term
+has a middlegame and an endgame value.
+
+The structure only changes when a pawn moves, so its score is cached in a
+`PawnHashTable` keyed by `Position.pawn_hash`, which make/unmake keep up to
+date. Positions in a search share a handful of pawn structures, so almost
+every lookup hits. An entry keeps the bitsets as well as the score, so the
+king's pawn shield, which also depends on where the king stands, is scored
+from them on every call without rescanning the board.
+"""
+
+from array import array
+
+from drewbert.core.position import Position
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.pst import taper, tapered_pst_eval
+
+DEFAULT_ENTRIES = 1 << 14
+
+# (middlegame, endgame) per pawn, from the pawn owner's side.
+DOUBLED = (-10, -20)
+ISOLATED = (-10, -15)
+BACKWARD = (-8, -10)
+# Indexed by the pawn's rank counted from its own side (1..6; a pawn never stands on 0 or 7).
+PASSED_MG = (0, 5, 10, 15, 25, 40, 60, 0)
+PASSED_EG = (0, 10, 20, 30, 50, 75, 110, 0)
+# Middlegame bonus per own pawn on the three files around the king, one and two ranks ahead of it.
+SHIELD_NEAR = 10
+SHIELD_FAR = 5
+# What pawn structure and shields are assumed never to outweigh, for lazy evaluation.
+STRUCTURE_MARGIN = 200
+
+FILES = [sum(1 << (rank * 8 + file) for rank in range(8)) for file in range(8)]
+ADJACENT_FILES = [(FILES[file - 1] if file > 0 else 0) | (FILES[file + 1] if file < 7 else 0) for file in range(8)]
+# RANKS_AHEAD[color][rank]: every square on a rank strictly in front of `rank`, as `color` advances.
+RANKS_AHEAD = [
+    [sum(0xFF << (r * 8) for r in range(rank + 1, 8)) for rank in range(8)],
+    [sum(0xFF << (r * 8) for r in range(rank)) for rank in range(8)],
+]
+
+
+def _masks(color: Color, square: int) -> tuple[int, int, int]:
+    """(passed, support, stop attackers) for a `color` pawn on `square`.
+
+    Passed: squares in front on its own and adjacent files, which must be free of
+    enemy pawns. Support: squares on adjacent files level with or behind it,
+    where a friendly pawn could guard its advance. Stop attackers: squares from
+    which an enemy pawn attacks the square in front of it.
+    """
+    file, rank = square % 8, square // 8
+    ahead = RANKS_AHEAD[color][rank]
+    forward = 1 if color == Color.WHITE else -1
+    stop_rank = rank + forward
+    attack_rank = stop_rank + forward
+    attackers = 0
+    if 0 <= attack_rank < 8:
+        attackers = ADJACENT_FILES[file] & (0xFF << (attack_rank * 8))
+    return (FILES[file] | ADJACENT_FILES[file]) & ahead, ADJACENT_FILES[file] & ~ahead, attackers
+
+
+def _shield(color: Color, square: int, ranks_ahead: int) -> int:
+    """Squares on the king's file and its neighbours, `ranks_ahead` ranks in front of a `color` king on `square`."""
+    rank = square // 8 + (ranks_ahead if color == Color.WHITE else -ranks_ahead)
+    if not 0 <= rank < 8:
+        return 0
+    return (FILES[square % 8] | ADJACENT_FILES[square % 8]) & (0xFF << (rank * 8))
+
+
+# PASSED_MASKS[color][square], SUPPORT_MASKS[...][...], STOP_ATTACKERS[...][...], SHIELD_*_MASKS[...][...]
+PASSED_MASKS, SUPPORT_MASKS, STOP_ATTACKERS = (
+    [[_masks(color, square)[i] for square in range(64)] for color in Color] for i in range(3)
+)
+# FRONT_SPANS[color][square]: the squares in front of a `color` pawn on `square`, on its own file.
+FRONT_SPANS = [[FILES[square % 8] & RANKS_AHEAD[color][square // 8] for square in range(64)] for color in Color]
+SHIELD_NEAR_MASKS = [[_shield(color, square, 1) for square in range(64)] for color in Color]
+SHIELD_FAR_MASKS = [[_shield(color, square, 2) for square in range(64)] for color in Color]
+
+
+def pawn_bitsets(position: Position) -> tuple[int, int]:
+    """(white pawns, black pawns) as bitsets with bit `square` set for each pawn."""
+    white = black = 0
+    for square, piece in enumerate(position.squares):
+        if piece is not None and piece.type == PieceType.PAWN:
+            if piece.color == Color.WHITE:
+                white |= 1 << square
+            else:
+                black |= 1 << square
+    return white, black
+
+
+def _side_structure(color: Color, own: int, enemy: int) -> tuple[int, int]:
+    """(middlegame, endgame) structure score for `color`'s pawns, from its own side."""
+    mg = eg = 0
+    for file_mask in FILES:
+        count = (own & file_mask).bit_count()
+        if count > 1:
+            mg += DOUBLED[0] * (count - 1)
+            eg += DOUBLED[1] * (count - 1)
+    pawns = own
+    while pawns:
+        bit = pawns & -pawns
+        pawns ^= bit
+        square = bit.bit_length() - 1
+        # A pawn behind its own passer is held up by it; the bonus goes to the front one.
+        if not enemy & PASSED_MASKS[color][square] and not own & FRONT_SPANS[color][square]:
+            relative_rank = square // 8 if color == Color.WHITE else 7 - square // 8
+            mg += PASSED_MG[relative_rank]
+            eg += PASSED_EG[relative_rank]
+        if not own & ADJACENT_FILES[square % 8]:
+            mg += ISOLATED[0]
+            eg += ISOLATED[1]
+        elif not own & SUPPORT_MASKS[color][square] and enemy & STOP_ATTACKERS[color][square]:
+            mg += BACKWARD[0]
+            eg += BACKWARD[1]
+    return mg, eg
+
+
+def pawn_structure(white: int, black: int) -> tuple[int, int]:
+    """(middlegame, endgame) pawn-structure score, positive for white, from the two pawn bitsets."""
+    white_mg, white_eg = _side_structure(Color.WHITE, white, black)
+    black_mg, black_eg = _side_structure(Color.BLACK, black, white)
+    return white_mg - black_mg, white_eg - black_eg
+
+
+def _shield_score(color: Color, pawns: int, king: int) -> int:
+    near = (pawns & SHIELD_NEAR_MASKS[color][king]).bit_count()
+    far = (pawns & SHIELD_FAR_MASKS[color][king]).bit_count()
+    return near * SHIELD_NEAR + far * SHIELD_FAR
+
+
+def king_shield(position: Position, white: int, black: int) -> int:
+    """Middlegame pawn-shield score, positive for white."""
+    white_shield = _shield_score(Color.WHITE, white, position.king_square(Color.WHITE))
+    return white_shield - _shield_score(Color.BLACK, black, position.king_square(Color.BLACK))
+
+
+class PawnHashTable:
+    """Pawn-structure scores and pawn bitsets for `entries` pawn structures, keyed by `Position.pawn_hash`.
+
+    A direct-mapped table in flat arrays, like `EvalCache`: a lookup compares
+    the stored key, and a new structure replaces whatever shared its slot.
+    `entries` must be a power of two. `probes` and `hits` count lookups since
+    the last `clear`; a pickled table arrives empty, with the same size.
+    """
+
+    def __init__(self, entries: int = DEFAULT_ENTRIES) -> None:
+        if entries <= 0 or entries & (entries - 1):
+            raise ValueError(f"pawn hash table needs a power-of-two entry count, got {entries}")
+        self._mask = entries - 1
+        self.clear()
+
+    def __reduce__(self) -> tuple[type["PawnHashTable"], tuple[int]]:
+        return PawnHashTable, (self.entries,)
+
+    @property
+    def entries(self) -> int:
+        return self._mask + 1
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+    def probe(self, position: Position) -> tuple[int, int, int, int]:
+        """(middlegame, endgame, white pawns, black pawns) for `position`'s pawn structure."""
+        key = position.pawn_hash
+        index = key & self._mask
+        self.probes += 1
+        # An empty slot holds key 0, as does a board without pawns; that one is cheap to score anyway.
+        if key and self._keys[index] == key:
+            self.hits += 1
+            return self._mg[index], self._eg[index], self._white[index], self._black[index]
+        white, black = pawn_bitsets(position)
+        mg, eg = pawn_structure(white, black)
+        self._keys[index] = key
+        self._mg[index] = mg
+        self._eg[index] = eg
+        self._white[index] = white
+        self._black[index] = black
+        return mg, eg, white, black
+
+    def clear(self) -> None:
+        """Forget every entry and reset the counters."""
+        entries = self.entries
+        self._keys = array("Q", bytes(8 * entries))
+        self._mg = array("q", bytes(8 * entries))
+        self._eg = array("q", bytes(8 * entries))
+        self._white = array("Q", bytes(8 * entries))
+        self._black = array("Q", bytes(8 * entries))
+        self.probes = 0
+        self.hits = 0
+
+
+class PawnStructureEval:
+    """A `PositionEvalFn`: the tapered piece-square evaluation plus pawn structure and king shields.
+
+    Positive for white. Pawn structure comes from `table`, so it costs a lookup
+    on all but the first visit to each structure; the shield is computed from
+    the cached bitsets. Both are blended by game phase like `tapered_pst_eval`.
+    """
+
+    def __init__(self, entries: int = DEFAULT_ENTRIES) -> None:
+        self.table = PawnHashTable(entries)
+
+    def __call__(self, position: Position) -> int:
+        return tapered_pst_eval(position) + self.structure(position)
+
+    def structure(self, position: Position) -> int:
+        """The pawn-structure and shield terms alone, positive for white."""
+        mg, eg, white, black = self.table.probe(position)
+        return taper(mg + king_shield(position, white, black), eg, position.phase)
@@ -0,0 +1,21 @@
+from drewbert.core.position import Position
+from drewbert.core.psqt import PHASE_MAX
+
+
+def tapered_pst_eval(position: Position) -> int:
+    """Piece-square evaluation blended between middlegame and endgame tables by game phase.
+
+    Positive for white. Reads the position's running middlegame, endgame and
+    phase totals (see `drewbert.core.psqt`), so it costs O(1) per call. The phase
+    is non-pawn material, PHASE_MAX with every piece on the board (more after a
+    promotion, which counts as PHASE_MAX) and 0 with only kings and pawns left.
+    """
+    return taper(position.mg_score, position.eg_score, position.phase)
+
+
+def taper(mg: int, eg: int, phase: int) -> int:
+    """Blend a middlegame and an endgame score: all `mg` at PHASE_MAX (or more), all `eg` at 0."""
+    phase = min(phase, PHASE_MAX)
+    blended = mg * phase + eg * (PHASE_MAX - phase)
+    # Round toward zero so that a mirrored position scores exactly the negation.
+    return blended // PHASE_MAX if blended >= 0 else -(-blended // PHASE_MAX)
@@ -0,0 +1,308 @@
+"""Texel tuning of the tapered piece-square tables.
+
+The tapered evaluation is linear in its tables. Write one feature per
+(piece type, square) from White's side: +1 for a white piece of that type
+there, -1 for a black piece on the mirrored square. A position's middlegame
+score is then the dot product of its features with the middlegame tables
+(value plus bonus, per piece type and square), its endgame score likewise,
+and the evaluation blends the two by game phase.
+
+So a labelled dataset (positions with the result of the game they came from)
+reduces to a feature matrix, a phase share and a result per position,
+extracted once by `extract_features` into files that `load_dataset`
+memory-maps. `tune` then fits the tables to minimize the mean squared error
+between each result and the sigmoid of the evaluation, with Adam steps on
+gradients computed a chunk of rows at a time in numpy, optionally sharded
+across a process pool. `weights_to_tables` turns the fitted weights back into
+a `PieceSquareTables` for `save_tables`, keeping the piece values fixed and
+tuning the bonuses around them.
+"""
+
+import json
+import math
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing import get_context
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("drewbert.eval.texel needs numpy: install the `numpy` extra") from error
+
+from drewbert.core.psqt import PHASE, PHASE_MAX, TABLES, PieceSquareTables
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.batch import PIECE_CODES, boards_from_fens
+
+FEATURES = len(PieceType) * 64
+# Rows extracted, or evaluated, at a time.
+CHUNK_SIZE = 1 << 16
+RESULTS = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+DEFAULT_SCALE = 1.0
+DEFAULT_LEARNING_RATE = 1.0
+
+_METADATA = "dataset.json"
+_FEATURES_FILE = "features.i8"
+_PHASE_FILE = "phase.f32"
+_RESULTS_FILE = "results.f32"
+
+# _FEATURE_INDEX[code, square]: the feature a piece code on a square counts toward; _FEATURE_SIGN[code] how.
+_FEATURE_INDEX = np.zeros((PIECE_CODES, 64), dtype=np.intp)
+_FEATURE_SIGN = np.zeros(PIECE_CODES, dtype=np.int8)
+_PHASE_WEIGHTS = np.zeros(PIECE_CODES, dtype=np.int64)
+for _color in Color:
+    for _piece_type in PieceType:
+        _code = 1 + 6 * _color + _piece_type
+        _flip = 0 if _color == Color.WHITE else 56
+        _FEATURE_INDEX[_code] = [_piece_type * 64 + (square ^ _flip) for square in range(64)]
+        _FEATURE_SIGN[_code] = 1 if _color == Color.WHITE else -1
+        _PHASE_WEIGHTS[_code] = PHASE[_color][_piece_type]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Extracted positions: features (N, FEATURES) int8, the middlegame share of each evaluation, and results.
+
+    Results are White's score: 1 for a win, 0.5 a draw, 0 a loss. The arrays
+    are memory maps when loaded from `directory`.
+    """
+
+    features: np.ndarray
+    phase: np.ndarray
+    results: np.ndarray
+    directory: Path | None = None
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+
+def parse_result(token: str) -> float:
+    """White's score from a result token: `1-0`, `0-1`, `1/2-1/2` or a number, optionally quoted or bracketed."""
+    token = token.strip('[]";')
+    if token in RESULTS:
+        return RESULTS[token]
+    try:
+        result = float(token)
+    except ValueError:
+        raise ValueError(f"unrecognized game result: {token!r}") from None
+    if not 0.0 <= result <= 1.0:
+        raise ValueError(f"game result out of range: {token!r}")
+    return result
+
+
+def position_features(boards: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Features (N, FEATURES) int8 and middlegame shares (N,) float32 of an (N, 64) array of piece codes."""
+    features = np.zeros((len(boards), FEATURES), dtype=np.int8)
+    for white in (True, False):
+        rows, squares = np.nonzero((boards >= 1) & (boards <= 6) if white else boards > 6)
+        codes = boards[rows, squares]
+        # A white and a black piece can share a feature but two of one color can't, so one color at a time
+        # never repeats an index within the fancy-indexed add.
+        features[rows, _FEATURE_INDEX[codes, squares]] += _FEATURE_SIGN[codes]
+    phase = np.minimum(_PHASE_WEIGHTS.take(boards).sum(axis=1), PHASE_MAX) / PHASE_MAX
+    return features, phase.astype(np.float32)
+
+
+def _labelled_chunks(lines: Iterable[str]) -> Iterator[tuple[list[str], list[float]]]:
+    """(FENs, results) a chunk at a time from lines of a FEN followed by the game result; blank lines skipped."""
+    entries = (line.rsplit(maxsplit=1) for line in lines if line.strip())
+    while chunk := list(islice(entries, CHUNK_SIZE)):
+        if any(len(entry) != 2 for entry in chunk):
+            raise ValueError("expected a FEN and a result on every line")
+        yield [fen for fen, _ in chunk], [parse_result(result) for _, result in chunk]
+
+
+def extract_features(lines: Iterable[str], directory: Path | str) -> Dataset:
+    """Extract each line's features into `directory` and return them loaded.
+
+    Each line holds a FEN (only the piece placement matters) and the game's
+    result, last. Raises ValueError on a malformed line.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    positions = 0
+    with (
+        (directory / _FEATURES_FILE).open("wb") as features_file,
+        (directory / _PHASE_FILE).open("wb") as phase_file,
+        (directory / _RESULTS_FILE).open("wb") as results_file,
+    ):
+        for fens, results in _labelled_chunks(lines):
+            features, phase = position_features(boards_from_fens(fens))
+            features_file.write(features.tobytes())
+            phase_file.write(phase.tobytes())
+            results_file.write(np.array(results, dtype=np.float32).tobytes())
+            positions += len(fens)
+    (directory / _METADATA).write_text(json.dumps({"positions": positions, "features": FEATURES}) + "\n")
+    return load_dataset(directory)
+
+
+def load_dataset(directory: Path | str) -> Dataset:
+    """Memory-map a dataset written by `extract_features`."""
+    directory = Path(directory)
+    positions = json.loads((directory / _METADATA).read_text())["positions"]
+    if positions == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return Dataset(np.zeros((0, FEATURES), dtype=np.int8), empty, empty, directory)
+    return Dataset(
+        np.memmap(directory / _FEATURES_FILE, dtype=np.int8, mode="r", shape=(positions, FEATURES)),
+        np.memmap(directory / _PHASE_FILE, dtype=np.float32, mode="r", shape=(positions,)),
+        np.memmap(directory / _RESULTS_FILE, dtype=np.float32, mode="r", shape=(positions,)),
+        directory,
+    )
+
+
+def initial_weights(tables: PieceSquareTables = TABLES) -> np.ndarray:
+    """Tuning weights (2, FEATURES), middlegame then endgame, holding `tables`: each piece's value plus its bonus."""
+    weights = np.zeros((2, FEATURES))
+    for piece_type in PieceType:
+        columns = slice(piece_type * 64, piece_type * 64 + 64)
+        weights[0, columns] = np.add(tables.mg_bonus[piece_type], tables.mg_values[piece_type])
+        weights[1, columns] = np.add(tables.eg_bonus[piece_type], tables.eg_values[piece_type])
+    return weights
+
+
+def weights_to_tables(weights: np.ndarray, base: PieceSquareTables = TABLES) -> PieceSquareTables:
+    """`PieceSquareTables` for tuned `weights`, keeping `base`'s piece values: bonuses absorb every change."""
+    rounded = np.rint(weights).astype(int)
+
+    def bonuses(phase: int, values: list[int]) -> list[list[int]]:
+        return [
+            (rounded[phase, piece_type * 64 : piece_type * 64 + 64] - values[piece_type]).tolist()
+            for piece_type in PieceType
+        ]
+
+    return PieceSquareTables(
+        list(base.mg_values),
+        list(base.eg_values),
+        bonuses(0, base.mg_values),
+        bonuses(1, base.eg_values),
+    )
+
+
+def evaluate(dataset: Dataset, weights: np.ndarray) -> np.ndarray:
+    """The tapered evaluation of each position under `weights`, unrounded."""
+    scores = np.empty(len(dataset))
+    for start in range(0, len(dataset), CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        middlegame, endgame = (dataset.features[start:stop].astype(np.float32) @ weights.T.astype(np.float32)).T
+        phase = dataset.phase[start:stop]
+        scores[start:stop] = middlegame * phase + endgame * (1 - phase)
+    return scores
+
+
+def _loss_and_gradient(
+    dataset: Dataset, weights: np.ndarray, scale: float, start: int, stop: int
+) -> tuple[float, np.ndarray]:
+    """Summed squared error over rows [start, stop), and its gradient with respect to `weights`."""
+    # The sigmoid maps an evaluation of 400 * `scale` centipawns to an expected score of 10 / 11.
+    k = scale * math.log(10) / 400
+    loss = 0.0
+    gradient = np.zeros((2, FEATURES), dtype=np.float64)
+    weights32 = weights.T.astype(np.float32)
+    for chunk in range(start, stop, CHUNK_SIZE):
+        rows = slice(chunk, min(chunk + CHUNK_SIZE, stop))
+        features = dataset.features[rows].astype(np.float32)
+        phase = np.asarray(dataset.phase[rows], dtype=np.float64)
+        blend = np.stack((phase, 1 - phase), axis=1)
+        scores = ((features @ weights32) * blend).sum(axis=1)
+        expected = 1 / (1 + np.exp(-k * scores))
+        error = expected - dataset.results[rows]
+        loss += float(error @ error)
+        # d(error^2)/d(score), spread over the two phases.
+        slope = (2 * k * error * expected * (1 - expected))[:, None] * blend
+        gradient += (features.T @ slope.astype(np.float32)).T
+    return loss, gradient
+
+
+def _shard_loss_and_gradient(
+    directory: Path, weights: np.ndarray, scale: float, start: int, stop: int
+) -> tuple[float, np.ndarray]:
+    """`_loss_and_gradient` in a worker process, which maps the dataset itself."""
+    return _loss_and_gradient(load_dataset(directory), weights, scale, start, stop)
+
+
+def loss_and_gradient(
+    dataset: Dataset,
+    weights: np.ndarray,
+    scale: float = DEFAULT_SCALE,
+    pool: ProcessPoolExecutor | None = None,
+    shards: int = 1,
+) -> tuple[float, np.ndarray]:
+    """Mean squared error between results and the sigmoid of the evaluation, and its gradient.
+
+    With a `pool`, the rows are split into `shards` equal tasks; the dataset
+    must then have been loaded from a directory.
+    """
+    if len(dataset) == 0:
+        raise ValueError("empty dataset")
+    if pool is None:
+        loss, gradient = _loss_and_gradient(dataset, weights, scale, 0, len(dataset))
+    else:
+        if dataset.directory is None:
+            raise ValueError("a process pool needs a dataset loaded from a directory")
+        bounds = np.linspace(0, len(dataset), shards + 1).astype(int)
+        futures = [
+            pool.submit(_shard_loss_and_gradient, dataset.directory, weights, scale, int(start), int(stop))
+            for start, stop in zip(bounds[:-1], bounds[1:], strict=True)
+            if stop > start
+        ]
+        results = [future.result() for future in futures]
+        loss = sum(shard_loss for shard_loss, _ in results)
+        gradient = np.sum([shard_gradient for _, shard_gradient in results], axis=0)
+    return loss / len(dataset), gradient / len(dataset)
+
+
+def fit_scale(dataset: Dataset, weights: np.ndarray, low: float = 0.1, high: float = 4.0, steps: int = 30) -> float:
+    """The sigmoid scale minimizing the loss of fixed `weights`, by golden-section search over [low, high]."""
+    ratio = (math.sqrt(5) - 1) / 2
+    scores = evaluate(dataset, weights)
+    results = np.asarray(dataset.results, dtype=np.float64)
+
+    def loss(scale: float) -> float:
+        return float(np.mean((results - 1 / (1 + np.exp(-scale * math.log(10) / 400 * scores))) ** 2))
+
+    for _ in range(steps):
+        a, b = high - ratio * (high - low), low + ratio * (high - low)
+        if loss(a) < loss(b):
+            high = b
+        else:
+            low = a
+    return (low + high) / 2
+
+
+def tune(
+    dataset: Dataset,
+    weights: np.ndarray,
+    epochs: int,
+    learning_rate: float = DEFAULT_LEARNING_RATE,
+    scale: float = DEFAULT_SCALE,
+    workers: int = 1,
+    on_epoch: Callable[[int, float], None] | None = None,
+) -> np.ndarray:
+    """Fit `weights` to `dataset` with `epochs` full-batch Adam steps; returns the new weights.
+
+    `learning_rate` is roughly how far, in centipawns, one step moves each
+    weight. `workers` > 1 shards each gradient across a process pool.
+    `on_epoch`, if given, is called with each epoch number (from 1) and the
+    loss before that epoch's step.
+    """
+    beta1, beta2, epsilon = 0.9, 0.999, 1e-8
+    weights = np.array(weights, dtype=np.float64)
+    moment = np.zeros_like(weights)
+    variance = np.zeros_like(weights)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) if workers > 1 else None
+    try:
+        for epoch in range(1, epochs + 1):
+            loss, gradient = loss_and_gradient(dataset, weights, scale, pool, workers)
+            if on_epoch is not None:
+                on_epoch(epoch, loss)
+            moment = beta1 * moment + (1 - beta1) * gradient
+            variance = beta2 * variance + (1 - beta2) * gradient**2
+            step = (moment / (1 - beta1**epoch)) / (np.sqrt(variance / (1 - beta2**epoch)) + epsilon)
+            weights -= learning_rate * step
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return weights
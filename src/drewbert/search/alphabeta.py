@@ -0,0 +1,692 @@
+"""Alpha-beta search with quiescence and shallow-depth forward pruning.
+
+Negamax formulation: inside the search every score is relative to the side to
+move (positive = good for the mover). The evaluator keeps the repo-wide
+convention of positive-for-White, so it is sign-flipped on the way in. A
+`WindowedEvalFn` gets the window at quiescence stand-pat, where most leaves are
+evaluated, and may stop early there; interior nodes ask for an exact score,
+since the pruning below compares it against margins beyond the window.
+
+Forward pruning near the leaves (all disabled while in check, and whenever
+the bound being compared against is a mate score):
+  - Reverse futility (static null move): at depth d, if the static eval minus
+    `reverse_futility[d]` still beats beta, the opponent will avoid this node.
+  - Razoring: at depth d, if the static eval plus `razoring[d]` can't reach
+    alpha, drop into quiescence and trust it if it also fails low.
+  - Futility: at depth d, if the static eval plus `futility[d]` can't reach
+    alpha, skip quiet moves that don't give check.
+
+The transposition table's move for a node is checked with `is_legal_move` and
+searched before the node's moves are generated, so a cutoff from it skips
+move generation. A node with no hash move at depth IID_MIN_DEPTH or more that
+is a PV node (an open window) or an expected cut node (static eval at or
+above beta) first runs internal iterative deepening: a search IID_REDUCTION
+plies shallower, whose best move the table then supplies as the hash move.
+
+The root is searched by iterative deepening. With a transposition table each
+iteration seeds the next one's move ordering, and `should_stop` lets another
+thread or process cut the search short between iterations' worth of work.
+`limited_search` drives it from a `SearchLimits`; its node budgets are exact,
+so a node-limited search gives the same answer on any machine.
+"""
+
+import time
+from collections.abc import Callable, Collection, Iterator
+from dataclasses import dataclass, field, replace
+from typing import NamedTuple, cast
+
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves, is_in_check, is_legal_move
+from drewbert.core.position import Color, Move, Position
+from drewbert.core.types import PieceType
+from drewbert.search.limits import MAX_DEPTH, LimitTracker, SearchLimits
+from drewbert.search.minimax import CHECKMATE_SCORE, DRAW_SCORE, FIFTY_MOVE_PLIES, STALEMATE_SCORE
+from drewbert.search.stats import DepthStats, SearchStats
+from drewbert.search.tt import EXACT, LOWER, UPPER, TranspositionTable
+from drewbert.search.types import PositionEvalFn, WindowedEvalFn, accepts_window
+
+INFINITY = CHECKMATE_SCORE + 1
+# Scores beyond this magnitude are mate scores; pruning margins are meaningless there.
+MATE_BOUND = CHECKMATE_SCORE - 1000
+# How often (in nodes) a running search checks `should_stop`. A node costs a few hundred
+# microseconds in pure Python, so this keeps the reaction to `stop` within a few milliseconds.
+STOP_POLL_NODES = 16
+DEFAULT_TT_MB = 16
+# Internal iterative deepening: the shallowest depth it runs at, and how much shallower its search is.
+IID_MIN_DEPTH = 4
+IID_REDUCTION = 2
+
+# Coarse piece values used only to order captures (most valuable victim, least valuable attacker).
+# Indexed by PieceType. The king is never a victim in legal chess.
+_ORDERING_VALUES = (1, 3, 3, 5, 9, 0)
+
+
+@dataclass(frozen=True, slots=True)
+class PruningMargins:
+    """Per-depth margins for shallow forward pruning, in centipawns.
+
+    Each tuple is indexed by remaining depth; index 0 is unused. A prune type
+    only fires at depths the tuple covers, so `()` disables it entirely and a
+    longer tuple extends it to deeper nodes.
+    """
+
+    futility: tuple[int, ...] = (0, 200, 450)
+    reverse_futility: tuple[int, ...] = (0, 150, 300, 450)
+    # Razoring trusts quiescence, which can't see quiet mates; past depth 1 it misses mate-in-2s.
+    razoring: tuple[int, ...] = (0, 300)
+
+
+DEFAULT_MARGINS = PruningMargins()
+NO_PRUNING = PruningMargins(futility=(), reverse_futility=(), razoring=())
+
+
+@dataclass(slots=True)
+class _SearchContext:
+    """Per-search state threaded through the recursion."""
+
+    evaluator: PositionEvalFn
+    margins: PruningMargins
+    # The caller's counters, or None to skip everything but the node counts below.
+    stats: SearchStats | None = None
+    tt: TranspositionTable | None = None
+    should_stop: Callable[[], bool] | None = None
+    # Total of nodes + qnodes at which the search aborts.
+    node_limit: int | None = None
+    # Length of position.hash_history at the search root, for repetition detection.
+    root_ply: int = 0
+    # Whether the evaluator takes the search window (see `WindowedEvalFn`).
+    windowed: bool = field(init=False, default=False)
+    # Node counts and deepest ply, which node limits and `info` need even without `stats`. They start from
+    # `stats`' own, which `_report_counts` brings up to date.
+    nodes: int = field(init=False, default=0)
+    qnodes: int = field(init=False, default=0)
+    seldepth: int = field(init=False, default=0)
+
+    def __post_init__(self) -> None:
+        self.windowed = accepts_window(self.evaluator)
+        if self.stats is not None:
+            self.nodes, self.qnodes, self.seldepth = self.stats.nodes, self.stats.qnodes, self.stats.seldepth
+
+
+def _report_counts(ctx: _SearchContext) -> None:
+    """Copy the context's node counts to `ctx.stats`, if any."""
+    stats = ctx.stats
+    if stats is not None:
+        stats.nodes, stats.qnodes, stats.seldepth = ctx.nodes, ctx.qnodes, ctx.seldepth
+
+
+class SearchAborted(Exception):
+    """Raised inside the recursion when `should_stop` fires or the node budget runs out;
+    unwinds to the iterative-deepening loop.
+    """
+
+
+class PVLine(NamedTuple):
+    """One ranked root move with its score (relative to the side to move) and principal
+    variation, which starts with the move itself.
+    """
+
+    move: Move
+    score: int
+    pv: tuple[Move, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class IterationResult:
+    """Outcome of one completed iterative-deepening iteration.
+
+    `score` is relative to the side to move at the root, like UCI `score cp`.
+    `lines` ranks the best root moves found, best first; it has one entry per
+    requested MultiPV line, and is empty for searches that don't track them.
+    Each line's PV is just its move until `with_principal_variations` extends it.
+    The remaining fields feed UCI `info`: `nodes` (quiescence included) and
+    `elapsed` (seconds) count from the start of the search, not the iteration.
+    """
+
+    depth: int
+    score: int
+    move: Move
+    lines: tuple[PVLine, ...] = ()
+    seldepth: int = 0
+    nodes: int = 0
+    elapsed: float = field(default=0.0, compare=False)
+    hashfull: int = 0
+
+    @property
+    def pv(self) -> tuple[Move, ...]:
+        return self.lines[0].pv if self.lines else (self.move,)
+
+
+def _relative_eval(position: Position, evaluator: PositionEvalFn) -> int:
+    """Evaluate from the side to move's point of view."""
+    score = evaluator(position)
+    return score if position.side_to_move == Color.WHITE else -score
+
+
+def _windowed_eval(position: Position, ctx: _SearchContext, alpha: int, beta: int) -> int:
+    """Like `_relative_eval`, but a windowed evaluator may return early once the score is outside
+    [alpha, beta] (relative to the side to move, like the result).
+    """
+    if not ctx.windowed:
+        return _relative_eval(position, ctx.evaluator)
+    evaluator = cast(WindowedEvalFn, ctx.evaluator)
+    if position.side_to_move == Color.WHITE:
+        return evaluator(position, alpha, beta)
+    return -evaluator(position, -beta, -alpha)
+
+
+def _is_tactical(position: Position, move: Move) -> bool:
+    """Captures (including en passant) and promotions. Must be called before the move is made."""
+    if move.promotion is not None or position.squares[move.to_square] is not None:
+        return True
+    piece = position.squares[move.from_square]
+    return move.to_square == position.en_passant_target and piece is not None and piece.type == PieceType.PAWN
+
+
+def _mvv_lva(position: Position, move: Move) -> int:
+    """Ordering key for a move: captures by MVV-LVA, promotions next, quiet moves last."""
+    victim = position.squares[move.to_square]
+    attacker = position.squares[move.from_square]
+    attacker_value = _ORDERING_VALUES[attacker.type] if attacker is not None else 0
+    if victim is not None:
+        return 100 + 10 * _ORDERING_VALUES[victim.type] - attacker_value
+    if move.promotion is not None:
+        return 50 + _ORDERING_VALUES[move.promotion]
+    if move.to_square == position.en_passant_target and attacker is not None and attacker.type == PieceType.PAWN:
+        return 100 + 10 * _ORDERING_VALUES[PieceType.PAWN] - attacker_value
+    return 0
+
+
+def _order_moves(position: Position, moves: list[Move], hash_move: Move | None = None) -> list[Move]:
+    """Hash move first (if legal), then MVV-LVA."""
+    ordered = sorted(moves, key=lambda m: _mvv_lva(position, m), reverse=True)
+    if hash_move is not None and hash_move in moves:
+        ordered.remove(hash_move)
+        ordered.insert(0, hash_move)
+    return ordered
+
+
+def _hash_move_first(position: Position, hash_move: Move | None, legal_moves: list[Move] | None) -> Iterator[Move]:
+    """`hash_move` (already checked legal), then the rest by MVV-LVA. `legal_moves` is generated only
+    once the hash move has been searched, if it wasn't already, so a cutoff on the hash move saves it.
+    """
+    if hash_move is not None:
+        yield hash_move
+    if legal_moves is None:
+        legal_moves = generate_legal_moves(position)
+    for move in _order_moves(position, legal_moves):
+        if move != hash_move:
+            yield move
+
+
+def _score_to_tt(score: int, ply: int) -> int:
+    """Mate scores are stored as distance from the node, not from the root, so they stay valid on transposition."""
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score: int, ply: int) -> int:
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+def _poll(ctx: _SearchContext) -> None:
+    """Called on entering a node, before it is counted. Raises SearchAborted when the node budget
+    is spent, so a search visits exactly `node_limit` nodes, or when `should_stop` fires.
+    """
+    searched = ctx.nodes + ctx.qnodes
+    if ctx.node_limit is not None and searched >= ctx.node_limit:
+        raise SearchAborted
+    if ctx.should_stop is not None and searched % STOP_POLL_NODES == 0 and ctx.should_stop():
+        raise SearchAborted
+
+
+def _terminal_score(position: Position, ply: int) -> int:
+    """Score for a node with no legal moves, relative to the side to move."""
+    if is_in_check(position, position.side_to_move):
+        return -CHECKMATE_SCORE + ply
+    return STALEMATE_SCORE
+
+
+def quiescence(position: Position, ctx: _SearchContext, alpha: int, beta: int, ply: int) -> int:
+    """Resolve captures and promotions until the position is quiet, then return the static eval.
+
+    In check there is no stand-pat option, so every evasion is searched.
+    """
+    _poll(ctx)
+    ctx.qnodes += 1
+    if ply > ctx.seldepth:
+        ctx.seldepth = ply
+
+    legal_moves = generate_legal_moves(position)
+    if not legal_moves:
+        return _terminal_score(position, ply)
+
+    in_check = is_in_check(position, position.side_to_move)
+    if in_check:
+        best_score = -INFINITY
+        candidates = legal_moves
+    else:
+        best_score = _windowed_eval(position, ctx, alpha, beta)
+        if best_score >= beta:
+            return best_score
+        alpha = max(alpha, best_score)
+        candidates = [m for m in legal_moves if _is_tactical(position, m)]
+
+    for move in _order_moves(position, candidates):
+        with move_applied(position, move):
+            score = -quiescence(position, ctx, -beta, -alpha, ply + 1)
+        if score > best_score:
+            best_score = score
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+
+    return best_score
+
+
+def alphabeta(position: Position, ctx: _SearchContext, depth: int, alpha: int, beta: int, ply: int) -> int:
+    """Fail-soft negamax alpha-beta. Returns a score relative to the side to move.
+
+    Mate scores are `CHECKMATE_SCORE - ply` so that faster mates score higher.
+    A repetition (twofold inside the search, threefold counting the game) or
+    a fifty-move draw scores DRAW_SCORE.
+    """
+    if ply > 0 and position.is_repetition(ctx.root_ply):
+        return DRAW_SCORE
+    if depth <= 0:
+        return quiescence(position, ctx, alpha, beta, ply)
+
+    _poll(ctx)
+    ctx.nodes += 1
+    if ply > ctx.seldepth:
+        ctx.seldepth = ply
+    stats = ctx.stats
+
+    tt = ctx.tt
+    hash_move = None
+    if tt is not None:
+        if stats is not None:
+            stats.tt_probes += 1
+        entry = tt.probe(position.zobrist_hash)
+        if entry is not None:
+            if stats is not None:
+                stats.tt_hits += 1
+            hash_move = entry.move
+            if entry.depth >= depth:
+                score = _score_from_tt(entry.score, ply)
+                if (
+                    entry.bound == EXACT
+                    or (entry.bound == LOWER and score >= beta)
+                    or (entry.bound == UPPER and score <= alpha)
+                ):
+                    if stats is not None:
+                        stats.tt_cutoffs += 1
+                    return score
+
+    # A legal hash move proves the node isn't terminal; otherwise generate the moves to find out.
+    legal_moves = None
+    if hash_move is not None and not is_legal_move(position, hash_move):
+        hash_move = None
+    if hash_move is None:
+        legal_moves = generate_legal_moves(position)
+        if not legal_moves:
+            return _terminal_score(position, ply)
+    if position.halfmove_clock >= FIFTY_MOVE_PLIES:
+        return DRAW_SCORE
+
+    original_alpha = alpha
+    margins = ctx.margins
+    futile = False
+    best_score = -INFINITY
+    static_eval = None
+    if not is_in_check(position, position.side_to_move):
+        static_eval = _relative_eval(position, ctx.evaluator)
+
+        if (
+            depth < len(margins.reverse_futility)
+            and abs(beta) < MATE_BOUND
+            and static_eval - margins.reverse_futility[depth] >= beta
+        ):
+            if stats is not None:
+                stats.reverse_futility_prunes += 1
+            return static_eval
+
+        if depth < len(margins.razoring) and abs(alpha) < MATE_BOUND and static_eval + margins.razoring[depth] <= alpha:
+            score = quiescence(position, ctx, alpha, beta, ply)
+            if score <= alpha:
+                if stats is not None:
+                    stats.razor_prunes += 1
+                return score
+
+        if depth < len(margins.futility) and abs(alpha) < MATE_BOUND and static_eval + margins.futility[depth] <= alpha:
+            futile = True
+            # If every move gets pruned, the node fails low with its static eval.
+            best_score = static_eval
+
+    if (
+        hash_move is None
+        and tt is not None
+        and depth >= IID_MIN_DEPTH
+        and (beta - alpha > 1 or (static_eval is not None and static_eval >= beta))
+    ):
+        if stats is not None:
+            stats.iid_searches += 1
+        alphabeta(position, ctx, depth - IID_REDUCTION, alpha, beta, ply)
+        entry = tt.probe(position.zobrist_hash)
+        if entry is not None and entry.move in cast(list[Move], legal_moves):
+            hash_move = entry.move
+
+    best: Move | None = None
+    searched = 0
+    for move in _hash_move_first(position, hash_move, legal_moves):
+        tactical = futile and _is_tactical(position, move)
+        with move_applied(position, move):
+            if futile and not tactical and not is_in_check(position, position.side_to_move):
+                if stats is not None:
+                    stats.futility_prunes += 1
+                continue
+            score = -alphabeta(position, ctx, depth - 1, -beta, -alpha, ply + 1)
+        searched += 1
+        if score > best_score:
+            best_score, best = score, move
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    if stats is not None:
+                        stats.beta_cutoffs += 1
+                        if searched == 1:
+                            stats.first_move_cutoffs += 1
+                    break
+
+    if tt is not None:
+        if best_score >= beta:
+            bound = LOWER
+        elif best_score > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER
+        tt.store(position.zobrist_hash, best, depth, bound, _score_to_tt(best_score, ply))
+
+    return best_score
+
+
+def search_window(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    alpha: int,
+    beta: int,
+    ply: int = 0,
+    margins: PruningMargins = DEFAULT_MARGINS,
+    stats: SearchStats | None = None,
+    tt: TranspositionTable | None = None,
+) -> int:
+    """One alpha-beta search of `position` inside the (alpha, beta) window, for callers that drive
+    their own root. `ply` is the distance from the real root, so mate scores come out right.
+    """
+    ctx = _SearchContext(position_evaluator, margins, stats, tt)
+    ctx.root_ply = len(position.hash_history) - ply
+    try:
+        return alphabeta(position, ctx, depth, alpha, beta, ply)
+    finally:
+        _report_counts(ctx)
+
+
+def _search_root(position: Position, ctx: _SearchContext, depth: int, root_moves: list[Move]) -> IterationResult:
+    """Full-window search of every root move, in the given order."""
+    _poll(ctx)
+    ctx.nodes += 1
+    best = root_moves[0]
+    alpha = -INFINITY
+    for move in root_moves:
+        with move_applied(position, move):
+            score = -alphabeta(position, ctx, depth - 1, -INFINITY, -alpha, 1)
+        if score > alpha:
+            best, alpha = move, score
+    return IterationResult(depth, alpha, best)
+
+
+def _principal_variation(
+    position: Position, move: Move, tt: TranspositionTable | None, length: int
+) -> tuple[Move, ...]:
+    """`move` followed by the hash moves stored along its line, at most `length` moves in all.
+    Stops early at a missing or illegal hash move, or when a position repeats.
+    """
+    pv = [move]
+    undos = [position.make_move(move)]
+    seen = {position.zobrist_hash}
+    try:
+        while tt is not None and len(pv) < length:
+            entry = tt.probe(position.zobrist_hash)
+            if entry is None or entry.move is None or not is_legal_move(position, entry.move):
+                break
+            pv.append(entry.move)
+            undos.append(position.make_move(entry.move))
+            if position.zobrist_hash in seen:
+                break
+            seen.add(position.zobrist_hash)
+    finally:
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+    return tuple(pv)
+
+
+def with_principal_variations(
+    result: IterationResult, position: Position, tt: TranspositionTable | None
+) -> IterationResult:
+    """`result` with each line's PV followed through the hash moves in `tt` from `position`, its root.
+
+    Iterative deepening doesn't walk the table itself: most iterations are never
+    reported, so callers build the PVs only for the results they print or return.
+    """
+    lines = tuple(
+        PVLine(line.move, line.score, _principal_variation(position, line.move, tt, result.depth))
+        for line in result.lines
+    )
+    return replace(result, lines=lines)
+
+
+def iterative_deepening(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    max_depth: int,
+    margins: PruningMargins = DEFAULT_MARGINS,
+    stats: SearchStats | None = None,
+    tt: TranspositionTable | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    root_rotation: int = 0,
+    node_limit: int | None = None,
+    multipv: int = 1,
+    searchmoves: Collection[Move] | None = None,
+) -> Iterator[IterationResult]:
+    """Search depths 1..max_depth, yielding a result after each completed iteration.
+
+    With `multipv` > 1 each iteration ranks the best `multipv` root moves: after
+    each pass the move it found is excluded from the next, so the passes share
+    one search's move ordering and transposition table rather than being
+    independent searches. The previous iteration's ranking is searched first in
+    the next one.
+    `root_rotation` rotates the initial root move order; parallel helpers use
+    it so they don't all walk the tree in lockstep. If `should_stop` fires, or
+    the search has visited `node_limit` nodes (quiescence included) across all
+    iterations, the interrupted iteration is discarded and the generator ends.
+
+    `searchmoves` restricts the root to those moves, as UCI `go searchmoves`
+    does; illegal ones are ignored, and if none is legal every move is searched.
+    Below the root the search is the ordinary one, so a restricted search reuses
+    the table and ordering of earlier full searches and scoring one candidate
+    costs far less than a full search. Its best score is only the best among
+    the allowed moves, so it isn't stored as the root's entry.
+    """
+    legal_moves = generate_legal_moves(position)
+    if not legal_moves:
+        return
+    allowed = [move for move in legal_moves if move in searchmoves] if searchmoves is not None else []
+    restricted = 0 < len(allowed) < len(legal_moves)
+    if restricted:
+        legal_moves = allowed
+
+    ctx = _SearchContext(position_evaluator, margins, stats, tt, should_stop)
+    ctx.root_ply = len(position.hash_history)
+    if node_limit is not None:
+        ctx.node_limit = ctx.nodes + ctx.qnodes + node_limit
+    hash_entry = tt.probe(position.zobrist_hash) if tt is not None else None
+    root_moves = _order_moves(position, legal_moves, hash_entry.move if hash_entry is not None else None)
+    shift = root_rotation % len(root_moves)
+    root_moves = root_moves[shift:] + root_moves[:shift]
+    started, base_nodes = time.perf_counter(), ctx.nodes + ctx.qnodes
+
+    for depth in range(1, max_depth + 1):
+        iteration_started, iteration_base = time.perf_counter(), ctx.nodes + ctx.qnodes
+        remaining = list(root_moves)
+        lines: list[PVLine] = []
+        try:
+            while len(lines) < multipv and remaining:
+                result = _search_root(position, ctx, depth, remaining)
+                remaining.remove(result.move)
+                lines.append(PVLine(result.move, result.score, (result.move,)))
+        except SearchAborted:
+            _report_counts(ctx)
+            return
+        best = lines[0]
+        if tt is not None and not restricted:
+            tt.store(position.zobrist_hash, best.move, depth, EXACT, _score_to_tt(best.score, 0))
+        root_moves = [line.move for line in lines] + remaining
+        _report_counts(ctx)
+        if stats is not None:
+            iteration_nodes = ctx.nodes + ctx.qnodes - iteration_base
+            stats.per_depth.append(DepthStats(depth, iteration_nodes, time.perf_counter() - iteration_started))
+        yield IterationResult(
+            depth,
+            best.score,
+            best.move,
+            tuple(lines),
+            seldepth=ctx.seldepth,
+            nodes=ctx.nodes + ctx.qnodes - base_nodes,
+            elapsed=time.perf_counter() - started,
+            hashfull=tt.hashfull() if tt is not None else 0,
+        )
+
+
+def limited_search(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    limits: SearchLimits,
+    margins: PruningMargins = DEFAULT_MARGINS,
+    stats: SearchStats | None = None,
+    tt: TranspositionTable | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    held: Callable[[], bool] | None = None,
+    multipv: int = 1,
+    searchmoves: Collection[Move] | None = None,
+) -> Iterator[IterationResult]:
+    """Iterative deepening until `limits` are met or `should_stop` fires, yielding each completed iteration.
+
+    While `held` returns True (a UCI ponder search) only `should_stop` can end
+    the search. Depth, mate and movetime limits apply once it turns False, with
+    the movetime clock still counted from the call. Node budgets never apply to
+    a held search. Without `movetime` and `held`, the result depends only on the
+    position, the limits and the table's contents, never on the host's speed.
+    """
+    tracker = LimitTracker(limits)
+
+    def limit_reached() -> bool:
+        return not (held is not None and held()) and tracker.reached()
+
+    def stop() -> bool:
+        return (should_stop is not None and should_stop()) or limit_reached()
+
+    max_depth = MAX_DEPTH if held is not None else limits.max_depth
+    node_limit = None if held is not None or limits.infinite else limits.nodes
+    for result in iterative_deepening(
+        position,
+        position_evaluator,
+        max_depth,
+        margins,
+        stats,
+        tt,
+        stop,
+        node_limit=node_limit,
+        multipv=multipv,
+        searchmoves=searchmoves,
+    ):
+        yield result
+        tracker.record(result.depth, result.score)
+        if limit_reached():
+            return
+
+
+def best_move(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    margins: PruningMargins = DEFAULT_MARGINS,
+    stats: SearchStats | None = None,
+    tt: TranspositionTable | None = None,
+    should_stop: Callable[[], bool] | None = None,
+) -> Move | None:
+    """Return the best move found by an alpha-beta search to `depth`, or None in terminal positions.
+
+    Pass a `SearchStats` to collect node and prune counters for the search.
+    Without a `tt`, a small private table is allocated for this call. If
+    `should_stop` fires, the move from the deepest completed iteration is
+    returned.
+    """
+    if tt is None:
+        tt = TranspositionTable.allocate(DEFAULT_TT_MB)
+    results = list(iterative_deepening(position, position_evaluator, depth, margins, stats, tt, should_stop))
+    if results:
+        return results[-1].move
+    return fallback_move(position)
+
+
+def fallback_move(position: Position, searchmoves: Collection[Move] | None = None) -> Move | None:
+    """The move to play when a search is stopped before depth 1 finishes: any legal move beats forfeiting.
+
+    Picks the first by move ordering, among `searchmoves` if any of them is
+    legal. None in terminal positions.
+    """
+    legal_moves = generate_legal_moves(position)
+    allowed = [move for move in legal_moves if searchmoves is None or move in searchmoves] or legal_moves
+    return _order_moves(position, allowed)[0] if allowed else None
+
+
+def expected_reply(position: Position, move: Move, tt: TranspositionTable) -> Move | None:
+    """The opponent's predicted answer to `move`: the hash move stored for the resulting position.
+
+    Used as the UCI `ponder` move. Returns None if the table has no legal move there.
+    """
+    with move_applied(position, move):
+        entry = tt.probe(position.zobrist_hash)
+        if entry is None or entry.move is None:
+            return None
+        # Guard against a key collision handing back a move from another position.
+        return entry.move if is_legal_move(position, entry.move) else None
+
+
+def top_moves(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    count: int,
+    margins: PruningMargins = DEFAULT_MARGINS,
+    stats: SearchStats | None = None,
+    tt: TranspositionTable | None = None,
+) -> list[PVLine]:
+    """The best `count` moves after a MultiPV search to `depth`, best first. Empty in terminal positions.
+
+    Every line's score is exact, so the ranking is safe to compare across
+    lines. Without a `tt`, a small private table is allocated for this call.
+    """
+    if tt is None:
+        tt = TranspositionTable.allocate(DEFAULT_TT_MB)
+    results = list(iterative_deepening(position, position_evaluator, depth, margins, stats, tt, multipv=count))
+    return list(with_principal_variations(results[-1], position, tt).lines) if results else []
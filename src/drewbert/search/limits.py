@@ -0,0 +1,74 @@
+"""Search limits, mirroring the limits of UCI `go`: depth, nodes, movetime, mate-in-N and infinite.
+
+`SearchLimits` is the request; `LimitTracker` follows one search's completed
+iterations and says when a depth, mate or movetime limit has been met. Node
+budgets aren't tracked here: they need a check at every node, so the search
+itself enforces them.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from drewbert.search.minimax import CHECKMATE_SCORE
+
+# Depth cap for searches that run until told to stop (UCI `go infinite`), and for
+# searches limited only by nodes or time.
+MAX_DEPTH = 64
+
+
+@dataclass(frozen=True, slots=True)
+class SearchLimits:
+    """When a search should end. Unset fields don't limit; with none set the search runs to MAX_DEPTH.
+
+    `movetime` is in milliseconds, as in UCI. `mate` ends the search once it has
+    found a mate in at most that many moves. `infinite` overrides every other field.
+    """
+
+    depth: int | None = None
+    nodes: int | None = None
+    movetime: int | None = None
+    mate: int | None = None
+    infinite: bool = False
+
+    @property
+    def max_depth(self) -> int:
+        """Deepest iteration worth starting. Proving mate in N needs 2N - 1 plies."""
+        if self.infinite:
+            return MAX_DEPTH
+        caps = [self.depth] if self.depth is not None else []
+        if self.mate is not None:
+            caps.append(2 * self.mate - 1)
+        return max(min(caps, default=MAX_DEPTH), 1)
+
+    def is_mate_within(self, score: int) -> bool:
+        """Whether a root score (relative to the side to move) is a mate satisfying `mate`."""
+        return not self.infinite and self.mate is not None and score >= CHECKMATE_SCORE - (2 * self.mate - 1)
+
+
+@dataclass(slots=True)
+class LimitTracker:
+    """One search's progress against its depth, mate and movetime limits.
+
+    The movetime clock starts when the tracker is created. Feed it every
+    completed iteration through `record`.
+    """
+
+    limits: SearchLimits
+    deadline: float | None = field(init=False)
+    deepest: int = 0
+    mate_found: bool = False
+
+    def __post_init__(self) -> None:
+        movetime = None if self.limits.infinite else self.limits.movetime
+        self.deadline = None if movetime is None else time.monotonic() + movetime / 1000
+
+    def record(self, depth: int, score: int) -> None:
+        self.deepest = max(self.deepest, depth)
+        self.mate_found = self.mate_found or self.limits.is_mate_within(score)
+
+    def reached(self) -> bool:
+        return (
+            self.deepest >= self.limits.max_depth
+            or self.mate_found
+            or (self.deadline is not None and time.monotonic() >= self.deadline)
+        )
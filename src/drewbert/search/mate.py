@@ -0,0 +1,205 @@
+"""Mate solver: depth-first proof-number search (df-pn) for `go mate N` and puzzle solving.
+
+The attacker is the side to move at the root; a node is *proven* when the
+attacker forces mate from it within the remaining moves and *disproven* when
+the defender escapes (stalemate counts as an escape). Every node carries a
+proof number (the fewest leaves still to prove) and a disproof number, stored
+relative to the side to move as (phi, delta): at attacker nodes
+phi = proof and delta = disproof, at defender nodes the other way round. A
+node's phi is the smallest delta among its children and its delta the sum of
+its children's phi, so df-pn always descends into the most-proving child and
+only backs up once the child's numbers cross the thresholds it was given.
+
+Numbers live in a bounded table keyed by (Zobrist hash, attacker moves
+remaining); when it fills it is cleared, which costs re-expansion, never
+correctness. Attacker moves are ordered checks first, then captures, and
+start with proof numbers to match, so forcing lines get looked at before
+quiet ones without being excluded. Running the search with a bound of 1, 2,
+... moves makes the first proven bound the shortest mate.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from drewbert.core.helpers import move_applied
+from drewbert.core.move import Move
+from drewbert.core.movegen import generate_legal_moves, is_in_check
+from drewbert.core.position import Position
+
+PN_INFINITY = 1 << 30
+DEFAULT_MAX_NODES = 1_000_000
+DEFAULT_TABLE_ENTRIES = 1 << 20
+_STOP_CHECK_INTERVAL = 256  # nodes between `should_stop` polls
+
+# Initial proof number of an unexplored attacker move, by how forcing it is.
+_CHECK_PROOF = 1
+_CAPTURE_PROOF = 2
+_QUIET_PROOF = 3
+
+
+@dataclass(frozen=True, slots=True)
+class MateResult:
+    """A forced mate in `moves` moves for the side to move, along a best-defence line."""
+
+    moves: int
+    pv: tuple[Move, ...]
+    nodes: int
+
+
+class _SearchAborted(Exception):
+    """The node budget ran out or the caller asked the search to stop."""
+
+
+@dataclass(slots=True)
+class _Child:
+    move: Move
+    key: tuple[int, int]
+    initial: tuple[int, int]
+
+
+@dataclass(slots=True)
+class _Solver:
+    max_nodes: int
+    max_entries: int
+    should_stop: Callable[[], bool] | None
+    table: dict[tuple[int, int], tuple[int, int]] = field(default_factory=dict)
+    nodes: int = 0
+
+    def _store(self, key: tuple[int, int], numbers: tuple[int, int]) -> None:
+        if len(self.table) >= self.max_entries and key not in self.table:
+            self.table.clear()
+        self.table[key] = numbers
+
+    def _children(self, position: Position, remaining: int, attacker: bool) -> list[_Child]:
+        """Legal moves with their child keys, attacker moves ordered checks, captures, quiet."""
+        child_remaining = remaining - 1 if attacker else remaining
+        children = []
+        for move in generate_legal_moves(position):
+            capture = position.piece_at(move.to_square) is not None
+            with move_applied(position, move):
+                key = (position.zobrist_hash, child_remaining)
+                if not attacker:
+                    initial = (1, 1)
+                elif is_in_check(position, position.side_to_move):
+                    initial = (1, _CHECK_PROOF)
+                else:
+                    initial = (1, _CAPTURE_PROOF if capture else _QUIET_PROOF)
+            children.append(_Child(move, key, initial))
+        if attacker:
+            children.sort(key=lambda c: c.initial[1])
+        return children
+
+    def _mates_in_one(self, position: Position) -> bool:
+        """Whether the side to move has a mating move. Only checks can mate, so the rest are skipped cheaply."""
+        for move in generate_legal_moves(position):
+            with move_applied(position, move):
+                if is_in_check(position, position.side_to_move) and not generate_legal_moves(position):
+                    return True
+        return False
+
+    def expand(self, position: Position, remaining: int, attacker: bool, th_phi: int, th_delta: int) -> None:
+        """Search until this node's (phi, delta) reaches a threshold or is resolved; record it in the table."""
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise _SearchAborted
+        if self.should_stop is not None and self.nodes % _STOP_CHECK_INTERVAL == 0 and self.should_stop():
+            raise _SearchAborted
+
+        key = (position.zobrist_hash, remaining)
+        if not attacker and remaining == 0:
+            # The attacker's moves are spent: mate now or never.
+            mated = not generate_legal_moves(position) and is_in_check(position, position.side_to_move)
+            self._store(key, (PN_INFINITY, 0) if mated else (0, PN_INFINITY))
+            return
+        if attacker and remaining == 1:
+            self._store(key, (0, PN_INFINITY) if self._mates_in_one(position) else (PN_INFINITY, 0))
+            return
+        children = self._children(position, remaining, attacker)
+        if not children:
+            # Attacker out of moves: no mate. Defender out of moves: mated, unless stalemated.
+            mated = not attacker and is_in_check(position, position.side_to_move)
+            self._store(key, (PN_INFINITY, 0) if attacker or mated else (0, PN_INFINITY))
+            return
+
+        while True:
+            numbers = [self.table.get(child.key, child.initial) for child in children]
+            phi = min(delta for _, delta in numbers)
+            delta = min(sum(phi for phi, _ in numbers), PN_INFINITY)
+            if phi >= th_phi or delta >= th_delta:
+                self._store(key, (phi, delta))
+                return
+
+            best = second = PN_INFINITY
+            best_index = 0
+            for index, (_, child_delta) in enumerate(numbers):
+                if child_delta < best:
+                    best, second, best_index = child_delta, best, index
+                elif child_delta < second:
+                    second = child_delta
+            child_phi = numbers[best_index][0]
+            child_th_phi = min(th_delta + child_phi - delta, PN_INFINITY)
+            child_th_delta = min(th_phi, second + 1)
+            with move_applied(position, children[best_index].move):
+                self.expand(position, children[best_index].key[1], not attacker, child_th_phi, child_th_delta)
+
+    def proves(self, position: Position, remaining: int, attacker: bool) -> bool:
+        """Whether the attacker mates within `remaining` moves from here, searching to resolution."""
+        numbers = self.table.get((position.zobrist_hash, remaining))
+        if numbers is None or 0 not in numbers:
+            self.expand(position, remaining, attacker, PN_INFINITY, PN_INFINITY)
+            numbers = self.table[(position.zobrist_hash, remaining)]
+        phi, delta = numbers
+        return phi == 0 if attacker else delta == 0
+
+    def shortest(self, position: Position, limit: int, attacker: bool, floor: int) -> int | None:
+        """Fewest attacker moves (between `floor` and `limit`) in which a mate is proven from here."""
+        for remaining in range(floor, limit + 1):
+            if self.proves(position, remaining, attacker):
+                return remaining
+        return None
+
+    def line(self, position: Position, remaining: int) -> list[Move]:
+        """Mating line from an attacker node proven within `remaining`: fastest mate against the longest defence."""
+        best: tuple[int, Move] | None = None
+        for child in self._children(position, remaining, attacker=True):
+            with move_applied(position, child.move):
+                length = self.shortest(position, remaining - 1, attacker=False, floor=0)
+            if length is not None and (best is None or length < best[0]):
+                best = (length, child.move)
+        assert best is not None, "line() called on an unproven node"
+        length, move = best
+
+        with move_applied(position, move):
+            defence: tuple[int, Move] | None = None
+            for reply in generate_legal_moves(position):
+                with move_applied(position, reply):
+                    reply_length = self.shortest(position, length, attacker=True, floor=1)
+                assert reply_length is not None
+                if defence is None or reply_length > defence[0]:
+                    defence = (reply_length, reply)
+            if defence is None:
+                return [move]
+            with move_applied(position, defence[1]):
+                return [move, defence[1], *self.line(position, defence[0])]
+
+
+def solve_mate(
+    position: Position,
+    max_moves: int,
+    max_nodes: int = DEFAULT_MAX_NODES,
+    table_entries: int = DEFAULT_TABLE_ENTRIES,
+    should_stop: Callable[[], bool] | None = None,
+) -> MateResult | None:
+    """Shortest forced mate for the side to move in at most `max_moves` moves, with its line.
+
+    Returns None when there is no such mate, or when `max_nodes` expansions or
+    `should_stop` end the search before one is proven.
+    """
+    solver = _Solver(max_nodes, table_entries, should_stop)
+    try:
+        for moves in range(1, max_moves + 1):
+            if solver.proves(position, moves, attacker=True):
+                return MateResult(moves, tuple(solver.line(position, moves)), solver.nodes)
+    except _SearchAborted:
+        pass
+    return None
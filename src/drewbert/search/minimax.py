@@ -1,14 +1,16 @@
 from collections.abc import Callable
 from functools import partial
-from typing import Any
+from typing import Any, cast
 
 from drewbert.core.helpers import move_applied
 from drewbert.core.movegen import generate_legal_moves, is_in_check
 from drewbert.core.position import Color, Move, Position
-from drewbert.search.types import PositionEvalFn
+from drewbert.search.types import BatchEvalFn, PositionEvalFn, accepts_batch
 
 CHECKMATE_SCORE = 10000000
 STALEMATE_SCORE = 0
+DRAW_SCORE = 0  # repetition and fifty-move draws
+FIFTY_MOVE_PLIES = 100
 
 
 def _optimization_fn(position: Position) -> Callable[..., Any]:
@@ -26,36 +28,83 @@ def _score_cand_move(position: Position, move: Move, search_fn: PositionEvalFn)
     return val
 
 
+def _terminal_score(position: Position, legal_moves: list[Move], plies_from_root: int) -> int | None:
+    """Score of a checkmate, stalemate or fifty-move draw, whatever the remaining depth; None otherwise."""
+    if not legal_moves:
+        if not is_in_check(position, position.side_to_move):
+            return STALEMATE_SCORE
+        return (
+            -CHECKMATE_SCORE + plies_from_root
+            if position.side_to_move == Color.WHITE
+            else CHECKMATE_SCORE - plies_from_root
+        )
+    if position.halfmove_clock >= FIFTY_MOVE_PLIES:
+        return DRAW_SCORE
+    return None
+
+
+def _frontier_scores(
+    position: Position, legal_moves: list[Move], position_evaluator: BatchEvalFn, plies_from_root: int
+) -> list[int]:
+    """Depth-0 minimax scores of each move's child, the children that need the evaluator scored in one batch."""
+    scores: list[int] = []
+    pending: list[int] = []
+    batch = position_evaluator.batch()
+    child_plies = plies_from_root + 1
+    for move in legal_moves:
+        with move_applied(position, move):
+            if position.is_repetition(len(position.hash_history) - child_plies):
+                score = DRAW_SCORE
+            else:
+                score = _terminal_score(position, generate_legal_moves(position), child_plies)
+            if score is None:
+                pending.append(len(scores))
+                batch.add(position)
+            scores.append(0 if score is None else score)
+    for index, score in zip(pending, batch.scores(), strict=True):
+        scores[index] = score
+    return scores
+
+
+def _child_scores(
+    position: Position, legal_moves: list[Move], position_evaluator: PositionEvalFn, depth: int, plies_from_root: int
+) -> list[int]:
+    """Minimax scores of each move's child, searched to `depth - 1`.
+
+    At the frontier (`depth` 1), a `BatchEvalFn` scores all the children in one call.
+    """
+    if depth == 1 and accepts_batch(position_evaluator):
+        return _frontier_scores(position, legal_moves, cast(BatchEvalFn, position_evaluator), plies_from_root)
+    search_fn = partial(
+        minimax, position_evaluator=position_evaluator, depth=depth - 1, plies_from_root=plies_from_root + 1
+    )
+    return [_score_cand_move(position, move, search_fn) for move in legal_moves]
+
+
 def minimax(position: Position, position_evaluator: PositionEvalFn, depth: int, plies_from_root: int = 0) -> int:
     """recursively traverse move tree, assuming optimal play at each point by both sides relative to given
     evaluation function.
     Returns +- CHECKMATE_SCORE sentinel in case of checkmate. Returns STALEMATE_SCORE in case of stalemate
     In case of multiple checkmates in the search tree, uses minimal plies_from_root value to prioritize
-    faster checkmate.
+    faster checkmate. Repetitions and fifty-move draws score DRAW_SCORE. A `BatchEvalFn` evaluates the
+    children of each depth-1 node together.
     """
+    if plies_from_root > 0 and position.is_repetition(len(position.hash_history) - plies_from_root):
+        return DRAW_SCORE
 
     legal_moves = generate_legal_moves(position)
-    if not legal_moves:
-        # handle terminal cases
-        if not is_in_check(position, position.side_to_move):
-            return STALEMATE_SCORE
-        else:
-            return (
-                -CHECKMATE_SCORE + plies_from_root
-                if position.side_to_move == Color.WHITE
-                else CHECKMATE_SCORE - plies_from_root
-            )
+    # handle terminal cases
+    terminal = _terminal_score(position, legal_moves, plies_from_root)
+    if terminal is not None:
+        return terminal
 
     # base case - end of recursion
     if depth == 0:
         curr_eval = position_evaluator(position)
         return curr_eval
 
-    # recursive case - handle position state management and make the recursive call
-    search_fn = partial(
-        minimax, position_evaluator=position_evaluator, depth=depth - 1, plies_from_root=plies_from_root + 1
-    )
-    return _optimization_fn(position)(_score_cand_move(position, move, search_fn) for move in legal_moves)
+    # recursive case - handle position state management and make the recursive calls
+    return _optimization_fn(position)(_child_scores(position, legal_moves, position_evaluator, depth, plies_from_root))
 
 
 def best_move(position: Position, position_evaluator: PositionEvalFn, depth: int) -> Move | None:
@@ -67,5 +116,5 @@ def best_move(position: Position, position_evaluator: PositionEvalFn, depth: int
     if not legal_moves:
         return None
 
-    search_fn = partial(minimax, position_evaluator=position_evaluator, depth=depth - 1, plies_from_root=1)
-    return _optimization_fn(position)(legal_moves, key=lambda m: _score_cand_move(position, m, search_fn))
+    scores = _child_scores(position, legal_moves, position_evaluator, depth, 0)
+    return legal_moves[_optimization_fn(position)(range(len(legal_moves)), key=scores.__getitem__)]
@@ -0,0 +1,162 @@
+"""Root-splitting parallel search for reproducible fixed-depth analysis.
+
+Each legal root move (in `generate_legal_moves` order) becomes one task on a
+`ProcessPoolExecutor`; a task is a FEN and hash history plus the move to score. Workers share a
+single 64-bit word in shared memory holding the best exact root score found so
+far, packed together with the index of the move that produced it. A task reads
+it before searching and uses it as its alpha bound, so later tasks cut off
+against earlier results.
+
+Reproducibility: the answer is the same for any worker count and any
+scheduling. Two things make that hold:
+  - Tasks run plain alpha-beta — no forward pruning and no transposition
+    table — so a search with lower bound `a` returns the exact score whenever
+    the true score beats `a`, whatever `a` happened to be. Only node counts
+    depend on timing.
+  - Ties go to the earlier root move. A task whose bound came from a *later*
+    move searches with the bound lowered by one, so an equal score still comes
+    back exact and wins the tie.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from drewbert.adapters.fen import to_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.move import Move
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.core.position import Position
+from drewbert.search.alphabeta import INFINITY, NO_PRUNING, IterationResult, search_window
+from drewbert.search.smp import worker_position
+from drewbert.search.types import PositionEvalFn
+
+_SCORE_OFFSET = 1 << 31
+_INDEX_BITS = 16
+_INDEX_MASK = (1 << _INDEX_BITS) - 1
+
+
+class _SharedBound:
+    """Best (score, root move index) so far, packed into one unsigned 64-bit word.
+
+    Packing makes "better" a plain integer comparison: higher score first, then
+    lower index. Updates are a lock-free read-compare-write; a lost race only
+    leaves a weaker bound in place, which costs pruning, never correctness.
+    A zero word means no exact score yet.
+    """
+
+    def __init__(self, buffer: bytearray | memoryview) -> None:
+        self._word = memoryview(buffer).cast("B")[:8].cast("Q")
+
+    @staticmethod
+    def _pack(score: int, index: int) -> int:
+        return (score + _SCORE_OFFSET) << _INDEX_BITS | (_INDEX_MASK - index)
+
+    def read(self) -> tuple[int, int] | None:
+        packed = self._word[0]
+        if packed == 0:
+            return None
+        return (packed >> _INDEX_BITS) - _SCORE_OFFSET, _INDEX_MASK - (packed & _INDEX_MASK)
+
+    def offer(self, score: int, index: int) -> None:
+        packed = self._pack(score, index)
+        if packed > self._word[0]:
+            self._word[0] = packed
+
+    def release(self) -> None:
+        self._word.release()
+
+
+def _score_root_move(
+    fen: str,
+    history: list[int],
+    move: Move,
+    index: int,
+    depth: int,
+    position_evaluator: PositionEvalFn,
+    bound: _SharedBound,
+) -> tuple[int, int, bool]:
+    """Search one root move. Returns (index, score, exact); inexact scores are upper bounds."""
+    current = bound.read()
+    if current is None:
+        lower = -INFINITY
+    else:
+        best_score, best_index = current
+        lower = best_score if best_index < index else best_score - 1
+
+    position = worker_position(fen, history)
+    with move_applied(position, move):
+        score = -search_window(position, position_evaluator, depth - 1, -INFINITY, -lower, ply=1, margins=NO_PRUNING)
+
+    exact = score > lower
+    if exact:
+        bound.offer(score, index)
+    return index, score, exact
+
+
+# Per-worker-process state, set once by the pool initializer.
+_worker_shm: SharedMemory | None = None
+_worker_bound: _SharedBound | None = None
+
+
+def _init_worker(shm_name: str) -> None:
+    global _worker_shm, _worker_bound
+    _worker_shm = SharedMemory(name=shm_name)
+    assert _worker_shm.buf is not None
+    _worker_bound = _SharedBound(_worker_shm.buf)
+
+
+def _pool_task(
+    fen: str, history: list[int], move: Move, index: int, depth: int, position_evaluator: PositionEvalFn
+) -> tuple[int, int, bool]:
+    assert _worker_bound is not None, "pool worker used before _init_worker"
+    return _score_root_move(fen, history, move, index, depth, position_evaluator, _worker_bound)
+
+
+def root_split_search(
+    position: Position, position_evaluator: PositionEvalFn, depth: int, workers: int = 1
+) -> IterationResult | None:
+    """Score every root move to `depth`, spread over `workers` processes; return the best.
+
+    One worker runs in-process with no pool. Returns None in terminal positions.
+    """
+    root_moves = generate_legal_moves(position)
+    if not root_moves:
+        return None
+    if len(root_moves) > _INDEX_MASK:
+        raise ValueError(f"too many root moves to index: {len(root_moves)}")
+
+    fen, history = to_fen(position), position.hash_history
+    if workers <= 1:
+        bound = _SharedBound(bytearray(8))
+        outcomes = [
+            _score_root_move(fen, history, m, i, depth, position_evaluator, bound) for i, m in enumerate(root_moves)
+        ]
+        bound.release()
+    else:
+        shm = SharedMemory(create=True, size=8)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(shm.name,),
+            ) as pool:
+                futures = [
+                    pool.submit(_pool_task, fen, history, m, i, depth, position_evaluator)
+                    for i, m in enumerate(root_moves)
+                ]
+                outcomes = [f.result() for f in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+    index, score, _ = max((o for o in outcomes if o[2]), key=lambda o: (o[1], -o[0]))
+    return IterationResult(depth, score, root_moves[index])
+
+
+def root_split_best_move(
+    position: Position, position_evaluator: PositionEvalFn, depth: int, workers: int = 1
+) -> Move | None:
+    result = root_split_search(position, position_evaluator, depth, workers)
+    return result.move if result is not None else None
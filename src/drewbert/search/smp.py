@@ -0,0 +1,182 @@
+"""Lazy SMP: parallel search across processes sharing one transposition table.
+
+The GIL rules out thread-level parallelism, so each helper is a separate
+process. Every worker runs the ordinary iterative-deepening alpha-beta search
+on the same root; the only thing they share is the transposition table, which
+lives in a `multiprocessing.shared_memory` block. Workers cooperate purely by
+reading each other's TT entries — there is no work splitting and no locking
+(see `drewbert.search.tt` for how torn writes are tolerated).
+
+To keep workers from walking the tree in lockstep, each helper rotates the
+root move order by its worker id. They all search to the requested depth:
+helpers are stopped as soon as worker 0 finishes, so one sent a ply deeper
+would rarely complete that extra iteration.
+
+The calling process runs worker 0 itself. When it finishes its target depth
+it signals the helpers to stop, and the deepest completed iteration from any
+worker wins (worker 0 on ties). A helper that dies without reporting back
+(say, killed by the OS) counts as finished once its process has exited, so
+it can't hang the search.
+"""
+
+import multiprocessing as mp
+import queue
+from collections.abc import Callable
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event
+
+from drewbert.adapters.fen import parse_fen, to_fen
+from drewbert.core.move import Move
+from drewbert.core.position import Position
+from drewbert.search.alphabeta import (
+    DEFAULT_TT_MB,
+    IterationResult,
+    best_move,
+    fallback_move,
+    iterative_deepening,
+    with_principal_variations,
+)
+from drewbert.search.stats import SearchStats
+from drewbert.search.tt import ENTRY_BYTES, TranspositionTable, entries_for_size
+from drewbert.search.types import PositionEvalFn
+
+# Spawn rather than fork: workers start from a clean interpreter on every platform.
+_MP_CONTEXT = mp.get_context("spawn")
+# How long the main process waits on the results queue before checking whether the helpers are still alive.
+HELPER_POLL_SECONDS = 0.1
+
+
+def worker_position(fen: str, history: list[int]) -> Position:
+    """Rebuild a position in a worker process from its FEN and hash history.
+
+    FEN carries no history, and repetition detection needs it.
+    """
+    position = parse_fen(fen)
+    position.hash_history.extend(history)
+    return position
+
+
+def _helper(
+    fen: str,
+    history: list[int],
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    worker_id: int,
+    shm_name: str,
+    stop: Event,
+    results: "mp.Queue[tuple[int, IterationResult] | None]",
+) -> None:
+    """Helper process body: search until done or told to stop, reporting each completed iteration."""
+    shm: SharedMemory | None = None
+    tt: TranspositionTable | None = None
+    try:
+        shm = SharedMemory(name=shm_name)
+        tt = TranspositionTable.from_shared_memory(shm)
+        position = worker_position(fen, history)
+        for result in iterative_deepening(
+            position,
+            position_evaluator,
+            depth,
+            tt=tt,
+            should_stop=stop.is_set,
+            root_rotation=worker_id,
+        ):
+            results.put((worker_id, result))
+    finally:
+        if tt is not None:
+            tt.release()
+        if shm is not None:
+            shm.close()
+        results.put(None)  # sentinel: this helper is done
+
+
+def lazy_smp_search(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    threads: int,
+    hash_mb: int = DEFAULT_TT_MB,
+    should_stop: Callable[[], bool] | None = None,
+    on_iteration: Callable[[IterationResult], None] | None = None,
+    stats: SearchStats | None = None,
+) -> IterationResult | None:
+    """Search `position` to `depth` with `threads` workers; return the deepest completed iteration.
+
+    `should_stop` interrupts the main search; helpers are stopped as soon as it
+    returns. `on_iteration` is called with each iteration the main search
+    completes, its PVs filled in from the shared table. `stats` collects the main search's counters (helpers keep
+    their own). Returns None in terminal positions, or if stopped before any
+    worker completed an iteration.
+    """
+    shm = SharedMemory(create=True, size=entries_for_size(hash_mb) * ENTRY_BYTES)
+    tt = TranspositionTable.from_shared_memory(shm)
+    stop = _MP_CONTEXT.Event()
+    results: mp.Queue[tuple[int, IterationResult] | None] = _MP_CONTEXT.Queue()
+    fen = to_fen(position)
+    helpers = [
+        _MP_CONTEXT.Process(
+            target=_helper,
+            args=(fen, position.hash_history, position_evaluator, depth, worker_id, shm.name, stop, results),
+            daemon=True,
+        )
+        for worker_id in range(1, threads)
+    ]
+    try:
+        for helper in helpers:
+            helper.start()
+
+        completed: list[tuple[int, IterationResult]] = []
+        for result in iterative_deepening(
+            position, position_evaluator, depth, stats=stats, tt=tt, should_stop=should_stop
+        ):
+            completed.append((0, result))
+            if on_iteration is not None:
+                on_iteration(with_principal_variations(result, position, tt))
+
+        stop.set()
+        finished = 0
+        while finished < len(helpers):
+            try:
+                item = results.get(timeout=HELPER_POLL_SECONDS)
+            except queue.Empty:
+                # An exited helper's results are already in the queue, so once every helper has exited
+                # and the queue is empty, any sentinel still missing belongs to one that died.
+                if all(helper.exitcode is not None for helper in helpers):
+                    break
+                continue
+            if item is None:
+                finished += 1
+            else:
+                completed.append(item)
+        for helper in helpers:
+            helper.join()
+    finally:
+        stop.set()
+        tt.release()
+        shm.close()
+        shm.unlink()
+
+    if not completed:
+        return None
+    # Deepest iteration wins; among equals, the lowest worker id (the main search).
+    _, best = max(completed, key=lambda item: (item[1].depth, -item[0]))
+    return best
+
+
+def lazy_smp_best_move(
+    position: Position,
+    position_evaluator: PositionEvalFn,
+    depth: int,
+    threads: int = 1,
+    hash_mb: int = DEFAULT_TT_MB,
+    should_stop: Callable[[], bool] | None = None,
+) -> Move | None:
+    """`alphabeta.best_move` with `threads` worker processes. One thread searches in-process, no pool."""
+    if threads <= 1:
+        return best_move(
+            position, position_evaluator, depth, tt=TranspositionTable.allocate(hash_mb), should_stop=should_stop
+        )
+    result = lazy_smp_search(position, position_evaluator, depth, threads, hash_mb, should_stop)
+    if result is not None:
+        return result.move
+    return fallback_move(position)
@@ -0,0 +1,68 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class DepthStats:
+    """One completed iterative-deepening iteration: its own nodes (quiescence included) and wall time."""
+
+    depth: int
+    nodes: int
+    seconds: float
+
+
+@dataclass(slots=True)
+class SearchStats:
+    """Counters collected over one search.
+
+    Passed into a search by the caller and mutated in place, so the caller
+    keeps a handle on the numbers after the search returns. The per-node
+    counters are bare integer increments, noise next to move generation, and
+    `per_depth` gains one entry per completed iteration. A search run without
+    an instance skips them behind a `None` check; it still counts nodes for
+    its own limits and `info`. Those counts are copied here at the end of
+    each iteration and search, so they lag while an iteration runs.
+
+    TT counters cover the main search only: `tt_hits` are probes that found
+    the position, `tt_cutoffs` hits whose bound settled the node outright.
+    `beta_cutoffs` are fail-highs in the main search's move loop, and
+    `first_move_cutoffs` the subset caused by the first move searched there,
+    a direct measure of move ordering. `iid_searches` counts internal
+    iterative deepening searches run for nodes without a hash move.
+    """
+
+    nodes: int = 0
+    qnodes: int = 0
+    seldepth: int = 0  # deepest ply reached, quiescence included
+    tt_probes: int = 0
+    tt_hits: int = 0
+    tt_cutoffs: int = 0
+    beta_cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    futility_prunes: int = 0
+    reverse_futility_prunes: int = 0
+    razor_prunes: int = 0
+    iid_searches: int = 0
+    per_depth: list[DepthStats] = field(default_factory=list)
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0
+
+    @property
+    def effective_branching_factor(self) -> float | None:
+        """Node growth from the second-deepest to the deepest completed iteration."""
+        if len(self.per_depth) < 2 or self.per_depth[-2].nodes == 0:
+            return None
+        return self.per_depth[-1].nodes / self.per_depth[-2].nodes
+
+    def to_dict(self) -> dict[str, Any]:
+        """All counters plus the derived rates, as plain JSON-ready values."""
+        return asdict(self) | {
+            "first_move_cutoff_rate": self.first_move_cutoff_rate,
+            "effective_branching_factor": self.effective_branching_factor,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
@@ -0,0 +1,141 @@
+"""Transposition table.
+
+A fixed-size, direct-mapped hash table of search results keyed by Zobrist
+hash. Each entry is two unsigned 64-bit words in a flat buffer:
+
+    word 0: key ^ data
+    word 1: data  (score | depth | bound | move, bit-packed)
+
+Storing the key XORed with the data (Hyatt's lockless hashing) lets several
+processes share one table without locks: a torn write — one word from one
+writer, one from another — fails the `word0 ^ word1 == key` check on probe and
+reads as a miss instead of as a corrupt entry.
+
+The buffer can be a private `bytearray` or the `buf` of a
+`multiprocessing.shared_memory.SharedMemory` block; the table code is the
+same either way.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+from typing import NamedTuple
+
+from drewbert.core.move import Move
+from drewbert.core.types import PieceType
+
+# Bound types. 0 is reserved so that an all-zero (never written) slot never parses as an entry.
+EXACT = 1
+LOWER = 2  # fail-high: true score >= stored score
+UPPER = 3  # fail-low: true score <= stored score
+
+ENTRY_BYTES = 16
+_HASHFULL_SAMPLE = 1000
+
+_SCORE_OFFSET = 1 << 31
+_SCORE_MASK = (1 << 32) - 1
+_DEPTH_SHIFT = 32
+_BOUND_SHIFT = 40
+_MOVE_SHIFT = 42
+
+
+class TTEntry(NamedTuple):
+    move: Move | None
+    depth: int
+    bound: int
+    score: int
+
+
+def _encode_move(move: Move | None) -> int:
+    """Pack a move into 15 bits: from (6) | to (6) | promotion (3). 0 encodes "no move" (a1a1 is never legal)."""
+    if move is None:
+        return 0
+    promotion = 0 if move.promotion is None else int(move.promotion)
+    return move.from_square | move.to_square << 6 | promotion << 12
+
+
+def _decode_move(bits: int) -> Move | None:
+    if bits == 0:
+        return None
+    promotion = bits >> 12
+    return Move(bits & 63, bits >> 6 & 63, PieceType(promotion) if promotion else None)
+
+
+def entries_for_size(size_mb: int) -> int:
+    """Largest power-of-two entry count that fits in `size_mb` megabytes (at least one)."""
+    entries = max(1, size_mb * 2**20 // ENTRY_BYTES)
+    return 1 << (entries.bit_length() - 1)
+
+
+class TranspositionTable:
+    """Direct-mapped transposition table over a caller-supplied buffer.
+
+    The buffer length must be a power-of-two multiple of `ENTRY_BYTES`; use
+    `entries_for_size` to pick one. Replacement is depth-preferred within a
+    slot: a shallower result for the same position doesn't overwrite a deeper
+    one, but a different position always replaces.
+    """
+
+    def __init__(self, buffer: bytearray | memoryview) -> None:
+        self._bytes = memoryview(buffer).cast("B")
+        self._slots = self._bytes.cast("Q")
+        entries = len(self._slots) // 2
+        if entries == 0 or entries & (entries - 1):
+            raise ValueError(f"transposition table needs a power-of-two entry count, got {entries}")
+        self._mask = entries - 1
+
+    @classmethod
+    def allocate(cls, size_mb: int) -> "TranspositionTable":
+        """A private (single-process) table of roughly `size_mb` megabytes."""
+        return cls(bytearray(entries_for_size(size_mb) * ENTRY_BYTES))
+
+    @classmethod
+    def from_shared_memory(cls, shm: SharedMemory) -> "TranspositionTable":
+        """A table over a shared-memory block, visible to every process that attaches to it."""
+        if shm.buf is None:
+            raise ValueError(f"shared memory block {shm.name} is closed")
+        return cls(shm.buf)
+
+    @property
+    def entries(self) -> int:
+        return self._mask + 1
+
+    def hashfull(self) -> int:
+        """Occupancy in permille, as UCI `hashfull` reports it, sampled from the first 1000 slots."""
+        sample = min(self.entries, _HASHFULL_SAMPLE)
+        data_words = self._slots[1 : 2 * sample : 2]
+        return sum(1 for data in data_words if data) * 1000 // sample
+
+    def probe(self, key: int) -> TTEntry | None:
+        slots = self._slots
+        index = (key & self._mask) << 1
+        data = slots[index + 1]
+        if slots[index] ^ data != key or data == 0:
+            return None
+        return TTEntry(
+            _decode_move(data >> _MOVE_SHIFT),
+            data >> _DEPTH_SHIFT & 0xFF,
+            data >> _BOUND_SHIFT & 0b11,
+            (data & _SCORE_MASK) - _SCORE_OFFSET,
+        )
+
+    def store(self, key: int, move: Move | None, depth: int, bound: int, score: int) -> None:
+        slots = self._slots
+        index = (key & self._mask) << 1
+        old_data = slots[index + 1]
+        if slots[index] ^ old_data == key and old_data >> _DEPTH_SHIFT & 0xFF > depth:
+            return
+        data = (
+            (score + _SCORE_OFFSET)
+            | min(depth, 0xFF) << _DEPTH_SHIFT
+            | bound << _BOUND_SHIFT
+            | _encode_move(move) << _MOVE_SHIFT
+        )
+        slots[index] = key ^ data
+        slots[index + 1] = data
+
+    def clear(self) -> None:
+        self._bytes[:] = bytes(len(self._bytes))
+
+    def release(self) -> None:
+        """Drop the view onto the buffer. Required before closing a shared-memory block."""
+        self._slots.release()
+        self._bytes.release()
@@ -1,6 +1,59 @@
 from collections.abc import Callable
+from typing import Protocol
 
 from drewbert.core.position import Position
 
 type PositionEvalFn = Callable[[Position], int]
 type SearchFn = Callable[[Position, int], int]
+
+# A bound no score reaches: the default window asks a windowed evaluator for an exact score.
+UNBOUNDED = 1 << 62
+
+
+class WindowedEvalFn(Protocol):
+    """A `PositionEvalFn` that can also take the search window, positive for white like its score.
+
+    Given `alpha` and `beta` it may stop as soon as its score is sure to fall
+    outside them and return a partial score that is also outside them. Called
+    with the position alone it returns the exact score, so it works wherever a
+    `PositionEvalFn` does. `accepts_window` tells the search to pass the window;
+    wrappers that forward it set it from the evaluator they wrap.
+    """
+
+    accepts_window: bool
+
+    def __call__(self, position: Position, alpha: int = -UNBOUNDED, beta: int = UNBOUNDED) -> int: ...
+
+
+def accepts_window(evaluator: PositionEvalFn) -> bool:
+    """Whether `evaluator` is a `WindowedEvalFn` that wants the search window."""
+    return getattr(evaluator, "accepts_window", False)
+
+
+class EvalBatch(Protocol):
+    """Positions collected for one `BatchEvalFn` call: `add` each, then `scores` returns theirs in order."""
+
+    def add(self, position: Position) -> None: ...
+
+    def scores(self) -> list[int]: ...
+
+
+class BatchEvalFn(Protocol):
+    """A `PositionEvalFn` that can also score many positions in one call, positive for white.
+
+    `batch` starts an `EvalBatch`; its scores are exactly what calling the
+    evaluator on each position would return. `accepts_batch` tells the search
+    to collect a node's children into one batch instead of evaluating them
+    one by one.
+    """
+
+    accepts_batch: bool
+
+    def __call__(self, position: Position) -> int: ...
+
+    def batch(self) -> EvalBatch: ...
+
+
+def accepts_batch(evaluator: PositionEvalFn) -> bool:
+    """Whether `evaluator` is a `BatchEvalFn` that wants positions in batches."""
+    return getattr(evaluator, "accepts_batch", False)
@@ -11,7 +11,10 @@ sit alongside the FEN oracle tests that use the same pattern.
 """
 
 import contextlib
+import json
+import subprocess
 import sys
+import time
 from collections.abc import Iterator
 
 import chess
@@ -31,6 +34,9 @@ ENGINE_CMD: list[str] = [
     "--depth",
     "2",  # shallow enough to keep test wall-clock low
 ]
+# The interruptible search: same flags with `--search alphabeta`.
+ALPHABETA_CMD: list[str] = [*ENGINE_CMD[:6], "alphabeta", *ENGINE_CMD[7:]]
+ITALIAN_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
 
 
 @pytest.fixture
@@ -131,3 +137,224 @@ def test_consecutive_searches_from_different_positions(engine: chess.engine.Simp
         result = engine.play(board, chess.engine.Limit(depth=2))
         assert result.move is not None
         assert result.move in board.legal_moves
+
+
+def test_threads_option_runs_lazy_smp() -> None:
+    """The alpha-beta engine advertises `Threads`; with it raised, searches still return legal moves."""
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        assert "Threads" in eng.options
+        eng.configure({"Threads": 2})
+        board = chess.Board(ITALIAN_FEN)
+        result = eng.play(board, chess.engine.Limit(depth=2))
+        assert result.move is not None
+        assert result.move in board.legal_moves
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def test_go_infinite_stops_on_request() -> None:
+    """`go infinite` keeps searching until `stop`, then answers promptly with a legal move."""
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        board = chess.Board(ITALIAN_FEN)
+        with eng.analysis(board) as analysis:
+            time.sleep(0.5)
+            started = time.perf_counter()
+            analysis.stop()
+            best = analysis.wait()
+        assert time.perf_counter() - started < 2.0
+        assert best.move is not None
+        assert best.move in board.legal_moves
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def _send(proc: subprocess.Popen[str], *lines: str) -> None:
+    assert proc.stdin is not None
+    proc.stdin.write("".join(f"{line}\n" for line in lines))
+    proc.stdin.flush()
+
+
+def _read_until(proc: subprocess.Popen[str], prefix: str) -> list[str]:
+    """Read engine output up to and including the first line starting with `prefix`."""
+    assert proc.stdout is not None
+    lines: list[str] = []
+    while not lines or not lines[-1].startswith(prefix):
+        line = proc.stdout.readline()
+        assert line, f"engine exited before {prefix!r}"
+        lines.append(line.strip())
+    return lines
+
+
+def _spawn_alphabeta() -> subprocess.Popen[str]:
+    return subprocess.Popen(ALPHABETA_CMD, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+
+def _quit(proc: subprocess.Popen[str]) -> None:
+    _send(proc, "quit")
+    assert proc.wait(timeout=10) == 0
+
+
+def test_isready_answered_during_search() -> None:
+    """The stdin loop stays live while a search runs: readyok arrives before bestmove."""
+    proc = _spawn_alphabeta()
+    try:
+        _send(proc, "uci", f"position fen {ITALIAN_FEN}", "go infinite", "isready")
+        assert not any(line.startswith("bestmove") for line in _read_until(proc, "readyok"))
+
+        _send(proc, "stop")
+        line = _read_until(proc, "bestmove")[-1]
+        assert chess.Move.from_uci(line.split()[1]) in chess.Board(ITALIAN_FEN).legal_moves
+        _quit(proc)
+    finally:
+        proc.kill()
+
+
+def test_bestmove_suggests_legal_ponder_move() -> None:
+    proc = _spawn_alphabeta()
+    try:
+        _send(proc, "uci", f"position fen {ITALIAN_FEN}", "go")
+        tokens = _read_until(proc, "bestmove")[-1].split()
+        assert tokens[2] == "ponder"
+        board = chess.Board(ITALIAN_FEN)
+        board.push_uci(tokens[1])
+        assert chess.Move.from_uci(tokens[3]) in board.legal_moves
+        _quit(proc)
+    finally:
+        proc.kill()
+
+
+def test_ponderhit_turns_ponder_search_into_normal_search() -> None:
+    """No bestmove while pondering, however long; after ponderhit the same search finishes on its own."""
+    proc = _spawn_alphabeta()
+    try:
+        _send(proc, "uci", f"position fen {ITALIAN_FEN}", "go ponder")
+        time.sleep(1.0)  # well past the fixed depth; a non-pondering search would have answered
+        _send(proc, "isready")
+        assert not any(line.startswith("bestmove") for line in _read_until(proc, "readyok"))
+
+        _send(proc, "ponderhit")
+        line = _read_until(proc, "bestmove")[-1]
+        assert chess.Move.from_uci(line.split()[1]) in chess.Board(ITALIAN_FEN).legal_moves
+        _quit(proc)
+    finally:
+        proc.kill()
+
+
+def test_stop_during_ponder_still_answers() -> None:
+    """On a ponder miss the GUI sends stop; the engine must still reply with a bestmove."""
+    proc = _spawn_alphabeta()
+    try:
+        _send(proc, "uci", f"position fen {ITALIAN_FEN}", "go ponder")
+        time.sleep(0.2)
+        _send(proc, "stop")
+        _read_until(proc, "bestmove")
+        _send(proc, "position startpos", "go")
+        line = _read_until(proc, "bestmove")[-1]
+        assert chess.Move.from_uci(line.split()[1]) in chess.Board().legal_moves
+        _quit(proc)
+    finally:
+        proc.kill()
+
+
+def test_go_nodes_is_reproducible() -> None:
+    """Two fresh engines given the same node budget play the same move, whatever the host load."""
+    moves = []
+    for _ in range(2):
+        eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+        try:
+            result = eng.play(chess.Board(ITALIAN_FEN), chess.engine.Limit(nodes=2000))
+            moves.append(result.move)
+        finally:
+            with contextlib.suppress(chess.engine.EngineTerminatedError):
+                eng.quit()
+    assert moves[0] is not None
+    assert moves[0] == moves[1]
+
+
+def test_multipv_reports_ranked_lines() -> None:
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        board = chess.Board(ITALIAN_FEN)
+        infos = eng.analyse(board, chess.engine.Limit(depth=2), multipv=3)
+        assert [info.get("multipv") for info in infos] == [1, 2, 3]
+        moves = [info["pv"][0] for info in infos if "pv" in info]
+        assert len(set(moves)) == 3
+        assert all(move in board.legal_moves for move in moves)
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def test_search_reports_info() -> None:
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        board = chess.Board(ITALIAN_FEN)
+        info = eng.analyse(board, chess.engine.Limit(depth=3))
+        assert info.get("depth") == 3
+        assert info.get("nodes", 0) > 0
+        assert "score" in info and "seldepth" in info and "hashfull" in info
+        pv = info.get("pv", [])
+        assert pv and pv[0] in board.legal_moves
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def test_debug_mode_reports_search_stats() -> None:
+    proc = _spawn_alphabeta()
+    try:
+        _send(proc, "uci", "debug on", f"position fen {ITALIAN_FEN}", "go depth 2")
+        lines = _read_until(proc, "bestmove")
+        stats_lines = [line for line in lines if line.startswith("info string stats ")]
+        assert len(stats_lines) == 1
+        stats = json.loads(stats_lines[0].removeprefix("info string stats "))
+        assert stats["nodes"] > 0
+        assert [d["depth"] for d in stats["per_depth"]] == [1, 2]
+        _quit(proc)
+    finally:
+        proc.kill()
+
+
+def test_go_mate_reports_proven_mate() -> None:
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        board = chess.Board("6k1/6P1/5K2/8/8/8/8/3R4 w - - 0 1")
+        info = eng.analyse(board, chess.engine.Limit(mate=2))
+        score = info.get("score")
+        assert score is not None and score.relative == chess.engine.Mate(2)
+        assert info.get("pv") == [chess.Move.from_uci(uci) for uci in ("d1d8", "g8h7", "d8h8")]
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def test_searchmoves_restricts_bestmove() -> None:
+    eng = chess.engine.SimpleEngine.popen_uci(ALPHABETA_CMD)
+    try:
+        board = chess.Board(ITALIAN_FEN)
+        candidates = [chess.Move.from_uci("a2a3"), chess.Move.from_uci("h2h3")]
+        result = eng.play(board, chess.engine.Limit(depth=2), root_moves=candidates)
+        assert result.move in candidates
+    finally:
+        with contextlib.suppress(chess.engine.EngineTerminatedError):
+            eng.quit()
+
+
+def test_cached_eval_reports_hit_rate_in_debug_mode() -> None:
+    cmd = [*ALPHABETA_CMD[:4], "materialistic-cached", *ALPHABETA_CMD[5:]]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        _send(proc, "uci", "debug on", "ucinewgame", f"position fen {ITALIAN_FEN}", "go depth 2")
+        lines = _read_until(proc, "bestmove")
+        cache_lines = [line.split() for line in lines if line.startswith("info string evalcache ")]
+        assert len(cache_lines) == 1
+        fields = dict(zip(cache_lines[0][3::2], cache_lines[0][4::2], strict=True))
+        assert int(fields["probes"]) > 0
+        assert 0 <= float(fields["hitrate"]) <= 1
+        _quit(proc)
+    finally:
+        proc.kill()
@@ -6,9 +6,19 @@ expected field values. Edge cases (malformed input, unknown commands) should
 route to UciUnrecognized per Postel's-law handling.
 """
 
+import threading
+import time
+
 import pytest
 
+from drewbert.adapters.fen import STARTING_FEN, parse_fen
 from drewbert.adapters.uci import (
+    EVALS,
+    INFO_INTERVAL,
+    EngineOptions,
+    InfoThrottle,
+    SearchSignals,
+    UciDebug,
     UciGo,
     UciIsReady,
     UciNewGame,
@@ -19,8 +29,25 @@ from drewbert.adapters.uci import (
     UciStop,
     UciUci,
     UciUnrecognized,
+    apply_uci_new_game_cmd,
+    apply_uci_position_cmd,
+    configure_search,
+    format_info,
+    limits_from_go,
     parse,
+    uci_score,
 )
+from drewbert.core.move import Move
+from drewbert.core.position import Position
+from drewbert.eval.cache import EvalCache
+from drewbert.eval.endgame import MaterialTableEval
+from drewbert.eval.lazy import LazyEval
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.search.alphabeta import DEFAULT_TT_MB, IterationResult, PVLine, limited_search
+from drewbert.search.limits import SearchLimits
+from drewbert.search.minimax import CHECKMATE_SCORE
+from drewbert.search.tt import TranspositionTable
 
 # --- Parameterless commands ---
 
@@ -197,3 +224,223 @@ def test_empty_input_returns_unrecognized() -> None:
     # no UCI command name.
     cmd = parse("")
     assert isinstance(cmd, UciUnrecognized)
+
+
+# --- Search limits ---
+
+
+def test_bare_go_uses_default_depth() -> None:
+    go = parse("go")
+    assert isinstance(go, UciGo)
+    assert limits_from_go(go, 3) == SearchLimits(depth=3)
+
+
+def test_clock_only_go_uses_default_depth() -> None:
+    go = parse("go wtime 1000 btime 1000")
+    assert isinstance(go, UciGo)
+    assert limits_from_go(go, 3) == SearchLimits(depth=3)
+
+
+def test_go_limits_replace_default_depth() -> None:
+    go = parse("go nodes 5000 mate 2 movetime 300")
+    assert isinstance(go, UciGo)
+    assert limits_from_go(go, 3) == SearchLimits(nodes=5000, movetime=300, mate=2)
+
+
+# --- Score formatting ---
+
+
+@pytest.mark.parametrize(
+    "score,expected",
+    [
+        (35, "cp 35"),
+        (-120, "cp -120"),
+        (CHECKMATE_SCORE - 1, "mate 1"),
+        (CHECKMATE_SCORE - 3, "mate 2"),
+        (-(CHECKMATE_SCORE - 2), "mate -1"),
+    ],
+)
+def test_uci_score(score: int, expected: str) -> None:
+    assert uci_score(score) == expected
+
+
+def test_format_info_single_line() -> None:
+    e2e4, e7e5 = Move(12, 28), Move(52, 36)
+    result = IterationResult(
+        2, 30, e2e4, (PVLine(e2e4, 30, (e2e4, e7e5)),), seldepth=5, nodes=1000, elapsed=0.5, hashfull=12
+    )
+    assert format_info(result) == [
+        "info depth 2 seldepth 5 score cp 30 nodes 1000 nps 2000 time 500 hashfull 12 pv e2e4 e7e5"
+    ]
+
+
+def test_format_info_multipv_numbers_lines() -> None:
+    e2e4, d2d4 = Move(12, 28), Move(11, 27)
+    result = IterationResult(1, 30, e2e4, (PVLine(e2e4, 30, (e2e4,)), PVLine(d2d4, 20, (d2d4,))))
+    lines = format_info(result)
+    assert [line.split(" multipv ")[1].split()[0] for line in lines] == ["1", "2"]
+    assert lines[1].endswith("pv d2d4")
+
+
+def test_info_throttle_holds_back_rapid_results(capsys: pytest.CaptureFixture[str]) -> None:
+    throttle = InfoThrottle()
+    for depth in (1, 2, 3):
+        throttle.offer(IterationResult(depth, 0, Move(12, 28)))
+    assert [line.split()[2] for line in capsys.readouterr().out.splitlines()] == ["1"]
+    throttle.flush()
+    assert [line.split()[2] for line in capsys.readouterr().out.splitlines()] == ["3"]
+
+
+def test_info_throttle_expands_only_the_results_it_prints(capsys: pytest.CaptureFixture[str]) -> None:
+    expanded: list[int] = []
+
+    def expand(result: IterationResult) -> IterationResult:
+        expanded.append(result.depth)
+        return result
+
+    throttle = InfoThrottle(expand)
+    for depth in (1, 2, 3):
+        throttle.offer(IterationResult(depth, 0, Move(12, 28)))
+    throttle.flush()
+    assert expanded == [1, 3]
+    assert [line.split()[2] for line in capsys.readouterr().out.splitlines()] == ["1", "3"]
+
+
+def test_info_throttle_poll_reports_held_result_once_interval_passes(capsys: pytest.CaptureFixture[str]) -> None:
+    throttle = InfoThrottle()
+    throttle.offer(IterationResult(1, 0, Move(12, 28)))
+    throttle.offer(IterationResult(2, 0, Move(12, 28)))
+    throttle.poll()
+    assert [line.split()[2] for line in capsys.readouterr().out.splitlines()] == ["1"]
+    time.sleep(INFO_INTERVAL)
+    throttle.poll()
+    assert [line.split()[2] for line in capsys.readouterr().out.splitlines()] == ["2"]
+
+
+def test_held_info_appears_while_next_depth_is_slow(capsys: pytest.CaptureFixture[str]) -> None:
+    """Depth 2 finishes right after depth 1, so its info is held; it must not wait for a slow depth 3."""
+    position = parse_fen(STARTING_FEN)
+    calls = 0
+
+    def counting(position: Position) -> int:
+        nonlocal calls
+        calls += 1
+        return materialistic_position_eval(position)
+
+    list(limited_search(position, counting, SearchLimits(depth=2), tt=TranspositionTable.allocate(DEFAULT_TT_MB)))
+    fast_calls, calls = calls, 0
+
+    def slow_after_depth_2(position: Position) -> int:
+        if calls >= fast_calls:
+            time.sleep(0.005)
+        return counting(position)
+
+    run = configure_search("alphabeta", slow_after_depth_2, 3)
+    go = parse("go infinite")
+    assert isinstance(go, UciGo)
+    signals = SearchSignals()
+    search = threading.Thread(target=run, args=(position, EngineOptions(), go, signals))
+    search.start()
+    try:
+        time.sleep(0.5)
+        depths = [line.split()[2] for line in capsys.readouterr().out.splitlines()]
+    finally:
+        signals.raise_stop()
+        search.join()
+    assert depths == ["1", "2"]
+
+
+# --- Position replay ---
+
+
+def test_position_moves_are_recorded_for_repetition() -> None:
+    shuffle = "g1f3 g8f6 f3g1 f6g8"
+    cmd = parse(f"position startpos moves {shuffle} {shuffle}")
+    assert isinstance(cmd, UciPosition)
+    position = apply_uci_position_cmd(cmd, parse_fen(STARTING_FEN))
+    assert len(position.hash_history) == 8
+    assert position.is_repetition()
+
+
+def test_position_continuing_the_last_one_plays_only_new_moves() -> None:
+    first = parse("position startpos moves e2e4 e7e5")
+    second = parse("position startpos moves e2e4 e7e5 g1f3 b8c6")
+    assert isinstance(first, UciPosition) and isinstance(second, UciPosition)
+    position = apply_uci_position_cmd(first, parse_fen(STARTING_FEN))
+    updated = apply_uci_position_cmd(second, position, first)
+    assert updated is position
+    assert updated == apply_uci_position_cmd(second, parse_fen(STARTING_FEN))
+    assert updated.hash_history == apply_uci_position_cmd(second, parse_fen(STARTING_FEN)).hash_history
+
+
+def test_position_moves_with_extra_whitespace_agree_on_both_paths() -> None:
+    first = parse("position startpos moves e2e4  e7e5")
+    second = parse("position startpos moves e2e4  e7e5 g1f3   b8c6")
+    assert isinstance(first, UciPosition) and isinstance(second, UciPosition)
+    position = apply_uci_position_cmd(first, parse_fen(STARTING_FEN))
+    assert len(position.hash_history) == 2
+    incremental = apply_uci_position_cmd(second, position, first)
+    reparsed = apply_uci_position_cmd(second, parse_fen(STARTING_FEN))
+    assert incremental == reparsed
+    assert incremental.hash_history == reparsed.hash_history
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "position startpos moves e2e4 c7c5",  # takeback: diverges from the last command
+        "position startpos moves e2e4",  # takeback: shorter than the last command
+        "position fen rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1 moves e7e5",  # new start
+    ],
+)
+def test_position_not_continuing_the_last_one_is_set_up_afresh(line: str) -> None:
+    first = parse("position startpos moves e2e4 e7e5")
+    cmd = parse(line)
+    assert isinstance(first, UciPosition) and isinstance(cmd, UciPosition)
+    position = apply_uci_position_cmd(first, parse_fen(STARTING_FEN))
+    updated = apply_uci_position_cmd(cmd, position, first)
+    assert updated == apply_uci_position_cmd(cmd, parse_fen(STARTING_FEN))
+    assert len(updated.hash_history) == len((cmd.moves or "").split())
+
+
+# --- Debug ---
+
+
+@pytest.mark.parametrize("line,expected", [("debug on", UciDebug(True)), ("debug off", UciDebug(False))])
+def test_debug(line: str, expected: UciDebug) -> None:
+    assert parse(line) == expected
+
+
+@pytest.mark.parametrize("line", ["debug", "debug maybe"])
+def test_malformed_debug_is_unrecognized(line: str) -> None:
+    assert isinstance(parse(line), UciUnrecognized)
+
+
+def test_new_game_clears_eval_caches() -> None:
+    cache = EVALS["materialistic-cached"]
+    assert isinstance(cache, EvalCache)
+    position = parse_fen(STARTING_FEN)
+    cache(position)
+    cache(position)
+    apply_uci_new_game_cmd()
+    assert (cache.probes, cache.hits) == (0, 0)
+
+
+def test_new_game_clears_pawn_hash_tables() -> None:
+    evaluator = EVALS["pst-pawns"]
+    assert isinstance(evaluator, PawnStructureEval)
+    evaluator(parse_fen(STARTING_FEN))
+    apply_uci_new_game_cmd()
+    assert (evaluator.table.probes, evaluator.table.hits) == (0, 0)
+
+
+def test_new_game_clears_pawn_hash_tables_inside_composite_evaluators() -> None:
+    evaluator = EVALS["pst-activity"]
+    assert isinstance(evaluator, MaterialTableEval)
+    assert isinstance(evaluator.evaluator, LazyEval)
+    pawns = getattr(evaluator.evaluator.terms[0], "__self__", None)
+    assert isinstance(pawns, PawnStructureEval)
+    evaluator(parse_fen(STARTING_FEN))
+    assert pawns.table.probes > 0
+    apply_uci_new_game_cmd()
+    assert (pawns.table.probes, pawns.table.hits) == (0, 0)
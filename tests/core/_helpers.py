@@ -32,6 +32,15 @@ _POSITION_FIELDS = (
     "en_passant_target",
     "halfmove_clock",
     "fullmove_number",
+    "zobrist_hash",
+    "pawn_hash",
+    "material_key",
+    "material",
+    "mg_score",
+    "eg_score",
+    "phase",
+    "king_squares",
+    "hash_history",
 )
 
 
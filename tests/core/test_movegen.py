@@ -17,10 +17,12 @@ import chess
 import pytest
 
 from drewbert.adapters.fen import alg_sq_to_int, int_to_alg_sq, parse_fen
+from drewbert.core.move import Move
 from drewbert.core.movegen import (
     Coord,
     file_rank_to_sq,
     generate_legal_moves,
+    is_legal_move,
     is_square_attacked,
     sq_to_file_rank,
 )
@@ -155,6 +157,16 @@ def test_legal_moves_fuzz_oracle() -> None:
             ply += 1
 
 
+@pytest.mark.parametrize("fen", ORACLE_FENS)
+def test_is_legal_move_agrees_with_generate_legal_moves(fen: str) -> None:
+    """Every from/to pair, plus the promotions, is legal exactly when movegen generates it."""
+    position = parse_fen(fen)
+    legal = generate_legal_moves(position)
+    candidates = {Move(from_sq, to_sq) for from_sq in range(64) for to_sq in range(64)} | set(legal)
+    for move in candidates:
+        assert is_legal_move(position, move) == (move in legal), f"{fen}: {move!r}"
+
+
 # is_square_attacked is the dedicated attack primitive — independent of
 # position.side_to_move. The cases below cover the conceptually distinct
 # attack patterns; the oracle test below exhausts every (square, color)
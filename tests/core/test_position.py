@@ -17,10 +17,13 @@ import copy
 import pytest
 
 from drewbert.adapters.fen import alg_sq_to_int, parse_fen
+from drewbert.core.material import compute_material_key
 from drewbert.core.move import Move
 from drewbert.core.movegen import generate_pseudo_legal_moves
 from drewbert.core.position import Position
+from drewbert.core.psqt import PHASE_MAX, compute_scores
 from drewbert.core.types import Color, Piece, PieceType
+from drewbert.core.zobrist import compute_hash, compute_pawn_hash
 from tests.core._helpers import diff_positions
 
 # A spread of positions exercising every special-move case make/unmake
@@ -70,6 +73,110 @@ def test_make_returns_undo_with_move(fen: str) -> None:
         assert not diffs, f"{fen} / {move}: {diffs}"
 
 
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_hash_matches_full_rehash(fen: str) -> None:
+    """make_move's incremental Zobrist update must agree with hashing the new board from scratch."""
+    position = parse_fen(fen)
+    for move in generate_pseudo_legal_moves(position):
+        undo = position.make_move(move)
+        expected = compute_hash(
+            position.squares, position.side_to_move, position.castling_rights, position.en_passant_target
+        )
+        assert position.zobrist_hash == expected, f"{fen} / {move}"
+        assert position.pawn_hash == compute_pawn_hash(position.squares), f"{fen} / {move}"
+        assert position.material_key == compute_material_key(position.squares), f"{fen} / {move}"
+        position.unmake_move(undo)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_scores_match_full_recompute(fen: str) -> None:
+    """The piece-square totals after make_move agree with summing the new board from scratch."""
+    position = parse_fen(fen)
+    for move in generate_pseudo_legal_moves(position):
+        undo = position.make_move(move)
+        scores = (position.material, position.mg_score, position.eg_score, position.phase)
+        assert scores == compute_scores(position.squares), f"{fen} / {move}"
+        position.unmake_move(undo)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_king_squares_match_board(fen: str) -> None:
+    """After make_move, including castling, each king square is where that king stands."""
+    position = parse_fen(fen)
+    for move in generate_pseudo_legal_moves(position):
+        undo = position.make_move(move)
+        for color in Color:
+            piece = position.squares[position.king_square(color)]
+            assert piece == Piece(PieceType.KING, color), f"{fen} / {move}"
+        position.unmake_move(undo)
+
+
+def test_scores_are_color_symmetric() -> None:
+    """The starting position is balanced, and mirroring a position negates its totals."""
+    start = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    assert (start.material, start.mg_score, start.eg_score, start.phase) == (0, 0, 0, PHASE_MAX)
+    white = parse_fen("4k3/8/8/8/3N4/8/4P3/4K3 w - - 0 1")
+    black = parse_fen("4k3/4p3/8/3n4/8/8/8/4K3 b - - 0 1")
+    assert (black.material, black.mg_score, black.eg_score) == (-white.material, -white.mg_score, -white.eg_score)
+
+
+def test_transpositions_share_a_hash() -> None:
+    """Different move orders reaching the same position produce the same hash."""
+    a = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    b = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    for frm, to in [("g1", "f3"), ("g8", "f6"), ("b1", "c3"), ("b8", "c6")]:
+        a.make_move(Move(alg_sq_to_int(frm), alg_sq_to_int(to)))
+    for frm, to in [("b1", "c3"), ("b8", "c6"), ("g1", "f3"), ("g8", "f6")]:
+        b.make_move(Move(alg_sq_to_int(frm), alg_sq_to_int(to)))
+    assert a.zobrist_hash == b.zobrist_hash
+    # Only pieces moved, so the pawn hash is still the starting position's.
+    assert a.pawn_hash == b.pawn_hash == parse_fen(FENS[0]).pawn_hash
+
+
+# Hash history and repetition -----------------------------------------------
+
+KNIGHT_SHUFFLE = [("g1", "f3"), ("g8", "f6"), ("f3", "g1"), ("f6", "g8")]
+
+
+def _play(position: Position, moves: list[tuple[str, str]]) -> None:
+    for frm, to in moves:
+        position.make_move(Move(alg_sq_to_int(frm), alg_sq_to_int(to)))
+
+
+def test_hash_history_pushes_and_pops() -> None:
+    position = parse_fen(FENS[0])
+    start = position.zobrist_hash
+    undo = position.make_move(Move(alg_sq_to_int("g1"), alg_sq_to_int("f3")))
+    assert position.hash_history == [start]
+    position.unmake_move(undo)
+    assert position.hash_history == []
+
+
+def test_threefold_repetition() -> None:
+    position = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    _play(position, KNIGHT_SHUFFLE)
+    assert not position.is_repetition()  # second occurrence
+    _play(position, KNIGHT_SHUFFLE)
+    assert position.is_repetition()
+
+
+def test_twofold_counts_after_search_root() -> None:
+    position = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    _play(position, KNIGHT_SHUFFLE + KNIGHT_SHUFFLE[:1])  # the position after Nf3 occurs twice
+    assert position.is_repetition(search_root=0)
+    assert not position.is_repetition(search_root=1)  # a repeat of the root itself needs threefold
+    assert not position.is_repetition()
+
+
+def test_irreversible_move_ends_repetition_scan() -> None:
+    position = parse_fen("rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1")
+    _play(position, KNIGHT_SHUFFLE)
+    # Same placement as the start, but reached with a clock that claims a pawn move since.
+    position.halfmove_clock = 2
+    _play(position, KNIGHT_SHUFFLE)
+    assert not position.is_repetition()
+
+
 # ---------------------------------------------------------------------------
 # Targeted unit tests for each branch in make_move.
 #
@@ -0,0 +1,105 @@
+"""Batched table evaluators and the minimax frontier that feeds them."""
+
+import copy
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from drewbert.adapters.fen import parse_fen  # noqa: E402
+from drewbert.core.helpers import move_applied  # noqa: E402
+from drewbert.core.movegen import generate_legal_moves  # noqa: E402
+from drewbert.eval import batch as batch_module  # noqa: E402
+from drewbert.eval.batch import (  # noqa: E402
+    BoardBatch,
+    TableBatchEval,
+    batch_material_eval,
+    batch_pst_eval,
+    boards_from_fens,
+    encode_board,
+    evaluate_many,
+    fen_to_board,
+)
+from drewbert.search.minimax import best_move, minimax  # noqa: E402
+
+FENS = [
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/R1BQKB1R b KQkq - 2 3",
+    # Promotions, and a phase past PHASE_MAX after one.
+    "4k3/1P6/8/8/8/8/6p1/QQ2K3 w - - 0 1",
+]
+
+
+@pytest.mark.parametrize("evaluator", [batch_material_eval, batch_pst_eval], ids=["material", "pst"])
+@pytest.mark.parametrize("fen", FENS)
+def test_batch_scores_equal_the_scalar_evaluator(evaluator: TableBatchEval, fen: str) -> None:
+    position = parse_fen(fen)
+    batch = evaluator.batch()
+    expected = []
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            batch.add(position)
+            expected.append(evaluator.evaluator(position))
+    assert batch.scores() == expected
+
+
+def test_empty_batch_has_no_scores() -> None:
+    assert batch_pst_eval.batch().scores() == []
+
+
+@pytest.mark.parametrize(
+    "fen,depth",
+    [
+        (FENS[1], 2),
+        # Mate in one: the frontier's children include checkmates, scored without the evaluator.
+        ("6k1/5ppp/8/8/8/8/8/R6K w - - 0 1", 2),
+        # Stalemating and mating children, at the root's frontier.
+        ("7k/5Q2/6K1/8/8/8/8/8 w - - 0 1", 1),
+    ],
+)
+def test_minimax_gives_the_same_result_batched(fen: str, depth: int) -> None:
+    position = parse_fen(fen)
+    scalar = batch_pst_eval.evaluator
+    assert minimax(position, batch_pst_eval, depth) == minimax(position, scalar, depth)
+    assert best_move(position, batch_pst_eval, depth) == best_move(position, scalar, depth)
+
+
+def test_minimax_evaluates_each_frontier_in_one_batch(monkeypatch: pytest.MonkeyPatch) -> None:
+    position = parse_fen(FENS[1])
+    evaluator = copy.copy(batch_material_eval)
+    batches: list[BoardBatch] = []
+
+    def counting_batch() -> BoardBatch:
+        batches.append(BoardBatch(evaluator))
+        return batches[-1]
+
+    monkeypatch.setattr(evaluator, "batch", counting_batch)
+    minimax(position, evaluator, 2)
+    assert len(batches) == len(generate_legal_moves(position))
+
+
+def test_fen_boards_match_parsed_positions() -> None:
+    lines = [f"{fen}\n" for fen in FENS] + ["\n"]
+    boards = boards_from_fens(lines)
+    assert boards.shape == (len(FENS), 64)
+    for fen, board in zip(FENS, boards, strict=True):
+        assert fen_to_board(fen) == encode_board(parse_fen(fen)) == board.tobytes()
+
+
+@pytest.mark.parametrize(
+    "fen",
+    ["8/8/8/8/8/8/8 w - - 0 1", "9/7/8/8/8/8/8/8 w - - 0 1", "8/8/8/8/8/8/8/7x w - - 0 1", "8/8/8/8/8/8/8/7\u00e9 w"],
+)
+def test_rejects_malformed_fen_boards(fen: str) -> None:
+    with pytest.raises(ValueError):
+        boards_from_fens([fen])
+
+
+@pytest.mark.parametrize("evaluator", [batch_material_eval, batch_pst_eval], ids=["material", "pst"])
+def test_evaluate_many_matches_the_scalar_evaluator_across_chunks(
+    evaluator: TableBatchEval, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(batch_module, "CHUNK_SIZE", 2)
+    scores = evaluate_many(boards_from_fens(FENS), evaluator)
+    assert scores.dtype == "int32"
+    assert scores.tolist() == [evaluator.evaluator(parse_fen(fen)) for fen in FENS]
@@ -0,0 +1,74 @@
+"""Evaluation cache: transparent wrapping, hit counting, key verification and clearing."""
+
+import pickle
+
+import pytest
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.core.position import Position
+from drewbert.eval.cache import EvalCache
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.alphabeta import best_move
+
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+class _CountingEval:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, position: Position) -> int:
+        self.calls += 1
+        return materialistic_position_eval(position)
+
+
+def test_repeat_lookup_hits_without_calling_the_evaluator() -> None:
+    inner = _CountingEval()
+    cache = EvalCache(inner)
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert cache(position) == cache(position) == materialistic_position_eval(position)
+    assert inner.calls == 1
+    assert (cache.probes, cache.hits, cache.hit_rate) == (2, 1, 0.5)
+
+
+def test_slot_collision_reads_as_a_miss() -> None:
+    cache = EvalCache(materialistic_position_eval, entries=1)  # every position shares the one slot
+    position = parse_fen(STARTING_FEN)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            assert cache(position) == materialistic_position_eval(position)
+    assert cache.hits == 0
+
+
+def test_clear_forgets_scores_and_counters() -> None:
+    inner = _CountingEval()
+    cache = EvalCache(inner)
+    position = parse_fen(MIDDLEGAME_FEN)
+    cache(position)
+    cache.clear()
+    assert (cache.probes, cache.hits) == (0, 0)
+    cache(position)
+    assert inner.calls == 2
+
+
+def test_search_result_is_unchanged() -> None:
+    cache = EvalCache(materialistic_position_eval)
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert best_move(position, cache, 3) == best_move(position, materialistic_position_eval, 3)
+    assert cache.hits > 0
+
+
+def test_pickles_empty_with_the_same_size() -> None:
+    cache = EvalCache(materialistic_position_eval, entries=256)
+    cache(parse_fen(MIDDLEGAME_FEN))
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.entries == 256
+    assert (copy.probes, copy.hits) == (0, 0)
+
+
+@pytest.mark.parametrize("entries", [0, 3, 1000])
+def test_rejects_non_power_of_two_sizes(entries: int) -> None:
+    with pytest.raises(ValueError):
+        EvalCache(materialistic_position_eval, entries)
@@ -0,0 +1,86 @@
+"""Material table: material keys, imbalance, material draws and endgame dispatch."""
+
+import pytest
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen
+from drewbert.core.material import piece_count, signature_key
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.endgame import BISHOP_PAIR, KNOWN_WIN, MaterialTableEval, analyse_material, kpk, kxk
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import best_move
+
+
+def test_material_key_counts_pieces() -> None:
+    key = parse_fen(STARTING_FEN).material_key
+    assert key == signature_key("KQRRBBNNPPPPPPPP", "KQRRBBNNPPPPPPPP")
+    assert piece_count(key, Color.BLACK, PieceType.PAWN) == 8
+    assert piece_count(key, Color.WHITE, PieceType.QUEEN) == 1
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        "8/8/8/8/8/4k3/8/4K3 w - - 0 1",  # KvK
+        "8/8/8/8/8/4k3/4N3/4K3 w - - 0 1",  # KNvK
+        "8/8/8/8/8/4k3/8/3bK3 w - - 0 1",  # KvKB
+        "8/8/8/8/8/4k3/3NN3/4K3 w - - 0 1",  # KNNvK
+        "8/8/8/8/4n3/4k3/8/3BK3 w - - 0 1",  # KBvKN
+    ],
+)
+def test_insufficient_material_is_a_draw(fen: str) -> None:
+    position = parse_fen(fen)
+    assert analyse_material(position.material_key).draw
+    assert MaterialTableEval(tapered_pst_eval)(position) == 0
+
+
+def test_mating_material_is_not_a_draw() -> None:
+    for white, black in [("KR", "K"), ("KBN", "K"), ("KBB", "K"), ("KP", "K"), ("KNN", "KP"), ("KB", "KR")]:
+        assert not analyse_material(signature_key(white, black)).draw, (white, black)
+
+
+def test_imbalance_and_phase() -> None:
+    entry = analyse_material(signature_key("KBBPPPPP", "KBNPPPPP"))
+    assert entry.imbalance == BISHOP_PAIR
+    assert entry.phase == 4
+    assert analyse_material(parse_fen(STARTING_FEN).material_key).phase == 24
+
+
+def test_dispatches_specialized_endgames_for_either_color() -> None:
+    assert analyse_material(signature_key("KP", "K")).endgame is kpk
+    entry = analyse_material(signature_key("K", "KR"))
+    assert (entry.endgame, entry.strong) == (kxk, Color.BLACK)
+    assert analyse_material(signature_key("KRP", "K")).endgame is None
+
+
+@pytest.mark.parametrize(
+    "fen,won",
+    [
+        ("8/8/8/8/8/8/P5k1/K7 w - - 0 1", True),  # outside the square
+        ("8/8/8/8/8/8/P5k1/K7 b - - 0 1", False),  # ...unless the defender moves first
+        ("k7/8/8/8/8/8/P7/K7 w - - 0 1", False),  # rook pawn with the king in the corner
+        ("4k3/8/8/8/8/8/4P3/4K3 w - - 0 1", False),  # defending king in front
+        ("4k3/8/8/8/3K4/8/4P3/8 b - - 0 1", True),  # attacking king on a key square
+        ("8/8/8/8/4p3/3k4/8/4K3 w - - 0 1", True),  # mirrored: Black's king on a key square
+    ],
+)
+def test_kpk(fen: str, won: bool) -> None:
+    position = parse_fen(fen)
+    score = abs(MaterialTableEval(tapered_pst_eval)(position))
+    assert (score >= KNOWN_WIN) == won
+    if not won and fen.startswith(("k7", "4k3")):
+        assert score == 0
+
+
+def test_lone_king_is_driven_to_the_edge() -> None:
+    evaluator = MaterialTableEval(tapered_pst_eval)
+    centre = evaluator(parse_fen("8/8/8/4k3/8/8/8/R3K3 w - - 0 1"))
+    edge = evaluator(parse_fen("4k3/8/8/8/8/8/8/R3K3 w - - 0 1"))
+    assert KNOWN_WIN < centre < edge
+    assert evaluator(parse_fen("4K3/8/8/8/8/8/8/r3k3 b - - 0 1")) == -edge
+
+
+def test_search_uses_the_rule_of_the_square() -> None:
+    # Only the double step keeps the pawn out of the black king's reach.
+    position = parse_fen("8/8/8/8/8/8/P5k1/K7 w - - 0 1")
+    move = best_move(position, MaterialTableEval(tapered_pst_eval), 1)
+    assert str(move) == "a2a4"
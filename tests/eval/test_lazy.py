@@ -0,0 +1,75 @@
+"""Lazy evaluation: exact without a window, early exits outside it, and the search passing it through."""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.eval.endgame import MaterialTableEval
+from drewbert.eval.lazy import LazyEval, lazy_pawn_eval
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import best_move
+from drewbert.search.types import accepts_window
+
+FENS = [
+    "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "6k1/5ppp/8/1P6/8/8/5PP1/6K1 w - - 0 1",
+]
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_without_a_window_the_score_is_exact(fen: str) -> None:
+    position = parse_fen(fen)
+    assert lazy_pawn_eval()(position) == PawnStructureEval()(position)
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_windowed_score_lands_on_the_same_side_of_the_window(fen: str) -> None:
+    evaluator, exact = lazy_pawn_eval(), PawnStructureEval()
+    position = parse_fen(fen)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            score = exact(position)
+            for alpha, beta in [
+                (-50, 50),
+                (score - 1, score + 1),
+                (score + 300, score + 400),
+                (score - 400, score - 300),
+            ]:
+                lazy = evaluator(position, alpha, beta)
+                if alpha < score < beta:
+                    assert lazy == score
+                else:
+                    assert (lazy <= alpha) == (score <= alpha) and (lazy >= beta) == (score >= beta)
+
+
+def test_exits_before_the_expensive_term() -> None:
+    calls = []
+
+    def expensive(position: object) -> int:
+        calls.append(position)
+        return 7
+
+    evaluator = LazyEval(tapered_pst_eval, [(expensive, 100)])
+    position = parse_fen(FENS[0])
+    base = tapered_pst_eval(position)
+    assert evaluator(position, base + 500, base + 600) == base
+    assert (evaluator.calls, evaluator.early_exits, len(calls)) == (1, 1, 0)
+    assert evaluator(position, base - 50, base + 50) == base + 7
+    assert len(calls) == 1
+
+
+def test_wrappers_forward_the_window() -> None:
+    assert accepts_window(MaterialTableEval(lazy_pawn_eval()))
+    assert not accepts_window(MaterialTableEval(PawnStructureEval()))
+    assert not accepts_window(materialistic_position_eval)
+
+
+def test_search_plays_the_same_move_and_exits_early() -> None:
+    lazy = lazy_pawn_eval()
+    position = parse_fen(FENS[0])
+    assert best_move(position, lazy, 2) == best_move(position, PawnStructureEval(), 2)
+    assert lazy.early_exits > 0
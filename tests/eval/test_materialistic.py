@@ -0,0 +1,34 @@
+"""Material evaluators: the O(1) incremental one must agree with the full board scan."""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.eval.materialistic import incremental_material_eval, materialistic_position_eval
+from drewbert.search.alphabeta import best_move
+
+FENS = [
+    "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+    "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2pP/R2Q1RK1 w kq - 0 1",
+    "rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+]
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+@pytest.mark.parametrize("fen", FENS)
+def test_incremental_matches_full_scan_two_plies_deep(fen: str) -> None:
+    position = parse_fen(fen)
+    assert incremental_material_eval(position) == materialistic_position_eval(position)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            assert incremental_material_eval(position) == materialistic_position_eval(position)
+            for reply in generate_legal_moves(position):
+                with move_applied(position, reply):
+                    assert incremental_material_eval(position) == materialistic_position_eval(position)
+
+
+def test_search_plays_the_same_move() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert best_move(position, incremental_material_eval, 3) == best_move(position, materialistic_position_eval, 3)
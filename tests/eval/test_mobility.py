@@ -0,0 +1,82 @@
+"""Attack sets, mobility and king safety."""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.movegen import generate_legal_moves, generate_piece_pseudo_legal_moves, sq_to_file_rank
+from drewbert.core.types import Color, PieceType
+from drewbert.eval.lazy import lazy_activity_eval
+from drewbert.eval.mobility import (
+    KING_DANGER_DIVISOR,
+    MOBILITY,
+    MOBILITY_BASE,
+    activity,
+    activity_eval,
+    pawn_attacks,
+    piece_attacks,
+)
+from drewbert.eval.pawns import PawnStructureEval
+from drewbert.search.alphabeta import best_move
+
+KIWIPETE_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/R1BQKB1R w KQkq - 2 3"
+
+
+def _bits(squares: list[int]) -> int:
+    return sum(1 << square for square in set(squares))
+
+
+@pytest.mark.parametrize("fen", [KIWIPETE_FEN, KIWIPETE_FEN.replace(" w ", " b "), MIDDLEGAME_FEN])
+def test_attacks_match_pseudo_legal_moves(fen: str) -> None:
+    position = parse_fen(fen)
+    occupied = _bits([sq for sq, piece in enumerate(position.squares) if piece is not None])
+    own = _bits([sq for sq, piece in enumerate(position.squares) if piece and piece.color == position.side_to_move])
+    for square, piece in enumerate(position.squares):
+        if piece and piece.color == position.side_to_move and piece.type in MOBILITY:
+            moves = generate_piece_pseudo_legal_moves(position, piece, sq_to_file_rank(square))
+            assert piece_attacks(piece.type, square, occupied) & ~own == _bits([m.to_square for m in moves])
+
+
+def test_pawn_attacks_stay_on_the_board() -> None:
+    # a2, h2 and d4 for White; a7 and h7 for Black.
+    assert pawn_attacks(Color.WHITE, _bits([8, 15, 27])) == _bits([17, 22, 34, 36])
+    assert pawn_attacks(Color.BLACK, _bits([48, 55])) == _bits([41, 46])
+
+
+@pytest.mark.parametrize(
+    "fen,mirrored_fen",
+    [
+        (MIDDLEGAME_FEN, "r1bqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 2 3"),
+        (KIWIPETE_FEN, "r3k2r/pppbbppp/2n2q1P/1P2p3/3pn3/BN2PNP1/P1PPQPB1/R3K2R b KQkq - 0 1"),
+    ],
+)
+def test_mirrored_position_scores_the_negation(fen: str, mirrored_fen: str) -> None:
+    mg, eg = activity(parse_fen(fen))
+    assert activity(parse_fen(mirrored_fen)) == (-mg, -eg)
+
+
+def test_a_centralized_knight_is_more_mobile_than_a_cornered_one() -> None:
+    centre = activity(parse_fen("4k3/8/8/8/3N4/8/8/4K3 w - - 0 1"))
+    corner = activity(parse_fen("4k3/8/8/8/8/8/8/N3K3 w - - 0 1"))
+    knight_mg, knight_eg = MOBILITY[PieceType.KNIGHT]
+    assert centre == (knight_mg * (8 - MOBILITY_BASE[PieceType.KNIGHT]), knight_eg * 4)
+    assert corner == (knight_mg * (2 - MOBILITY_BASE[PieceType.KNIGHT]), knight_eg * -2)
+
+
+def test_king_danger_needs_two_attackers() -> None:
+    # With Black's king on g8 the rook attacks h7 and h8 in its zone, the queen f7 and f8; on a8 neither reaches.
+    rook, rook_away = "6k1/8/8/8/8/8/8/4K2R w - - 0 1", "k7/8/8/8/8/8/8/4K2R w - - 0 1"
+    both, both_away = "6k1/8/8/8/8/8/8/4KQ1R w - - 0 1", "k7/8/8/8/8/8/8/4KQ1R w - - 0 1"
+    assert activity(parse_fen(rook)) == activity(parse_fen(rook_away))
+    mg, eg = activity(parse_fen(both))
+    away_mg, away_eg = activity(parse_fen(both_away))
+    assert (mg - away_mg, eg) == ((3 * 2 + 5 * 2) ** 2 // KING_DANGER_DIVISOR, away_eg)
+
+
+def test_lazy_activity_eval_adds_every_term() -> None:
+    evaluator = lazy_activity_eval()
+    position = parse_fen(KIWIPETE_FEN)
+    assert evaluator(position) == PawnStructureEval()(position) + activity_eval(position)
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert best_move(position, evaluator, 2) in generate_legal_moves(position)
+    assert evaluator.early_exits > 0
@@ -0,0 +1,116 @@
+"""NNUE network files, incremental accumulators and the evaluator."""
+
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen  # noqa: E402
+from drewbert.core.helpers import move_applied  # noqa: E402
+from drewbert.core.movegen import generate_legal_moves  # noqa: E402
+from drewbert.eval.nnue import (  # noqa: E402
+    FEATURES,
+    Accumulator,
+    Network,
+    NnueEval,
+    load_network,
+    save_network,
+)
+from drewbert.eval.pst import tapered_pst_eval  # noqa: E402
+from drewbert.search.alphabeta import best_move  # noqa: E402
+
+KIWIPETE_FEN = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/R1BQKB1R w KQkq - 2 3"
+
+
+def _random_network(hidden: int = 8, dense: int = 4) -> Network:
+    rng = np.random.default_rng(0)
+    return Network(
+        ft_bias=rng.integers(-64, 64, hidden, dtype=np.int16),
+        ft_weights=rng.integers(-64, 64, (FEATURES, hidden), dtype=np.int16),
+        psqt=rng.integers(-2000, 2000, (FEATURES, 8), dtype=np.int32),
+        l1_bias=rng.integers(-500, 500, dense, dtype=np.int32),
+        l1_weights=rng.integers(-64, 64, (2 * hidden, dense), dtype=np.int8),
+        out_bias=rng.integers(-500, 500, 1, dtype=np.int32),
+        out_weights=rng.integers(-64, 64, dense, dtype=np.int8),
+    )
+
+
+@pytest.fixture(scope="module")
+def network_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("nnue") / "random.nnue"
+    save_network(_random_network(), path)
+    return path
+
+
+def test_round_trips_through_a_memory_mapped_file(network_file: Path) -> None:
+    loaded = load_network(network_file)
+    assert isinstance(loaded.ft_weights, np.memmap)
+    for name, array in vars(_random_network()).items():
+        assert np.array_equal(getattr(loaded, name), array)
+
+
+# The last is a valid header for hidden=8, dense=4 with the arrays cut short.
+@pytest.mark.parametrize("contents", [b"", b"not a network", b"DRWNNUE1\x08\0\0\0\x04\0\0\0short"])
+def test_rejects_malformed_files(tmp_path: Path, contents: bytes) -> None:
+    path = tmp_path / "bad.nnue"
+    path.write_bytes(contents)
+    with pytest.raises(ValueError):
+        load_network(path)
+
+
+def test_incremental_updates_match_a_refresh_through_make_and_unmake(network_file: Path) -> None:
+    evaluator = NnueEval(network_file)
+    position = parse_fen(KIWIPETE_FEN)
+    root = evaluator(position)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            incremental = evaluator(position)
+            for reply in generate_legal_moves(position)[:5]:
+                with move_applied(position, reply):
+                    assert evaluator(position) == evaluator(copy.deepcopy(position))
+            assert evaluator(position) == incremental == evaluator(copy.deepcopy(position))
+    assert evaluator(position) == root
+
+
+@pytest.mark.parametrize(
+    "fen",
+    [
+        STARTING_FEN,
+        KIWIPETE_FEN,
+        "4k3/pp3r2/2n5/8/3P4/8/PP6/4K3 b - - 0 1",  # phase 3
+        "2r3k1/5ppp/4n3/8/3P4/5Q2/5PPP/3R2K1 w - - 0 1",  # phase 9
+        "r1bq1rk1/pp3ppp/2n1pn2/3p4/3P4/2N1PN2/PP3PPP/R2Q1RK1 b - - 0 1",  # phase 21
+    ],
+)
+def test_bootstrap_network_equals_the_tapered_tables_at_bucket_phases(fen: str) -> None:
+    # Kings on mirrored squares (their table terms cancel) and each phase the highest of its bucket.
+    position = parse_fen(fen)
+    assert NnueEval()(position) == tapered_pst_eval(position)
+
+
+def test_bootstrap_network_approximates_the_tapered_tables_between_bucket_phases() -> None:
+    evaluator = NnueEval()
+    position = parse_fen("8/5k2/8/3P4/8/2K5/8/8 w - - 0 1")
+    assert abs(evaluator(position) - tapered_pst_eval(position)) <= 40
+
+
+def test_copies_and_pickles_drop_the_accumulator(network_file: Path) -> None:
+    evaluator = NnueEval(network_file)
+    position = parse_fen(KIWIPETE_FEN)
+    evaluator(position)
+    assert isinstance(position.observer, Accumulator)
+    assert copy.deepcopy(position).observer is None
+    assert pickle.loads(pickle.dumps(position)).observer is None
+    assert pickle.loads(pickle.dumps(evaluator)).path == network_file
+
+
+def test_search_keeps_the_accumulator_in_step(network_file: Path) -> None:
+    evaluator = NnueEval(network_file)
+    position = parse_fen(MIDDLEGAME_FEN)
+    before = evaluator(position)
+    assert best_move(position, evaluator, 2) in generate_legal_moves(position)
+    assert evaluator(position) == before == evaluator(copy.deepcopy(position))
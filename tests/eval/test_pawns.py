@@ -0,0 +1,122 @@
+"""Pawn-structure terms, the pawn hash table, and the evaluator built on them."""
+
+import pickle
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.eval.pawns import (
+    BACKWARD,
+    DOUBLED,
+    ISOLATED,
+    PASSED_EG,
+    PASSED_MG,
+    SHIELD_FAR,
+    SHIELD_NEAR,
+    PawnHashTable,
+    PawnStructureEval,
+    king_shield,
+    pawn_bitsets,
+    pawn_structure,
+)
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import best_move
+
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+def _structure(fen: str) -> tuple[int, int]:
+    return pawn_structure(*pawn_bitsets(parse_fen(fen)))
+
+
+def test_lone_passed_pawn_is_passed_and_isolated() -> None:
+    # d5 is on White's fifth rank: relative rank 4.
+    assert _structure("4k3/8/8/3P4/8/8/8/4K3 w - - 0 1") == (
+        PASSED_MG[4] + ISOLATED[0],
+        PASSED_EG[4] + ISOLATED[1],
+    )
+
+
+def test_doubled_pawns_blocked_by_an_enemy_pawn() -> None:
+    # a2/a3 are doubled and isolated, and a7 stops either from being passed (and vice versa).
+    white_mg, white_eg = DOUBLED[0] + 2 * ISOLATED[0], DOUBLED[1] + 2 * ISOLATED[1]
+    assert _structure("4k3/p7/8/8/8/P7/P7/4K3 w - - 0 1") == (white_mg - ISOLATED[0], white_eg - ISOLATED[1])
+
+
+def test_doubled_passed_pawns_earn_one_passed_bonus() -> None:
+    # d5 is passed; d4 behind it on the same file is not, though no enemy pawn stands in front of either.
+    assert _structure("4k3/8/8/3P4/3P4/8/8/4K3 w - - 0 1") == (
+        PASSED_MG[4] + DOUBLED[0] + 2 * ISOLATED[0],
+        PASSED_EG[4] + DOUBLED[1] + 2 * ISOLATED[1],
+    )
+
+
+def test_backward_pawn() -> None:
+    # d3 has no pawn beside or behind it, and Black's e5 guards d4; c4 is passed; e5 is isolated.
+    assert _structure("4k3/8/8/4p3/2P5/3P4/8/4K3 w - - 0 1") == (
+        PASSED_MG[3] + BACKWARD[0] - ISOLATED[0],
+        PASSED_EG[3] + BACKWARD[1] - ISOLATED[1],
+    )
+
+
+@pytest.mark.parametrize(
+    "fen,mirrored_fen",
+    [
+        (MIDDLEGAME_FEN, "rnbqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 2 3"),
+        ("6k1/5ppp/8/1P6/8/8/5PP1/6K1 w - - 0 1", "6k1/5pp1/8/8/1p6/8/5PPP/6K1 b - - 0 1"),
+    ],
+)
+def test_mirrored_position_scores_the_negation(fen: str, mirrored_fen: str) -> None:
+    evaluator = PawnStructureEval()
+    assert evaluator(parse_fen(fen)) == -evaluator(parse_fen(mirrored_fen))
+
+
+def test_king_shield_counts_pawns_in_front_of_the_king() -> None:
+    position = parse_fen("6k1/8/8/8/8/6P1/5P1P/6K1 w - - 0 1")
+    assert king_shield(position, *pawn_bitsets(position)) == 2 * SHIELD_NEAR + SHIELD_FAR
+
+
+def test_table_hits_on_the_same_structure_and_matches_a_fresh_score() -> None:
+    table = PawnHashTable()
+    position = parse_fen(MIDDLEGAME_FEN)
+    expected = table.probe(position)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            white, black = pawn_bitsets(position)
+            assert table.probe(position) == (*pawn_structure(white, black), white, black)
+    assert table.probe(position) == expected
+    # Only pawn moves and Nxe5 change the structure.
+    assert table.hit_rate > 0.5
+
+
+def test_evaluator_agrees_with_an_uncached_table_and_adds_to_pst() -> None:
+    cached, colliding = PawnStructureEval(), PawnStructureEval(entries=1)
+    position = parse_fen(MIDDLEGAME_FEN)
+    for move in generate_legal_moves(position):
+        with move_applied(position, move):
+            assert cached(position) == colliding(position)
+    bare_kings = parse_fen("4k3/8/8/8/8/8/8/4K3 w - - 0 1")
+    assert cached(bare_kings) == tapered_pst_eval(bare_kings)
+
+
+def test_search_hits_the_table() -> None:
+    evaluator = PawnStructureEval()
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert best_move(position, evaluator, 2) in generate_legal_moves(position)
+    assert evaluator.table.hit_rate > 0.5
+
+
+def test_pickles_empty_with_the_same_size() -> None:
+    evaluator = PawnStructureEval(entries=256)
+    evaluator(parse_fen(MIDDLEGAME_FEN))
+    copy = pickle.loads(pickle.dumps(evaluator))
+    assert copy.table.entries == 256
+    assert (copy.table.probes, copy.table.hits) == (0, 0)
+
+
+@pytest.mark.parametrize("entries", [0, 3, 1000])
+def test_rejects_non_power_of_two_sizes(entries: int) -> None:
+    with pytest.raises(ValueError):
+        PawnHashTable(entries)
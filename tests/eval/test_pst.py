@@ -0,0 +1,82 @@
+"""Tapered piece-square evaluator and its table file: phase blending, mirroring, and loading swapped tables."""
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.core.psqt import PST_FILE, PST_FILE_ENV, TABLES, load_tables, save_tables
+from drewbert.core.types import PieceType
+from drewbert.eval.pst import tapered_pst_eval
+from drewbert.search.alphabeta import best_move
+
+# Each position with its colors swapped and the board mirrored.
+MIRRORED_FENS = [
+    (
+        "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3",
+        "rnbqkb1r/pppp1ppp/5n2/4p3/4P3/2N5/PPPP1PPP/R1BQKBNR b KQkq - 2 3",
+    ),
+    ("8/5k2/8/3p4/8/2N5/4K3/8 w - - 0 1", "8/4k3/2n5/8/3P4/8/5K2/8 b - - 0 1"),
+]
+
+
+def test_save_load_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "pst.json"
+    save_tables(TABLES, path)
+    assert load_tables(path) == TABLES
+    assert path.read_text() == PST_FILE.read_text()
+
+
+def test_malformed_table_file_raises(tmp_path: Path) -> None:
+    data = json.loads(PST_FILE.read_text())
+    data["eg"]["rook"]["squares"] = data["eg"]["rook"]["squares"][:63]
+    path = tmp_path / "pst.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        load_tables(path)
+
+
+def test_opening_uses_middlegame_and_pawn_ending_uses_endgame() -> None:
+    opening = parse_fen(STARTING_FEN)
+    assert tapered_pst_eval(opening) == opening.mg_score == 0
+    ending = parse_fen("8/5k2/8/3p4/8/8/2P1K3/8 w - - 0 1")
+    assert ending.phase == 0
+    assert tapered_pst_eval(ending) == ending.eg_score
+
+
+@pytest.mark.parametrize("fen,mirrored_fen", MIRRORED_FENS)
+def test_mirrored_position_scores_the_negation(fen: str, mirrored_fen: str) -> None:
+    assert tapered_pst_eval(parse_fen(fen)) == -tapered_pst_eval(parse_fen(mirrored_fen))
+
+
+def test_prefers_a_centralized_knight() -> None:
+    centre = parse_fen("4k3/8/8/8/3N4/8/8/4K3 w - - 0 1")
+    rim = parse_fen("4k3/8/8/8/N7/8/8/4K3 w - - 0 1")
+    assert tapered_pst_eval(centre) > tapered_pst_eval(rim)
+
+
+def test_search_returns_a_legal_move() -> None:
+    position = parse_fen("r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3")
+    assert best_move(position, tapered_pst_eval, 2) in generate_legal_moves(position)
+
+
+def test_environment_variable_swaps_the_tables(tmp_path: Path) -> None:
+    bonus = [list(squares) for squares in TABLES.mg_bonus]
+    bonus[PieceType.KNIGHT] = [1000] * 64
+    path = tmp_path / "pst.json"
+    save_tables(replace(TABLES, mg_bonus=bonus), path)
+    script = (
+        "from drewbert.adapters.fen import parse_fen; from drewbert.eval.pst import tapered_pst_eval; "
+        "print(tapered_pst_eval(parse_fen('rnbqkb1r/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1')))"
+    )
+    env = os.environ | {PST_FILE_ENV: str(path)}
+    out = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+    # Every knight gains 1040 in the middlegame, and White has one more: about 1000 after tapering at phase 23.
+    default = tapered_pst_eval(parse_fen("rnbqkb1r/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"))
+    assert int(out.stdout) - default == 1040 * 23 // 24
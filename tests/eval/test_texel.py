@@ -0,0 +1,96 @@
+"""Texel tuning: feature extraction, the loss gradient, and writing tables back."""
+
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from drewbert.adapters.fen import STARTING_FEN, parse_fen  # noqa: E402
+from drewbert.core.psqt import TABLES, load_tables, save_tables  # noqa: E402
+from drewbert.eval.pst import tapered_pst_eval  # noqa: E402
+from drewbert.eval.texel import (  # noqa: E402
+    Dataset,
+    evaluate,
+    extract_features,
+    initial_weights,
+    loss_and_gradient,
+    parse_result,
+    tune,
+    weights_to_tables,
+)
+
+LABELLED = [
+    f"{STARTING_FEN} 1/2-1/2",
+    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1 [1.0]",
+    "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1 0-1",
+    "6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1 1-0",
+    '4k3/1P6/8/8/8/8/6p1/QQ2K3 w - - 0 1 "1-0";',
+]
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Dataset:
+    return extract_features([f"{line}\n" for line in LABELLED] + ["\n"], tmp_path / "dataset")
+
+
+@pytest.mark.parametrize(
+    "token,result", [("1-0", 1.0), ("0-1", 0.0), ("1/2-1/2", 0.5), ("[0.5]", 0.5), ('"1-0";', 1.0), ("0.25", 0.25)]
+)
+def test_parses_results(token: str, result: float) -> None:
+    assert parse_result(token) == result
+
+
+@pytest.mark.parametrize("token", ["*", "2.0", "win"])
+def test_rejects_unknown_results(token: str) -> None:
+    with pytest.raises(ValueError):
+        parse_result(token)
+
+
+def test_rejects_a_line_without_a_result(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        extract_features([STARTING_FEN.split()[0]], tmp_path)
+
+
+def test_features_reproduce_the_tapered_evaluation(dataset: Dataset) -> None:
+    assert isinstance(dataset.features, np.memmap)
+    assert dataset.results.tolist() == [0.5, 1.0, 0.0, 1.0, 1.0]
+    expected = [tapered_pst_eval(parse_fen(line.rsplit(maxsplit=1)[0])) for line in LABELLED]
+    # The evaluator rounds toward zero; the tuner keeps the fraction.
+    assert np.abs(evaluate(dataset, initial_weights()) - expected).max() < 1
+
+
+def test_gradient_matches_finite_differences(dataset: Dataset) -> None:
+    weights = initial_weights()
+    _, gradient = loss_and_gradient(dataset, weights)
+    # A knight on f3 (rook on a1 for the endgame): features of several positions.
+    for phase, feature in [(0, 64 + 21), (1, 3 * 64)]:
+        step = np.zeros_like(weights)
+        step[phase, feature] = 1.0
+        numeric = (loss_and_gradient(dataset, weights + step)[0] - loss_and_gradient(dataset, weights - step)[0]) / 2
+        assert gradient[phase, feature] == pytest.approx(numeric, rel=1e-3)
+
+
+def test_tuning_lowers_the_loss_and_writes_loadable_tables(dataset: Dataset, tmp_path: Path) -> None:
+    weights = initial_weights()
+    losses: list[tuple[int, float]] = []
+    tuned = tune(
+        dataset, weights, epochs=20, learning_rate=5.0, on_epoch=lambda epoch, loss: losses.append((epoch, loss))
+    )
+    assert [epoch for epoch, _ in losses] == list(range(1, 21))
+    assert losses[0][1] == pytest.approx(loss_and_gradient(dataset, weights)[0])
+    assert loss_and_gradient(dataset, tuned)[0] < loss_and_gradient(dataset, weights)[0]
+    save_tables(weights_to_tables(tuned), tmp_path / "tuned.json")
+    tables = load_tables(tmp_path / "tuned.json")
+    assert tables.mg_values == TABLES.mg_values
+    assert tables != TABLES
+
+
+def test_untuned_weights_give_back_the_tables() -> None:
+    assert weights_to_tables(initial_weights()) == TABLES
+
+
+def test_process_pool_gives_the_same_gradient(dataset: Dataset) -> None:
+    serial = tune(dataset, initial_weights(), epochs=2)
+    pooled = tune(dataset, initial_weights(), epochs=2, workers=2)
+    assert np.allclose(serial, pooled)
@@ -0,0 +1,350 @@
+"""Alpha-beta search: mate puzzles plus forward-pruning behavior.
+
+The mate puzzles are shared with the minimax suite — alpha-beta must find the
+same forced mates at the same depths, pruning or not. Pruning tests pin that
+each prune type actually fires (and is counted) and that `NO_PRUNING` turns
+all of them off.
+"""
+
+import threading
+import time
+
+import pytest
+
+from drewbert.adapters.fen import alg_sq_to_int, parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.move import Move
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.core.position import Position
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search import alphabeta
+from drewbert.search.alphabeta import (
+    INFINITY,
+    NO_PRUNING,
+    PruningMargins,
+    best_move,
+    expected_reply,
+    fallback_move,
+    iterative_deepening,
+    limited_search,
+    search_window,
+    top_moves,
+    with_principal_variations,
+)
+from drewbert.search.limits import SearchLimits
+from drewbert.search.minimax import DRAW_SCORE
+from drewbert.search.stats import SearchStats
+from drewbert.search.tt import ENTRY_BYTES, LOWER, TranspositionTable
+from tests.search.test_minimax import MATE_DISTANCE_PUZZLES, MATE_IN_1_PUZZLES, MATE_IN_2_PUZZLES
+
+# Open middlegame; quiet enough that static eval is usually close to the search score.
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+# Perft position 3: sparse rook endgame, cheap to search at depth 4, where futility and RFP both fire.
+ENDGAME_FEN = "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1"
+
+
+def _uci(move: str) -> Move:
+    return Move(alg_sq_to_int(move[:2]), alg_sq_to_int(move[2:]))
+
+
+@pytest.mark.parametrize("margins", [PruningMargins(), NO_PRUNING], ids=["pruning", "no-pruning"])
+@pytest.mark.parametrize("fen,expected_uci", MATE_IN_1_PUZZLES)
+def test_finds_mate_in_1_at_depth_2(fen: str, expected_uci: str, margins: PruningMargins) -> None:
+    move = best_move(parse_fen(fen), materialistic_position_eval, depth=2, margins=margins)
+    assert repr(move) == expected_uci
+
+
+@pytest.mark.parametrize("margins", [PruningMargins(), NO_PRUNING], ids=["pruning", "no-pruning"])
+@pytest.mark.parametrize("fen,expected_uci", MATE_IN_2_PUZZLES)
+def test_finds_mate_in_2_at_depth_4(fen: str, expected_uci: str, margins: PruningMargins) -> None:
+    move = best_move(parse_fen(fen), materialistic_position_eval, depth=4, margins=margins)
+    assert repr(move) == expected_uci
+
+
+@pytest.mark.parametrize("fen,expected_uci", MATE_DISTANCE_PUZZLES)
+def test_prefers_shorter_mate(fen: str, expected_uci: str) -> None:
+    move = best_move(parse_fen(fen), materialistic_position_eval, depth=4)
+    assert repr(move) == expected_uci
+
+
+def test_wins_hanging_queen() -> None:
+    """Quiescence must see the recapture-free queen grab even at depth 1."""
+    position = parse_fen("4k3/8/8/3q4/8/8/3R4/4K3 w - - 0 1")
+    assert repr(best_move(position, materialistic_position_eval, depth=1)) == "d2d5"
+
+
+def test_no_pruning_disables_all_prune_counters() -> None:
+    stats = SearchStats()
+    best_move(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, depth=3, margins=NO_PRUNING, stats=stats)
+    assert stats.nodes > 0
+    assert stats.futility_prunes == 0
+    assert stats.reverse_futility_prunes == 0
+    assert stats.razor_prunes == 0
+
+
+def test_default_margins_prune_and_save_nodes() -> None:
+    pruned, full = SearchStats(), SearchStats()
+    best_move(parse_fen(ENDGAME_FEN), materialistic_position_eval, depth=4, stats=pruned)
+    best_move(parse_fen(ENDGAME_FEN), materialistic_position_eval, depth=4, margins=NO_PRUNING, stats=full)
+    assert pruned.futility_prunes > 0
+    assert pruned.reverse_futility_prunes > 0
+    assert pruned.nodes + pruned.qnodes < full.nodes + full.qnodes
+
+
+def test_razoring_counted_separately_from_futility() -> None:
+    """With only razoring enabled, razor cutoffs are counted and nothing else is."""
+    stats = SearchStats()
+    margins = PruningMargins(futility=(), reverse_futility=())
+    best_move(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, depth=3, margins=margins, stats=stats)
+    assert stats.razor_prunes > 0
+    assert stats.futility_prunes == 0
+    assert stats.reverse_futility_prunes == 0
+
+
+def test_expected_reply_is_legal_hash_move() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    tt = TranspositionTable.allocate(1)
+    results = list(iterative_deepening(position, materialistic_position_eval, 3, tt=tt))
+    reply = expected_reply(position, results[-1].move, tt)
+    assert reply is not None
+    with move_applied(position, results[-1].move):
+        assert reply in generate_legal_moves(position)
+
+
+def test_expected_reply_without_table_entry() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    move = generate_legal_moves(position)[0]
+    assert expected_reply(position, move, TranspositionTable.allocate(1)) is None
+
+
+def test_node_budget_is_exact_and_reproducible() -> None:
+    """A node-limited search visits exactly the budget and always returns the same iterations."""
+    runs = []
+    for _ in range(2):
+        stats = SearchStats()
+        results = list(
+            limited_search(
+                parse_fen(MIDDLEGAME_FEN),
+                materialistic_position_eval,
+                SearchLimits(nodes=3000),
+                stats=stats,
+                tt=TranspositionTable.allocate(1),
+            )
+        )
+        assert stats.nodes + stats.qnodes == 3000
+        runs.append(results)
+    assert runs[0] == runs[1]
+    assert runs[0]
+
+
+def test_mate_limit_stops_once_mate_is_found() -> None:
+    results = list(
+        limited_search(
+            parse_fen("6k1/6P1/5K2/8/8/8/8/3R4 w - - 0 1"), materialistic_position_eval, SearchLimits(mate=2, depth=9)
+        )
+    )
+    assert results[-1].depth == 3
+    assert repr(results[-1].move) == "d1d8"
+
+
+def test_movetime_limit_ends_unbounded_search() -> None:
+    started = time.perf_counter()
+    results = list(limited_search(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, SearchLimits(movetime=200)))
+    assert time.perf_counter() - started < 1.0
+    assert results
+
+
+def test_held_search_ignores_limits_until_released() -> None:
+    released = threading.Event()
+    results = []
+    for result in limited_search(
+        parse_fen(ENDGAME_FEN), materialistic_position_eval, SearchLimits(depth=1), held=lambda: not released.is_set()
+    ):
+        results.append(result)
+        if result.depth >= 2:
+            released.set()
+    assert [r.depth for r in results] == [1, 2]
+
+
+def test_top_moves_are_ranked_distinct_and_start_with_best_move() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    lines = top_moves(position, materialistic_position_eval, 3, 4)
+    assert len(lines) == 4
+    assert len({line.move for line in lines}) == 4
+    assert [line.score for line in lines] == sorted((line.score for line in lines), reverse=True)
+    assert lines[0].move == best_move(position, materialistic_position_eval, 3)
+
+
+def test_top_moves_pv_is_a_legal_line() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    for line in top_moves(position, materialistic_position_eval, 3, 3):
+        assert line.pv[0] == line.move
+        assert len(line.pv) <= 3
+        undos = []
+        for move in line.pv:
+            assert move in generate_legal_moves(position)
+            undos.append(position.make_move(move))
+        for undo in reversed(undos):
+            position.unmake_move(undo)
+
+
+def test_iterations_leave_the_pv_walk_to_the_caller() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    tt = TranspositionTable.allocate(1)
+    results = list(iterative_deepening(position, materialistic_position_eval, 3, tt=tt, multipv=2))
+    assert all(line.pv == (line.move,) for result in results for line in result.lines)
+    expanded = with_principal_variations(results[-1], position, tt)
+    assert [line.move for line in expanded.lines] == [line.move for line in results[-1].lines]
+    assert all(1 < len(line.pv) <= 3 for line in expanded.lines)
+
+
+def test_top_moves_caps_at_legal_move_count() -> None:
+    position = parse_fen("7k/8/7K/8/8/8/8/2R5 b - - 0 1")
+    lines = top_moves(position, materialistic_position_eval, 2, 10)
+    assert {line.move for line in lines} == set(generate_legal_moves(position))
+
+
+def test_multipv_shares_work_across_lines() -> None:
+    """Ranking three lines in one search costs less than three full searches."""
+    single, multi = SearchStats(), SearchStats()
+    best_move(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3, stats=single)
+    top_moves(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3, 3, stats=multi)
+    assert multi.nodes + multi.qnodes < 3 * (single.nodes + single.qnodes)
+
+
+def test_searchmoves_restricts_the_root() -> None:
+    allowed = {_uci("a2a3"), _uci("h2h4")}
+    results = list(iterative_deepening(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3, searchmoves=allowed))
+    assert results and all(r.move in allowed for r in results)
+
+
+def test_searchmoves_ignores_illegal_moves() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    results = list(iterative_deepening(position, materialistic_position_eval, 2, searchmoves=[_uci("a2a5")]))
+    assert results[-1].move == best_move(position, materialistic_position_eval, 2)
+
+
+def test_fallback_move_keeps_to_legal_searchmoves() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    assert fallback_move(position, {_uci("h2h4")}) == _uci("h2h4")
+    assert fallback_move(position, {_uci("a2a5")}) in generate_legal_moves(position)
+    assert fallback_move(parse_fen("R5k1/5ppp/8/8/8/8/8/7K b - - 0 1")) is None
+
+
+def test_searchmoves_scores_one_candidate_cheaply_and_keeps_the_root_entry() -> None:
+    position = parse_fen(MIDDLEGAME_FEN)
+    tt = TranspositionTable(bytearray(ENTRY_BYTES * 4096))
+    full, single = SearchStats(), SearchStats()
+    best = list(iterative_deepening(position, materialistic_position_eval, 3, stats=full, tt=tt))[-1].move
+    candidate = _uci("a2a3")
+    results = list(
+        iterative_deepening(position, materialistic_position_eval, 3, stats=single, tt=tt, searchmoves=[candidate])
+    )
+    assert results[-1].move == candidate
+    assert single.nodes + single.qnodes < (full.nodes + full.qnodes) / 2
+    entry = tt.probe(position.zobrist_hash)
+    assert entry is not None and entry.move == best
+
+
+def test_iteration_results_report_search_progress() -> None:
+    tt = TranspositionTable(bytearray(ENTRY_BYTES * 1024))  # small enough for the search to visibly fill
+    results = list(iterative_deepening(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3, tt=tt))
+    assert [r.nodes for r in results] == sorted(r.nodes for r in results)
+    for result in results:
+        assert result.seldepth >= result.depth
+        assert result.pv[0] == result.move
+        assert result.elapsed > 0
+    assert results[-1].hashfull > 0
+
+
+# Black, a queen down, can claim a threefold repetition by returning the knight to g8.
+REPETITION_FEN = "6nk/8/8/8/8/8/Q7/7K w - - 0 1"
+REPETITION_GAME = ["h1g1", "g8f6", "g1h1", "f6g8", "h1g1", "g8f6", "g1h1"]
+
+
+def _replay(fen: str, moves: list[str]) -> Position:
+    position = parse_fen(fen)
+    for move in moves:
+        position.make_move(_uci(move))
+    return position
+
+
+def test_search_takes_threefold_repetition() -> None:
+    position = _replay(REPETITION_FEN, REPETITION_GAME)
+    assert repr(best_move(position, materialistic_position_eval, 2)) == "f6g8"
+
+
+def test_fifty_move_rule_scores_draw() -> None:
+    # White is a queen down, but any king move completes fifty moves without a capture or pawn move.
+    fen = "7k/8/8/8/8/8/q7/7K w - - {clock} 80"
+    drawn = search_window(parse_fen(fen.format(clock=99)), materialistic_position_eval, 2, -INFINITY, INFINITY)
+    losing = search_window(parse_fen(fen.format(clock=0)), materialistic_position_eval, 2, -INFINITY, INFINITY)
+    assert drawn == DRAW_SCORE
+    assert losing < DRAW_SCORE
+
+
+def test_search_stats_cover_tt_cutoffs_and_depths() -> None:
+    stats = SearchStats()
+    best_move(parse_fen(ENDGAME_FEN), materialistic_position_eval, 4, stats=stats)
+    assert [d.depth for d in stats.per_depth] == [1, 2, 3, 4]
+    assert sum(d.nodes for d in stats.per_depth) == stats.nodes + stats.qnodes
+    assert stats.tt_probes >= stats.tt_hits >= stats.tt_cutoffs > 0
+    assert stats.beta_cutoffs >= stats.first_move_cutoffs > 0
+
+
+def test_legal_hash_move_is_searched_before_move_generation(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A hash move that fails high settles the node without generating its moves."""
+    position = parse_fen(MIDDLEGAME_FEN)
+    tt = TranspositionTable.allocate(1)
+    # Too shallow to cut the node off by itself, so only its move is used.
+    tt.store(position.zobrist_hash, _uci("f3e5"), 0, LOWER, 0)
+    generated = []
+
+    def generate(position: Position) -> list[Move]:
+        generated.append(position.zobrist_hash)
+        return generate_legal_moves(position)
+
+    monkeypatch.setattr(alphabeta, "generate_legal_moves", generate)
+    search_window(position, materialistic_position_eval, 1, -INFINITY, -INFINITY + 1, margins=NO_PRUNING, tt=tt)
+    assert generated
+    assert position.zobrist_hash not in generated
+
+
+def test_illegal_hash_move_is_ignored() -> None:
+    """A key collision's move from another position is skipped, not played."""
+    position = parse_fen(MIDDLEGAME_FEN)
+    tt = TranspositionTable.allocate(1)
+    tt.store(position.zobrist_hash, _uci("e1e8"), 0, LOWER, 0)
+    score = search_window(position, materialistic_position_eval, 2, -INFINITY, INFINITY, margins=NO_PRUNING, tt=tt)
+    assert score == search_window(position, materialistic_position_eval, 2, -INFINITY, INFINITY, margins=NO_PRUNING)
+
+
+def test_internal_iterative_deepening_runs_without_a_hash_move() -> None:
+    """With an empty table, deep nodes get a shallower search first; the score doesn't change."""
+    position = parse_fen(ENDGAME_FEN)
+    stats = SearchStats()
+    depth = alphabeta.IID_MIN_DEPTH
+    tt = TranspositionTable.allocate(1)
+    score = search_window(
+        position, materialistic_position_eval, depth, -INFINITY, INFINITY, margins=NO_PRUNING, stats=stats, tt=tt
+    )
+    assert stats.iid_searches > 0
+    assert score == search_window(position, materialistic_position_eval, depth, -INFINITY, INFINITY, margins=NO_PRUNING)
+
+
+def test_internal_iterative_deepening_needs_a_table() -> None:
+    stats = SearchStats()
+    search_window(
+        parse_fen(ENDGAME_FEN), materialistic_position_eval, alphabeta.IID_MIN_DEPTH, -INFINITY, INFINITY, stats=stats
+    )
+    assert stats.iid_searches == 0
+
+
+def test_search_without_stats_matches_and_still_counts_nodes() -> None:
+    """Skipping the counters changes nothing about the search, and results still report nodes and seldepth."""
+    stats = SearchStats()
+    counted = list(iterative_deepening(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3, stats=stats))
+    uncounted = list(iterative_deepening(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 3))
+    assert uncounted == counted
+    assert uncounted[-1].nodes == stats.nodes + stats.qnodes
+    assert uncounted[-1].seldepth == stats.seldepth
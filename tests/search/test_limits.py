@@ -0,0 +1,57 @@
+"""Search limits: depth caps, mate detection and the movetime clock."""
+
+import time
+
+import pytest
+
+from drewbert.search.limits import MAX_DEPTH, LimitTracker, SearchLimits
+from drewbert.search.minimax import CHECKMATE_SCORE
+
+
+@pytest.mark.parametrize(
+    "limits,expected",
+    [
+        (SearchLimits(), MAX_DEPTH),
+        (SearchLimits(depth=5), 5),
+        (SearchLimits(mate=2), 3),
+        (SearchLimits(depth=2, mate=3), 2),
+        (SearchLimits(nodes=1000), MAX_DEPTH),
+        (SearchLimits(depth=3, infinite=True), MAX_DEPTH),
+        (SearchLimits(mate=0), 1),
+    ],
+)
+def test_max_depth(limits: SearchLimits, expected: int) -> None:
+    assert limits.max_depth == expected
+
+
+def test_mate_within_counts_moves_not_plies() -> None:
+    limits = SearchLimits(mate=2)
+    assert limits.is_mate_within(CHECKMATE_SCORE - 3)  # mate on our 2nd move
+    assert not limits.is_mate_within(CHECKMATE_SCORE - 5)
+    assert not limits.is_mate_within(-(CHECKMATE_SCORE - 2))  # being mated doesn't count
+    assert not SearchLimits().is_mate_within(CHECKMATE_SCORE - 1)
+
+
+def test_tracker_depth_and_mate() -> None:
+    tracker = LimitTracker(SearchLimits(depth=3, mate=5))
+    tracker.record(2, 0)
+    assert not tracker.reached()
+    tracker.record(3, 0)
+    assert tracker.reached()
+
+    tracker = LimitTracker(SearchLimits(depth=10, mate=1))
+    tracker.record(1, CHECKMATE_SCORE - 1)
+    assert tracker.reached()
+
+
+def test_tracker_movetime_clock() -> None:
+    tracker = LimitTracker(SearchLimits(movetime=20))
+    assert not tracker.reached()
+    time.sleep(0.03)
+    assert tracker.reached()
+
+
+def test_infinite_ignores_movetime() -> None:
+    tracker = LimitTracker(SearchLimits(movetime=0, infinite=True))
+    assert tracker.deadline is None
+    assert not tracker.reached()
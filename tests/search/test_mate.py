@@ -0,0 +1,71 @@
+"""Proof-number mate solver: the shared mate puzzles, shortest-mate and line behavior, and limits."""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.alphabeta import limited_search
+from drewbert.search.limits import SearchLimits
+from drewbert.search.mate import solve_mate
+from drewbert.search.stats import SearchStats
+from tests.search.test_minimax import MATE_DISTANCE_PUZZLES, MATE_IN_1_PUZZLES, MATE_IN_2_PUZZLES
+
+# The shared mate in 2: 1. Rd8+ Kh7 2. Rh8#.
+MATE_IN_2_FEN = "6k1/6P1/5K2/8/8/8/8/3R4 w - - 0 1"
+# Mate in 3 whose key move is quiet: 1. Rg3 e4 2. Ra8 e3 3. Rh8#.
+QUIET_MATE_IN_3_FEN = "8/8/8/4p2k/8/R1R5/7K/8 w - - 0 1"
+
+
+@pytest.mark.parametrize("fen,expected_uci", MATE_IN_1_PUZZLES + MATE_DISTANCE_PUZZLES)
+def test_finds_mate_in_1(fen: str, expected_uci: str) -> None:
+    mate = solve_mate(parse_fen(fen), 3)
+    assert mate is not None
+    assert mate.moves == 1
+    assert [str(m) for m in mate.pv] == [expected_uci]
+
+
+@pytest.mark.parametrize("fen,expected_uci", MATE_IN_2_PUZZLES)
+def test_finds_mate_in_2_with_its_line(fen: str, expected_uci: str) -> None:
+    mate = solve_mate(parse_fen(fen), 3)
+    assert mate is not None
+    assert mate.moves == 2
+    assert [str(m) for m in mate.pv] == [expected_uci, "g8h7", "d8h8"]
+
+
+def test_finds_quiet_mate_in_3() -> None:
+    mate = solve_mate(parse_fen(QUIET_MATE_IN_3_FEN), 3)
+    assert mate is not None
+    assert mate.moves == 3
+    assert str(mate.pv[0]) == "c3g3"
+    assert len(mate.pv) == 5
+
+
+def test_leaves_the_position_unchanged() -> None:
+    position = parse_fen(QUIET_MATE_IN_3_FEN)
+    before = (position.squares.copy(), position.zobrist_hash, list(position.hash_history))
+    solve_mate(position, 3)
+    assert (position.squares, position.zobrist_hash, position.hash_history) == before
+
+
+def test_no_mate_within_the_bound() -> None:
+    assert solve_mate(parse_fen(MATE_IN_2_FEN), 1) is None
+
+
+def test_stalemate_is_not_mate() -> None:
+    # Black to move has no legal moves and isn't in check.
+    assert solve_mate(parse_fen("7k/5Q2/6K1/8/8/8/8/8 b - - 0 1"), 2) is None
+    # Every white waiting move leaves the cornered king without a move, but not in check.
+    assert solve_mate(parse_fen("k7/8/1Q6/8/8/8/8/K7 w - - 0 1"), 1) is None
+
+
+def test_node_budget_and_stop_end_the_search() -> None:
+    assert solve_mate(parse_fen(QUIET_MATE_IN_3_FEN), 3, max_nodes=50) is None
+    assert solve_mate(parse_fen(QUIET_MATE_IN_3_FEN), 3, should_stop=lambda: True) is None
+
+
+def test_uses_fewer_nodes_than_full_width_search() -> None:
+    stats = SearchStats()
+    list(limited_search(parse_fen(MATE_IN_2_FEN), materialistic_position_eval, SearchLimits(mate=2), stats=stats))
+    mate = solve_mate(parse_fen(MATE_IN_2_FEN), 2)
+    assert mate is not None
+    assert mate.nodes < stats.nodes + stats.qnodes
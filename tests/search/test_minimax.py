@@ -9,7 +9,8 @@ mating move at the stated depth, and the forcing line is clean.
 
 import pytest
 
-from drewbert.adapters.fen import parse_fen
+from drewbert.adapters.fen import alg_sq_to_int, parse_fen
+from drewbert.core.move import Move
 from drewbert.eval.materialistic import materialistic_position_eval
 from drewbert.search.minimax import best_move
 
@@ -62,3 +63,10 @@ def test_prefers_shorter_mate(fen: str, expected_uci: str) -> None:
     position = parse_fen(fen)
     move = best_move(position, materialistic_position_eval, depth=4)
     assert repr(move) == expected_uci
+
+
+def test_minimax_takes_threefold_repetition() -> None:
+    position = parse_fen("6nk/8/8/8/8/8/Q7/7K w - - 0 1")
+    for frm, to in [("h1", "g1"), ("g8", "f6"), ("g1", "h1"), ("f6", "g8"), ("h1", "g1"), ("g8", "f6"), ("g1", "h1")]:
+        position.make_move(Move(alg_sq_to_int(frm), alg_sq_to_int(to)))
+    assert repr(best_move(position, materialistic_position_eval, 2)) == "f6g8"
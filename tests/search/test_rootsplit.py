@@ -0,0 +1,49 @@
+"""Root-splitting search: the answer must not depend on the worker count.
+
+The reference is the obvious serial computation — every root move searched
+with a full window, best by score with ties to the earlier move — which the
+shared alpha bound is only allowed to speed up, never change.
+"""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.helpers import move_applied
+from drewbert.core.movegen import generate_legal_moves
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.alphabeta import INFINITY, NO_PRUNING, search_window
+from drewbert.search.rootsplit import root_split_best_move, root_split_search
+
+MIDDLEGAME_FEN = "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+def _full_window_reference(fen: str, depth: int) -> tuple[str, int]:
+    position = parse_fen(fen)
+    scored = []
+    for index, move in enumerate(generate_legal_moves(position)):
+        with move_applied(position, move):
+            score = -search_window(
+                position, materialistic_position_eval, depth - 1, -INFINITY, INFINITY, ply=1, margins=NO_PRUNING
+            )
+        scored.append((score, -index, repr(move)))
+    score, _, move = max(scored)
+    return move, score
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_matches_full_window_reference(workers: int) -> None:
+    expected_move, expected_score = _full_window_reference(MIDDLEGAME_FEN, 2)
+    result = root_split_search(parse_fen(MIDDLEGAME_FEN), materialistic_position_eval, 2, workers)
+    assert result is not None
+    assert (repr(result.move), result.score) == (expected_move, expected_score)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_finds_mate_in_2(workers: int) -> None:
+    position = parse_fen("6k1/6P1/5K2/8/8/8/8/3R4 w - - 0 1")
+    assert repr(root_split_best_move(position, materialistic_position_eval, 4, workers)) == "d1d8"
+
+
+def test_terminal_position_returns_none() -> None:
+    position = parse_fen("R5k1/5ppp/8/8/8/8/8/7K b - - 0 1")
+    assert root_split_search(position, materialistic_position_eval, 2, workers=2) is None
@@ -0,0 +1,54 @@
+"""Lazy SMP: multi-process search must agree with single-process search on forced lines.
+
+Helpers spawn fresh interpreters, so these tests are comparatively slow; keep
+the positions tiny.
+"""
+
+import pytest
+
+from drewbert.adapters.fen import parse_fen
+from drewbert.core.position import Position
+from drewbert.eval.materialistic import materialistic_position_eval
+from drewbert.search.smp import lazy_smp_best_move, lazy_smp_search
+
+
+def _fail_to_unpickle() -> None:
+    raise RuntimeError("helper dies before it starts searching")
+
+
+class _UnpicklableEval:
+    """Material eval in-process; a helper process dies unpickling it, before it can report back."""
+
+    def __call__(self, position: Position) -> int:
+        return materialistic_position_eval(position)
+
+    def __reduce__(self) -> tuple[object, tuple[()]]:
+        return _fail_to_unpickle, ()
+
+
+@pytest.mark.parametrize("threads", [1, 2])
+def test_finds_mate_in_2(threads: int) -> None:
+    position = parse_fen("6k1/6P1/5K2/8/8/8/8/3R4 w - - 0 1")
+    move = lazy_smp_best_move(position, materialistic_position_eval, depth=4, threads=threads)
+    assert repr(move) == "d1d8"
+
+
+def test_result_is_at_least_requested_depth() -> None:
+    position = parse_fen("7k/8/7K/8/8/8/8/2R5 w - - 0 1")
+    result = lazy_smp_search(position, materialistic_position_eval, depth=2, threads=3)
+    assert result is not None
+    assert result.depth >= 2
+    assert repr(result.move) == "c1c8"
+
+
+def test_terminal_position_returns_none() -> None:
+    # Black is checkmated.
+    position = parse_fen("R5k1/5ppp/8/8/8/8/8/7K b - - 0 1")
+    assert lazy_smp_best_move(position, materialistic_position_eval, depth=2, threads=2) is None
+
+
+def test_dead_helper_does_not_hang_the_search() -> None:
+    position = parse_fen("7k/8/7K/8/8/8/8/2R5 w - - 0 1")
+    result = lazy_smp_search(position, _UnpicklableEval(), depth=2, threads=2)
+    assert result is not None
+    assert repr(result.move) == "c1c8"
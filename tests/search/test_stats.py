@@ -0,0 +1,25 @@
+"""Search statistics: derived rates and JSON export."""
+
+import json
+
+from drewbert.search.stats import DepthStats, SearchStats
+
+
+def test_first_move_cutoff_rate() -> None:
+    assert SearchStats().first_move_cutoff_rate == 0.0
+    assert SearchStats(beta_cutoffs=8, first_move_cutoffs=6).first_move_cutoff_rate == 0.75
+
+
+def test_effective_branching_factor_uses_last_two_depths() -> None:
+    stats = SearchStats(per_depth=[DepthStats(1, 20, 0.01)])
+    assert stats.effective_branching_factor is None
+    stats.per_depth += [DepthStats(2, 100, 0.05), DepthStats(3, 400, 0.2)]
+    assert stats.effective_branching_factor == 4.0
+
+
+def test_to_json_round_trips_counters_and_rates() -> None:
+    stats = SearchStats(nodes=10, qnodes=5, beta_cutoffs=2, first_move_cutoffs=1, per_depth=[DepthStats(1, 15, 0.5)])
+    data = json.loads(stats.to_json())
+    assert data["nodes"] == 10 and data["qnodes"] == 5
+    assert data["first_move_cutoff_rate"] == 0.5
+    assert data["per_depth"] == [{"depth": 1, "nodes": 15, "seconds": 0.5}]
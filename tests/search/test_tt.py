@@ -0,0 +1,99 @@
+"""Transposition table: entry packing, key verification and replacement.
+
+The table is a raw word buffer, so these tests pin the bit-packing round
+trip (every field, including promotions and negative scores) and the
+XOR-key check that makes shared, lock-free use safe.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import pytest
+
+from drewbert.core.move import Move
+from drewbert.core.types import PieceType
+from drewbert.search.tt import ENTRY_BYTES, EXACT, LOWER, UPPER, TranspositionTable, entries_for_size
+
+KEY = 0xDEAD_BEEF_0123_4567
+
+
+def test_store_probe_round_trip() -> None:
+    tt = TranspositionTable.allocate(1)
+    move = Move(52, 60, PieceType.QUEEN)
+    tt.store(KEY, move, 7, LOWER, -12345)
+    entry = tt.probe(KEY)
+    assert entry is not None
+    assert entry.move == move
+    assert entry.depth == 7
+    assert entry.bound == LOWER
+    assert entry.score == -12345
+
+
+def test_store_without_move() -> None:
+    tt = TranspositionTable.allocate(1)
+    tt.store(KEY, None, 1, UPPER, 0)
+    entry = tt.probe(KEY)
+    assert entry is not None
+    assert entry.move is None
+
+
+def test_probe_misses_on_unwritten_and_colliding_keys() -> None:
+    tt = TranspositionTable.allocate(1)
+    assert tt.probe(KEY) is None
+    tt.store(KEY, Move(12, 28), 3, EXACT, 50)
+    # Same slot (identical low bits), different key.
+    assert tt.probe(KEY ^ (1 << 63)) is None
+
+
+def test_torn_write_reads_as_miss() -> None:
+    """Simulate two writers interleaving: word 0 from one entry, word 1 from another."""
+    buffer = bytearray(ENTRY_BYTES * 2)
+    tt = TranspositionTable(buffer)
+    other_buffer = bytearray(ENTRY_BYTES * 2)
+    other = TranspositionTable(other_buffer)
+    tt.store(KEY, Move(12, 28), 3, EXACT, 50)
+    other.store(KEY, Move(6, 21), 9, LOWER, -800)
+    index = (KEY & 1) * ENTRY_BYTES
+    buffer[index + 8 : index + 16] = other_buffer[index + 8 : index + 16]
+    assert tt.probe(KEY) is None
+
+
+def test_shallower_result_does_not_replace_deeper() -> None:
+    tt = TranspositionTable.allocate(1)
+    tt.store(KEY, Move(12, 28), 6, EXACT, 50)
+    tt.store(KEY, Move(11, 27), 2, EXACT, 10)
+    entry = tt.probe(KEY)
+    assert entry is not None and entry.depth == 6
+
+
+def test_clear_empties_table() -> None:
+    tt = TranspositionTable.allocate(1)
+    tt.store(KEY, Move(12, 28), 6, EXACT, 50)
+    tt.clear()
+    assert tt.probe(KEY) is None
+
+
+def test_rejects_non_power_of_two_buffer() -> None:
+    with pytest.raises(ValueError):
+        TranspositionTable(bytearray(ENTRY_BYTES * 3))
+
+
+def test_shared_memory_views_see_each_others_writes() -> None:
+    shm = SharedMemory(create=True, size=entries_for_size(1) * ENTRY_BYTES)
+    writer, reader = TranspositionTable.from_shared_memory(shm), TranspositionTable.from_shared_memory(shm)
+    try:
+        writer.store(KEY, Move(12, 28), 4, EXACT, 75)
+        entry = reader.probe(KEY)
+        assert entry is not None and entry.score == 75
+    finally:
+        writer.release()
+        reader.release()
+        shm.close()
+        shm.unlink()
+
+
+def test_hashfull_counts_occupied_slots() -> None:
+    tt = TranspositionTable(bytearray(ENTRY_BYTES * 2048))
+    assert tt.hashfull() == 0
+    for key in range(250):
+        tt.store(key, None, 1, EXACT, 0)
+    assert tt.hashfull() == 250